@@ -41,15 +41,15 @@ async def screenshotCanvas(interaction, x: int = -770, y: int = 7930):
             os.remove(tmp.name)
 
 async def capture_screenshot(x, y, filepath):
-    from lib.core.image_processing import get_browser, rendering_lock
+    from lib.core.image_processing import render_pool
     import time
     
-    async with rendering_lock:
+    async with render_pool.acquire() as worker:
         loop = asyncio.get_event_loop()
         
         def _capture_sync():
             try:
-                browser = get_browser()
+                browser = worker.get_browser()
                 # Store original window size
                 original_size = browser.get_window_size()
                 browser.set_window_size(1920, 1080)
@@ -67,6 +67,9 @@ async def capture_screenshot(x, y, filepath):
             except Exception as e:
                 logging.error(f"Error in capture_screenshot_sync: {e}")
                 raise
+            finally:
+                # Leave the worker's tab ready for in-memory renders again
+                worker.restage()
                 
         # Run the synchronous webdriver code in a thread pool so it doesn't block the bot
         return await loop.run_in_executor(None, _capture_sync)
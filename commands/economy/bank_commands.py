@@ -190,6 +190,20 @@ async def handle_bank_status_command(interaction: discord.Interaction):
     except Exception:
         pass
 
+    # The economy log drain's backlog as of its last run, so staff can see it falling
+    # behind before the stale-queue warning fires.
+    try:
+        from lib.bot.scheduled_tasks import economy_log_metrics
+        q = economy_log_metrics()
+        embed.add_field(
+            name="📜 Economy Log Queue",
+            value=(f"{q['depth']:,} rows queued · oldest {q['oldest_age']:,}s\n"
+                   f"-# {q['rows_sent']:,} rows in {q['messages_sent']:,} messages posted since boot"),
+            inline=False,
+        )
+    except Exception:
+        pass
+
     if bank_info['last_updated'] > 0:
         last_updated = datetime.fromtimestamp(bank_info['last_updated'])
         embed.add_field(
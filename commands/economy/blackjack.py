@@ -30,11 +30,8 @@ from discord import Interaction
 from lib.economy.economy_manager import get_bb, remove_bb, credit_casino_payout
 from lib.economy.casino_stats import record_result, session_footer_html
 from lib.economy.casino_drain import action_in_flight, deal_in_flight
-from lib.core.file_operations import (
-    read_html_template,
-    load_persistent_views,
-    save_persistent_views,
-)
+from lib.core.file_operations import read_html_template
+from lib.core.persistent_views import PersistentViewRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -202,18 +199,13 @@ class BlackjackGame:
 def save_game(game: BlackjackGame):
     if game.message_id is None:
         return
-    views = load_persistent_views()
-    views[str(game.message_id)] = game.to_dict()
-    save_persistent_views(views)
+    PersistentViewRegistry.put(game.message_id, game.to_dict())
 
 
 def delete_game(message_id):
     if message_id is None:
         return
-    views = load_persistent_views()
-    if str(message_id) in views:
-        del views[str(message_id)]
-        save_persistent_views(views)
+    PersistentViewRegistry.delete(message_id)
 
 
 # ---------------------------------------------------------------------------
@@ -19,11 +19,8 @@ import random
 import discord
 
 from lib.economy.economy_manager import credit_casino_payout
-from lib.core.file_operations import (
-    read_html_template,
-    load_persistent_views,
-    save_persistent_views,
-)
+from lib.core.file_operations import read_html_template
+from lib.core.persistent_views import PersistentViewRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -310,18 +307,13 @@ def settle_pvp_pot(winner_id: int, loser_id: int, pot: int, reason: str, own_sta
 def save_state(message_id, state: dict):
     if message_id is None:
         return
-    views = load_persistent_views()
-    views[str(message_id)] = state
-    save_persistent_views(views)
+    PersistentViewRegistry.put(message_id, state)
 
 
 def delete_state(message_id):
     if message_id is None:
         return
-    views = load_persistent_views()
-    if str(message_id) in views:
-        del views[str(message_id)]
-        save_persistent_views(views)
+    PersistentViewRegistry.delete(message_id)
 
 
 # ---------------------------------------------------------------------------
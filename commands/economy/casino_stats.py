@@ -1,55 +1,26 @@
 import discord
-from database import DatabaseManager
+from lib.economy.casino_stats import get_user_casino_stats
 
 async def handle_casino_stats_command(interaction: discord.Interaction, member: discord.Member = None):
     target_member = member or interaction.user
     user_id = str(target_member.id)
     
-    # Query overall totals
-    totals_query = """
-        SELECT 
-            COUNT(*),
-            SUM(staked),
-            SUM(payout),
-            SUM(net),
-            SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END),
-            SUM(CASE WHEN result = 'loss' THEN 1 ELSE 0 END),
-            SUM(CASE WHEN result = 'push' THEN 1 ELSE 0 END),
-            MAX(net),
-            MIN(net)
-        FROM casino_results 
-        WHERE user_id = ?
-    """
-    totals = DatabaseManager.fetch_one(totals_query, (user_id,))
-    
-    if not totals or totals[0] == 0:
+    # Totals and the per-game breakdown, read from the per-day rollup
+    stats = get_user_casino_stats(user_id)
+    total = stats["total"]
+
+    if total["games"] == 0:
         await interaction.response.send_message(
             f"❌ {target_member.mention} hasn't played any casino games yet!", 
             ephemeral=True
         )
         return
-        
-    # Query per-game breakdown
-    games_query = """
-        SELECT 
-            game,
-            COUNT(*),
-            SUM(staked),
-            SUM(payout),
-            SUM(net),
-            SUM(CASE WHEN result = 'win' THEN 1 ELSE 0 END),
-            SUM(CASE WHEN result = 'loss' THEN 1 ELSE 0 END),
-            SUM(CASE WHEN result = 'push' THEN 1 ELSE 0 END),
-            MAX(net),
-            MIN(net)
-        FROM casino_results 
-        WHERE user_id = ?
-        GROUP BY game
-    """
-    games = DatabaseManager.fetch_all(games_query, (user_id,))
-    
-    total_played, total_staked, total_payout, total_net, wins, losses, pushes, max_win, max_loss = totals
-    
+
+    total_played, total_staked, total_payout, total_net = (
+        total["games"], total["staked"], total["payout"], total["net"])
+    wins, losses, pushes = total["wins"], total["losses"], total["pushes"]
+    max_win, max_loss = total["biggest_win"], total["biggest_loss"]
+
     embed = discord.Embed(
         title=f"🎰 Casino Stats - {target_member.display_name}",
         color=0xD4AF37
@@ -84,8 +55,10 @@ async def handle_casino_stats_command(interaction: discord.Interaction, member:
         "darts": "🎯 Darts"
     }
     
-    for row in games:
-        game_key, g_played, g_staked, g_payout, g_net, g_wins, g_losses, g_pushes, g_max_win, g_max_loss = row
+    for game_key, g in stats["per_game"].items():
+        g_staked, g_payout, g_net = g["staked"], g["payout"], g["net"]
+        g_wins, g_losses, g_pushes = g["wins"], g["losses"], g["pushes"]
+        g_max_win, g_max_loss = g["biggest_win"], g["biggest_loss"]
         game_name = game_names.get(game_key, game_key.capitalize())
         g_sign = "+" if g_net >= 0 else ""
         
@@ -412,7 +412,7 @@ async def _handle_action(interaction: Interaction, game: RedDogGame, action: str
             # reattachment, so reconcile the stake from it before settling in case the
             # in-memory hand drifted (e.g. the view was rebuilt mid-round).
             try:
-                _stored = cb.load_persistent_views().get(str(game.message_id))
+                _stored = cb.PersistentViewRegistry.get(game.message_id)
                 if _stored and _stored.get("type") == KEY:
                     _b = int(_stored.get("bet", game.bet))
                     if _b != game.bet:
@@ -419,17 +419,15 @@ def _save_round(table):
     if table.message is None:
         return
     try:
-        from lib.core.file_operations import load_persistent_views, save_persistent_views
-        views = load_persistent_views()
-        views[str(table.message.id)] = {
+        from lib.core.persistent_views import PersistentViewRegistry
+        PersistentViewRegistry.put(table.message.id, {
             "type": "roulette",
             "channel_id": table.channel_id,
             "opener_id": table.opener_id,
             "close_ts": table.close_ts,
             "players": {str(pid): {"name": s["name"], "bets": dict(s["bets"])}
                         for pid, s in table.players.items()},
-        }
-        save_persistent_views(views)
+        })
     except Exception:
         logger.error("roulette round persist failed", exc_info=True)
 
@@ -438,11 +436,8 @@ def _delete_round(message_id):
     if message_id is None:
         return
     try:
-        from lib.core.file_operations import load_persistent_views, save_persistent_views
-        views = load_persistent_views()
-        if str(message_id) in views:
-            del views[str(message_id)]
-            save_persistent_views(views)
+        from lib.core.persistent_views import PersistentViewRegistry
+        PersistentViewRegistry.delete(message_id)
     except Exception:
         logger.error("roulette round unpersist failed", exc_info=True)
 
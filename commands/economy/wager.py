@@ -3,7 +3,7 @@ from discord import app_commands, Interaction, Member
 from config import CHANNELS, ROLES
 from lib.economy.economy_manager import get_bb, remove_bb, add_bb, pvp_rake, record_game_transfer
 from lib.core.discord_helpers import has_any_role
-from lib.core.file_operations import load_persistent_views, save_persistent_views
+from lib.core.persistent_views import PersistentViewRegistry
 
 class WagerDecisionView(discord.ui.View):
     def __init__(self, challenger_id: int, opponent_id: int, amount: int, topic: str, challenger_name: str, opponent_name: str):
@@ -82,10 +82,7 @@ class WagerDecisionView(discord.ui.View):
             await interaction.followup.send("Failed to DM the users the result, but balances were updated.", ephemeral=True)
 
         # Clean up persistent view
-        persistent_views = load_persistent_views()
-        if str(interaction.message.id) in persistent_views:
-            del persistent_views[str(interaction.message.id)]
-            save_persistent_views(persistent_views)
+        PersistentViewRegistry.delete(interaction.message.id)
 
     @discord.ui.button(label="Winner: User A", style=discord.ButtonStyle.success)
     async def btn_challenger(self, interaction: Interaction, button: discord.ui.Button):
@@ -157,8 +154,7 @@ class WagerProposalView(discord.ui.View):
             view=decision_view
         )
 
-        persistent_views = load_persistent_views()
-        persistent_views[str(msg.id)] = {
+        PersistentViewRegistry.put(msg.id, {
             "type": "wager",
             "challenger_id": self.challenger.id,
             "opponent_id": self.opponent.id,
@@ -166,8 +162,7 @@ class WagerProposalView(discord.ui.View):
             "topic": self.topic,
             "challenger_name": discord.utils.escape_markdown(self.challenger.display_name),
             "opponent_name": discord.utils.escape_markdown(self.opponent.display_name)
-        }
-        save_persistent_views(persistent_views)
+        })
         interaction.client.add_view(decision_view, message_id=msg.id)
 
         # Update the original message
@@ -2,7 +2,7 @@ import discord
 from discord.ui import Button, View, Modal, TextInput
 from discord import ButtonStyle, Interaction, Forbidden
 import re
-from lib.core.file_operations import load_persistent_views, save_persistent_views
+from lib.core.persistent_views import PersistentViewRegistry
 
 async def handle_role_button_interaction(interaction: Interaction):
     custom_id = interaction.data.get("custom_id", "")
@@ -176,9 +176,7 @@ class PreviewView(View):
         view = RoleButtonView(self.roles)
         try:
             message = await self.channel.send(content=self.content, view=view)
-            persistent_views = load_persistent_views()
-            persistent_views[message.id] = self.roles
-            save_persistent_views(persistent_views)
+            PersistentViewRegistry.put(message.id, self.roles)
             interaction.client.add_view(view, message_id=message.id)
             await interaction.response.edit_message(content="Announcement sent successfully!", view=None)
         except discord.errors.NotFound as e:
@@ -3,7 +3,7 @@ import asyncio
 import json
 import time
 import copy
-from lib.core.file_operations import load_persistent_views, save_persistent_views
+from lib.core.persistent_views import PersistentViewRegistry
 from config import *
 
 ARCHIVIST_ROLE_ID = 1281602571416375348
@@ -125,10 +125,8 @@ async def schedule_archive_move(channel: discord.TextChannel, guild: discord.Gui
         msg = await channel.send(embed=move_embed, view=view)
         
         key = f"archive_{channel.id}"
-        persistent_views = load_persistent_views()
-        persistent_views.pop(key, None)
-        persistent_views[f"unarchive_{channel.id}"] = {"msg_id": msg.id}
-        save_persistent_views(persistent_views)
+        PersistentViewRegistry.delete(key)
+        PersistentViewRegistry.put(f"unarchive_{channel.id}", {"msg_id": msg.id})
 
 async def archive_channel(interaction: discord.Interaction, bot, seconds: int, private: bool = False):
     guild = interaction.guild
@@ -182,9 +180,7 @@ async def archive_channel(interaction: discord.Interaction, bot, seconds: int, p
         msg = await channel.send(embed=embed, view=view)
         
     target_timestamp = time.time() + seconds
-    persistent_views = load_persistent_views()
-    persistent_views[f"archive_{channel.id}"] = {"msg_id": msg.id, "move_timestamp": target_timestamp, "private": private}
-    save_persistent_views(persistent_views)
+    PersistentViewRegistry.put(f"archive_{channel.id}", {"msg_id": msg.id, "move_timestamp": target_timestamp, "private": private})
 
     if private:
         await interaction.followup.send("Channel will be archived immediately!", ephemeral=True)
@@ -7,6 +7,28 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # --- Core Bot Settings ---
 GUILD_ID = 959493056242008184
 CHROME_PATH = os.getenv("CHROME_PATH", "/usr/bin/google-chrome")
+# Warm headless Chromes in the render pool (lib/core/image_processing.py). Each costs a few
+# hundred MB, so small instances stay at 1; raise it where there's RAM to render in parallel.
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "1"))
+# Write each page straight into the worker's open tab instead of via a temp file + file://
+# navigation. Turn off to go back to the file round trip if a page misbehaves.
+RENDER_IN_MEMORY = True
+# Rendered screenshots are cached by content (lib/core/render_cache.py): a small in-memory
+# LRU in front of RENDER_CACHE_DIR, each trimmed to its byte budget.
+RENDER_CACHE_ENABLED = True
+RENDER_CACHE_MEMORY_BYTES = 24 * 1024 * 1024
+RENDER_CACHE_DISK_BYTES = 256 * 1024 * 1024
+# Images embedded in rendered cards are fitted to their display size and recompressed
+# (lib/core/assets.py) into ASSET_BUILD_DIR, and their data URIs memoised up to this budget.
+ASSET_URI_CACHE_BYTES = 16 * 1024 * 1024
+# Member avatars and emojis pulled into rendered pages (lib/core/avatars.py): fetched from the
+# CDN at AVATAR_SIZE px, a page's misses AVATAR_FETCH_CONCURRENCY at a time, and kept in a
+# memory LRU in front of AVATAR_CACHE_DIR.
+AVATAR_SIZE = 64
+AVATAR_FETCH_CONCURRENCY = 8
+AVATAR_FETCH_TIMEOUT = 10
+AVATAR_CACHE_MEMORY_BYTES = 4 * 1024 * 1024
+AVATAR_CACHE_DISK_BYTES = 64 * 1024 * 1024
 
 # --- Feature Toggles & Limits ---
 SHUTCOIN_ENABLED = True
@@ -260,6 +282,9 @@ RESERVE_THROTTLE_TIERS = ((80_000, 0.25), (120_000, 0.50), (160_000, 0.75))
 # ever raise supply to this; past it a win cannot be honoured and is logged CRITICAL rather
 # than silently inflating the currency. 800k baseline -> at most 25% expansion, ever.
 MAX_TOTAL_SUPPLY = 1_000_000
+# The closed economy: every balance (users + the bank) sums to this. init_db reseeds the bank
+# to it at boot, and the scheduled supply audit warns while supply sits anywhere else.
+ECONOMY_TOTAL_SUPPLY = 800_000
 
 # Dynamic Max Bet scaling: cap single-win max exposure to a % of live Bank reserves
 DYNAMIC_MAX_BET_ENABLED = True
@@ -357,6 +382,9 @@ LOTTERY_TICKET_CAP = 500
 # --- File Paths & Directories ---
 DATA_DIR = os.path.join(BASE_DIR, "data")
 JSON_DATA_DIR = os.path.join(DATA_DIR, "json")
+RENDER_CACHE_DIR = os.path.join(DATA_DIR, "render_cache")
+ASSET_BUILD_DIR = os.path.join(DATA_DIR, "assets_built")
+AVATAR_CACHE_DIR = os.path.join(DATA_DIR, "avatar_cache")
 
 # Ensure directories exist
 os.makedirs(JSON_DATA_DIR, exist_ok=True)
@@ -1,18 +1,30 @@
+import asyncio
+import functools
+import os
 import sqlite3
 import threading
-from contextlib import contextmanager
+import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 
 DB_FILE = 'database.db'
 
 class DatabaseManager:
     _connection = None
-    # The bot shares ONE sqlite connection across the asyncio loop, APScheduler
+    # The bot shares ONE sqlite connection for writes across the asyncio loop, APScheduler
     # jobs and the Selenium render thread pool. A reentrant lock serialises every
     # cursor so concurrent threads cannot interleave on the shared connection
     # ("recursive use of cursors" / silent read corruption). RLock so a thread
     # already inside a locked block (e.g. award_badge during a transfer) can
     # re-acquire without deadlocking.
     _lock = threading.RLock()
+    # Plain reads (fetch_one/fetch_all) don't queue behind that lock: WAL lets readers run
+    # alongside the writer, so each thread gets its own read-only connection and a
+    # leaderboard or statement query no longer stalls an XP write or a transfer. A thread
+    # that is inside a locked write block keeps reading on the writer connection, so it
+    # still sees its own uncommitted statements.
+    _local = threading.local()
 
     @classmethod
     def get_connection(cls):
@@ -22,12 +34,59 @@ class DatabaseManager:
             cls._connection.execute("PRAGMA synchronous=NORMAL")
             # Wait (instead of erroring) if another writer holds the file lock.
             cls._connection.execute("PRAGMA busy_timeout=5000")
+            # INSERT OR REPLACE on ukpence must fire the supply counter's DELETE trigger for
+            # the row it replaces, or the old balance would never be taken off the total.
+            cls._connection.execute("PRAGMA recursive_triggers=ON")
         return cls._connection
 
+    @classmethod
+    @contextmanager
+    def _writing(cls):
+        """Hold the write lock on the writer connection, marking this thread as a writer
+        for the duration so its reads are routed to the same connection."""
+        with cls._lock:
+            cls._local.writing = getattr(cls._local, "writing", 0) + 1
+            try:
+                yield cls.get_connection()
+            finally:
+                cls._local.writing -= 1
+
+    @classmethod
+    def _reader(cls):
+        """This thread's read-only connection, or None to read on the writer instead.
+
+        A reader is tied to the writer connection it was opened alongside: when that is
+        replaced (a new DB_FILE, a shutdown checkpoint, a test swapping databases) the
+        reader is reopened against the current file on its next use.
+        """
+        local = cls._local
+        if getattr(local, "writing", 0):
+            return None
+        writer = cls._connection
+        if writer is None:
+            with cls._lock:
+                writer = cls.get_connection()
+        cached = getattr(local, "reader", None)
+        if cached is not None:
+            if cached[0] is writer:
+                return cached[1]
+            local.reader = None
+            try:
+                cached[1].close()
+            except sqlite3.Error:
+                pass
+        try:
+            path = urllib.parse.quote(os.path.abspath(DB_FILE))
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout=5000")
+        except sqlite3.Error:
+            return None
+        local.reader = (writer, conn)
+        return conn
+
     @staticmethod
     def execute(query, params=()):
-        with DatabaseManager._lock:
-            conn = DatabaseManager.get_connection()
+        with DatabaseManager._writing() as conn:
             c = conn.cursor()
             c.execute(query, params)
             conn.commit()
@@ -36,8 +95,7 @@ class DatabaseManager:
     @staticmethod
     def execute_insert(query, params=()):
         """Run an INSERT and return the new row id (cursor.lastrowid)."""
-        with DatabaseManager._lock:
-            conn = DatabaseManager.get_connection()
+        with DatabaseManager._writing() as conn:
             c = conn.cursor()
             c.execute(query, params)
             conn.commit()
@@ -45,19 +103,35 @@ class DatabaseManager:
 
     @staticmethod
     def fetch_one(query, params=()):
-        with DatabaseManager._lock:
-            conn = DatabaseManager.get_connection()
-            c = conn.cursor()
+        reader = DatabaseManager._reader()
+        if reader is None:
+            with DatabaseManager._writing() as conn:
+                c = conn.cursor()
+                c.execute(query, params)
+                return c.fetchone()
+        c = reader.cursor()
+        try:
             c.execute(query, params)
             return c.fetchone()
+        finally:
+            # Resetting the statement ends the read transaction, so the next read sees
+            # everything committed since.
+            c.close()
 
     @staticmethod
     def fetch_all(query, params=()):
-        with DatabaseManager._lock:
-            conn = DatabaseManager.get_connection()
-            c = conn.cursor()
+        reader = DatabaseManager._reader()
+        if reader is None:
+            with DatabaseManager._writing() as conn:
+                c = conn.cursor()
+                c.execute(query, params)
+                return c.fetchall()
+        c = reader.cursor()
+        try:
             c.execute(query, params)
             return c.fetchall()
+        finally:
+            c.close()
 
     @classmethod
     @contextmanager
@@ -69,8 +143,7 @@ class DatabaseManager:
         for ``with DatabaseManager.get_connection() as conn:`` that also serialises
         against every other DB caller.
         """
-        with cls._lock:
-            conn = cls.get_connection()
+        with cls._writing() as conn:
             with conn:
                 yield conn
 
@@ -83,8 +156,7 @@ class DatabaseManager:
         Relies on sqlite3's implicit transaction (opened on the first DML), so
         no explicit BEGIN is issued and it never nests transactions.
         """
-        with cls._lock:
-            conn = cls.get_connection()
+        with cls._writing() as conn:
             try:
                 yield conn.cursor()
                 conn.commit()
@@ -216,6 +288,12 @@ class DatabaseManager:
 
         _mark_balance_point_committed(src_history)
         _mark_balance_point_committed(dst_history)
+        from config import BOT_ID
+        from lib.economy import guard_state
+        guard_state.note_balance(src_id, -amount)
+        guard_state.note_balance(dst_id, amount)
+        if record_pay_transfer and str(dst_id) != str(BOT_ID):
+            guard_state.note_outflow(src_id, amount, now)
 
         # Anti-laundering, once the transfer is committed and outside the transaction: a
         # detector must never hold a write lock, and must never be able to fail a payment
@@ -238,7 +316,6 @@ class DatabaseManager:
             except Exception:
                 pass
 
-        from config import BOT_ID
         if new_dst_balance >= 30000 and old_dst_balance < 30000 and str(dst_id) != str(BOT_ID):
             try:
                 from lib.bot.event_handlers import award_badge_notify
@@ -268,6 +345,223 @@ class DatabaseManager:
         with DatabaseManager.transaction() as c:
             c.execute('DELETE FROM archived_channels WHERE channel_id = ?', (str(channel_id),))
 
+class _StatementBatch:
+    """The statements queued inside ``async with AsyncDatabaseManager.transaction()``."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, query, params=()):
+        self.statements.append((query, params))
+
+    def executemany(self, query, seq_of_params):
+        for params in seq_of_params:
+            self.statements.append((query, params))
+
+    def apply(self):
+        with DatabaseManager.transaction() as c:
+            for query, params in self.statements:
+                c.execute(query, params)
+
+
+class AsyncDatabaseManager:
+    """Awaitable front for DatabaseManager, for code running on the event loop.
+
+    Each call is handed to a worker thread, so a slow statement query or a write waiting on
+    the lock parks there instead of freezing gateway heartbeats and interaction acks.
+    Writes go to one dedicated DB thread - they serialise on the write lock anyway, so more
+    threads would only queue on it - and reads to a small pool, each thread holding its own
+    read-only connection.
+
+    ``transaction()`` collects statements and applies them atomically on the DB thread when
+    the block exits; the write lock is never held across an ``await``, since a synchronous
+    write elsewhere on the loop would then wait on a lock only the loop could release.
+    Read-modify-write logic belongs in a plain function passed to ``run``.
+    """
+    READ_WORKERS = 4
+    _write_executor = None
+    _read_executor = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def _executor(cls, read):
+        with cls._executor_lock:
+            if read:
+                if cls._read_executor is None:
+                    cls._read_executor = ThreadPoolExecutor(
+                        max_workers=cls.READ_WORKERS, thread_name_prefix="db-read")
+                return cls._read_executor
+            if cls._write_executor is None:
+                cls._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+            return cls._write_executor
+
+    @classmethod
+    async def _submit(cls, read, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls._executor(read), functools.partial(fn, *args, **kwargs))
+
+    @classmethod
+    async def run(cls, fn, *args, **kwargs):
+        """Run a synchronous function that writes (directly or through a manager) on the
+        DB thread and return its result."""
+        return await cls._submit(False, fn, *args, **kwargs)
+
+    @classmethod
+    async def run_read(cls, fn, *args, **kwargs):
+        """Run a synchronous function that only reads on the read pool."""
+        return await cls._submit(True, fn, *args, **kwargs)
+
+    @classmethod
+    async def execute(cls, query, params=()):
+        return await cls._submit(False, DatabaseManager.execute, query, params)
+
+    @classmethod
+    async def execute_insert(cls, query, params=()):
+        return await cls._submit(False, DatabaseManager.execute_insert, query, params)
+
+    @classmethod
+    async def fetch_one(cls, query, params=()):
+        return await cls._submit(True, DatabaseManager.fetch_one, query, params)
+
+    @classmethod
+    async def fetch_all(cls, query, params=()):
+        return await cls._submit(True, DatabaseManager.fetch_all, query, params)
+
+    @classmethod
+    @asynccontextmanager
+    async def transaction(cls):
+        """Queue statements with ``tx.execute(...)``; they commit together on a clean exit
+        and are dropped if the block raises."""
+        batch = _StatementBatch()
+        yield batch
+        if batch.statements:
+            await cls._submit(False, batch.apply)
+
+    @classmethod
+    def shutdown(cls):
+        """Let queued work finish and stop the worker threads. Called on graceful shutdown
+        before the WAL checkpoint; anything awaited afterwards starts fresh workers."""
+        with cls._executor_lock:
+            executors = (cls._write_executor, cls._read_executor)
+            cls._write_executor = cls._read_executor = None
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+
+class TelemetryQueue:
+    """Group commit for fire-and-forget telemetry writes (message archive, member profiles,
+    XP ticks).
+
+    Every user message used to cost several auto-commit writes, each its own WAL commit.
+    Statements submitted here are instead queued and applied by a background thread in one
+    transaction every FLUSH_INTERVAL seconds, or sooner once FLUSH_SIZE are waiting. Only
+    use it for writes whose loss on a hard crash is harmless and which nothing reads back
+    within the interval; money never goes through here. The backlog is bounded - if the
+    database stalls long enough to fill it, new telemetry is dropped and counted rather
+    than growing memory without limit. ``flush()`` runs on graceful shutdown.
+    """
+    FLUSH_INTERVAL = 0.5
+    FLUSH_SIZE = 200
+    MAX_BACKLOG = 10_000
+    _pending = deque()
+    _cond = threading.Condition()
+    # Held across take-and-commit so two flushes can't commit their batches out of order.
+    _flush_lock = threading.Lock()
+    _thread = None
+    dropped = 0
+    commits = 0
+
+    @classmethod
+    def submit(cls, query, params=()):
+        """Queue one statement. Never blocks; returns False if the backlog is full."""
+        with cls._cond:
+            if len(cls._pending) >= cls.MAX_BACKLOG:
+                cls.dropped += 1
+                if cls.dropped % 1000 == 1:
+                    print(f"[db] telemetry backlog full; {cls.dropped} writes dropped so far")
+                return False
+            cls._pending.append((query, params))
+            if cls._thread is None or not cls._thread.is_alive():
+                cls._thread = threading.Thread(target=cls._run, name="db-telemetry", daemon=True)
+                cls._thread.start()
+            if len(cls._pending) >= cls.FLUSH_SIZE:
+                cls._cond.notify()
+        return True
+
+    @classmethod
+    def backlog(cls):
+        return len(cls._pending)
+
+    @classmethod
+    def _run(cls):
+        while True:
+            with cls._cond:
+                if len(cls._pending) < cls.FLUSH_SIZE:
+                    cls._cond.wait(cls.FLUSH_INTERVAL)
+            try:
+                cls.flush()
+            except Exception as e:
+                print(f"[db] telemetry flush failed: {e}")
+
+    @classmethod
+    def flush(cls):
+        """Commit everything queued so far in one transaction. Returns statements written."""
+        with cls._flush_lock:
+            with cls._cond:
+                batch = list(cls._pending)
+                cls._pending.clear()
+            if not batch:
+                return 0
+            try:
+                with DatabaseManager.transaction() as c:
+                    for query, params in batch:
+                        c.execute(query, params)
+                cls.commits += 1
+            except Exception:
+                # One bad statement must not take the rest of the batch down with it.
+                for query, params in batch:
+                    try:
+                        DatabaseManager.execute(query, params)
+                    except Exception as e:
+                        print(f"[db] telemetry write dropped: {e}")
+            return len(batch)
+
+
+# The per-day scalar counters of a server summary, in summary_days column order.
+SUMMARY_SCALARS = (
+    "total_members", "members_joined", "members_left", "members_banned",
+    "total_messages", "reactions_added", "reactions_removed", "deleted_messages",
+    "boosters_gained", "boosters_lost",
+)
+
+
+def write_summary_day(cursor, date, data):
+    """Replace one day in the normalised summary tables from its dict form (the shape
+    lib/features/summary.py works in). Runs on the caller's cursor so it joins their
+    transaction."""
+    cursor.execute(
+        f"INSERT OR REPLACE INTO summary_days (date, {', '.join(SUMMARY_SCALARS)}) "
+        f"VALUES (?{', ?' * len(SUMMARY_SCALARS)})",
+        (date, *(int(data.get(key) or 0) for key in SUMMARY_SCALARS)),
+    )
+    cursor.execute("DELETE FROM summary_channel_days WHERE date = ?", (date,))
+    cursor.executemany(
+        "INSERT INTO summary_channel_days (date, channel_id, messages) VALUES (?, ?, ?)",
+        [(date, str(cid), int(n)) for cid, n in (data.get("messages") or {}).items()],
+    )
+    members = {}
+    for uid, n in (data.get("active_members") or {}).items():
+        members.setdefault(str(uid), [0, 0])[0] = int(n)
+    for uid, n in (data.get("reacting_members") or {}).items():
+        members.setdefault(str(uid), [0, 0])[1] = int(n)
+    cursor.execute("DELETE FROM summary_member_days WHERE date = ?", (date,))
+    cursor.executemany(
+        "INSERT INTO summary_member_days (date, user_id, messages, reactions) VALUES (?, ?, ?, ?)",
+        [(date, uid, m, r) for uid, (m, r) in members.items()],
+    )
+
+
 def init_db():
     with DatabaseManager.get_connection() as conn:
         c = conn.cursor()
@@ -283,6 +577,27 @@ def init_db():
                 balance INTEGER NOT NULL DEFAULT 0
             )
         ''')
+        # Running SUM(balance) over ukpence (total supply, the bank included), kept by
+        # triggers so it moves in the same transaction as every balance write. Resynced from
+        # the table below at each boot and audited on a schedule (reserve_policy).
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS economy_supply (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total INTEGER NOT NULL
+            )
+        ''')
+        c.execute('''
+            CREATE TRIGGER IF NOT EXISTS ukpence_supply_insert AFTER INSERT ON ukpence
+            BEGIN UPDATE economy_supply SET total = total + NEW.balance WHERE id = 1; END
+        ''')
+        c.execute('''
+            CREATE TRIGGER IF NOT EXISTS ukpence_supply_update AFTER UPDATE OF balance ON ukpence
+            BEGIN UPDATE economy_supply SET total = total + NEW.balance - OLD.balance WHERE id = 1; END
+        ''')
+        c.execute('''
+            CREATE TRIGGER IF NOT EXISTS ukpence_supply_delete AFTER DELETE ON ukpence
+            BEGIN UPDATE economy_supply SET total = total - OLD.balance WHERE id = 1; END
+        ''')
         c.execute('''
             CREATE TABLE IF NOT EXISTS xp (
                 user_id TEXT PRIMARY KEY,
@@ -431,6 +746,106 @@ def init_db():
                 data TEXT NOT NULL
             )
         ''')
+        # Normalised daily summaries: the scalar counters per day, plus one row per
+        # (date, channel) and (date, member). Weekly/monthly/custom ranges are then a
+        # GROUP BY over an indexed date range instead of parsing and merging one JSON blob
+        # per day. daily_summaries above is kept only as the migration source.
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS summary_days (
+                date TEXT PRIMARY KEY,
+                total_members INTEGER NOT NULL DEFAULT 0,
+                members_joined INTEGER NOT NULL DEFAULT 0,
+                members_left INTEGER NOT NULL DEFAULT 0,
+                members_banned INTEGER NOT NULL DEFAULT 0,
+                total_messages INTEGER NOT NULL DEFAULT 0,
+                reactions_added INTEGER NOT NULL DEFAULT 0,
+                reactions_removed INTEGER NOT NULL DEFAULT 0,
+                deleted_messages INTEGER NOT NULL DEFAULT 0,
+                boosters_gained INTEGER NOT NULL DEFAULT 0,
+                boosters_lost INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS summary_channel_days (
+                date TEXT NOT NULL,
+                channel_id TEXT NOT NULL,
+                messages INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, channel_id)
+            )
+        ''')
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS summary_member_days (
+                date TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                messages INTEGER NOT NULL DEFAULT 0,
+                reactions INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, user_id)
+            )
+        ''')
+        # Fold the legacy JSON blobs in. Per date, and only for dates the normalised tables
+        # do not have yet, so it is a no-op after the first boot and a restored old backup
+        # is picked up by the next one without anything being counted twice.
+        import json as _json
+        _legacy = c.execute(
+            "SELECT date, data FROM daily_summaries "
+            "WHERE date NOT IN (SELECT date FROM summary_days)"
+        ).fetchall()
+        for _date, _blob in _legacy:
+            try:
+                write_summary_day(c, _date, _json.loads(_blob))
+            except (ValueError, TypeError, AttributeError) as _e:
+                print(f"[db] Skipped unreadable daily summary for {_date}: {_e}")
+        # Feature state that used to be a whole JSON file per feature, one row per
+        # top-level key (lib/core/state_store). `value` is the key's JSON.
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS kv_store (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at INTEGER NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        ''')
+        # In-flight views that must keep their buttons across a restart, one row per
+        # message (lib/core/persistent_views). `payload` is the entry's JSON.
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS persistent_views (
+                message_id TEXT PRIMARY KEY,
+                type TEXT,
+                payload TEXT NOT NULL,
+                updated_at INTEGER NOT NULL
+            )
+        ''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_persistent_views_type ON persistent_views(type)')
+        # Message-driven badge counters (lib/core/activity_counters): kind + period ("" for a
+        # lifetime count, else a date / ISO week) + user. Dated periods expire and are purged.
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS activity_counters (
+                kind TEXT NOT NULL,
+                period TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                expires_at INTEGER,
+                PRIMARY KEY (kind, period, user_id)
+            ) WITHOUT ROWID
+        ''')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_activity_counters_expiry ON activity_counters(expires_at)')
+        # Distinct income sources per user (lib/features/income_badges), one bit per source.
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS income_sources (
+                user_id TEXT PRIMARY KEY,
+                mask INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        ''')
+        # Per-day economy totals (EconomyMetrics): chat/stage/booster rewards, taxes, circulation.
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS economy_metrics (
+                date TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, key)
+            ) WITHOUT ROWID
+        ''')
         c.execute('''
             CREATE TABLE IF NOT EXISTS economy_transactions (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -460,6 +875,43 @@ def init_db():
         c.execute("CREATE INDEX IF NOT EXISTS idx_casino_results_user ON casino_results(user_id)")
         c.execute("CREATE INDEX IF NOT EXISTS idx_casino_results_game ON casino_results(game)")
 
+        # Rollups of casino_results, written in the same transaction as each round by
+        # casino_stats.record_result, so stats, leaderboards and the dashboard read a few
+        # buckets instead of every hand ever played. `hour` and `day` are the UTC epoch
+        # second the bucket starts at; min_net/max_net are the worst and best single round.
+        # House view: one row per game per hour (drives the 24h/7d/30d house edge).
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS casino_hourly (
+                game TEXT NOT NULL,
+                hour INTEGER NOT NULL,
+                rounds INTEGER NOT NULL DEFAULT 0,
+                staked INTEGER NOT NULL DEFAULT 0,
+                payout INTEGER NOT NULL DEFAULT 0,
+                net INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (game, hour)
+            ) WITHOUT ROWID
+        ''')
+        # Player view: one row per player per game per day they played it.
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS casino_user_daily (
+                user_id TEXT NOT NULL,
+                game TEXT NOT NULL,
+                day INTEGER NOT NULL,
+                rounds INTEGER NOT NULL DEFAULT 0,
+                wins INTEGER NOT NULL DEFAULT 0,
+                losses INTEGER NOT NULL DEFAULT 0,
+                pushes INTEGER NOT NULL DEFAULT 0,
+                staked INTEGER NOT NULL DEFAULT 0,
+                payout INTEGER NOT NULL DEFAULT 0,
+                net INTEGER NOT NULL DEFAULT 0,
+                min_net INTEGER NOT NULL DEFAULT 0,
+                max_net INTEGER NOT NULL DEFAULT 0,
+                last_ts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, game, day)
+            ) WITHOUT ROWID
+        ''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_casino_user_daily_day ON casino_user_daily(day)")
+
         # National Lottery: one row per round, plus aggregated per-user entries. A round
         # is 'open' (selling tickets) then 'drawn' (winner picked, pot paid). tickets_sold
         # is SUM(lottery_entries.tickets); the draw weights by ticket count.
@@ -515,6 +967,16 @@ def init_db():
             )
         ''')
         c.execute('CREATE INDEX IF NOT EXISTS idx_balance_history_user_ts ON balance_history (user_id, ts)')
+        # Daily end-of-day balances (lib/economy/balance_snapshots), one row per user per
+        # day, clustered on (user_id, date) so a user's history is one range read.
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS balance_snapshots (
+                user_id TEXT NOT NULL,
+                date TEXT NOT NULL,
+                balance INTEGER NOT NULL,
+                PRIMARY KEY (user_id, date)
+            ) WITHOUT ROWID
+        ''')
         # Durable per-user ledger of signed money moves (with the human-readable reason that
         # flows through the economy chokepoints) for the /balance "Statement" feature.
         c.execute('''
@@ -548,10 +1010,10 @@ def init_db():
         
         # Calculate the correct bank balance from the closed economy total (800,000 UKP)
         # Bank = 800,000 - sum(all non-bot user balances)
-        from config import BOT_ID
+        from config import BOT_ID, ECONOMY_TOTAL_SUPPLY
         c.execute("SELECT COALESCE(SUM(balance), 0) FROM ukpence WHERE user_id != ?", (str(BOT_ID),))
         total_user_balances = c.fetchone()[0]
-        correct_bank_balance = max(800_000 - total_user_balances, 0)
+        correct_bank_balance = max(ECONOMY_TOTAL_SUPPLY - total_user_balances, 0)
         
         # Set bot's ukpence to the correct bank balance
         c.execute("INSERT OR REPLACE INTO ukpence (user_id, balance) VALUES (?, ?)", (str(BOT_ID), correct_bank_balance))
@@ -559,6 +1021,10 @@ def init_db():
         # Sync the bank table to match
         import time as _time
         c.execute("UPDATE bank SET balance = ?, last_updated = ? WHERE id = 1", (correct_bank_balance, int(_time.time())))
+        # Start the supply counter from the real sum: anything that wrote ukpence while the
+        # triggers weren't there (or on a connection without recursive_triggers) is undone.
+        c.execute("INSERT OR REPLACE INTO economy_supply (id, total) "
+                  "SELECT 1, COALESCE(SUM(balance), 0) FROM ukpence")
         c.execute('''
             CREATE TABLE IF NOT EXISTS pay_transfers (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -581,8 +1047,14 @@ def init_db():
                 amount INTEGER NOT NULL
             )
         ''')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_game_loser ON game_transfers(loser_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_game_winner ON game_transfers(winner_id)')
+        # Every reader filters one side by user and a time window and sums amount (the /pay
+        # cap, wager guard, effective wealth, wash detection), so each side gets a covering
+        # (user, timestamp, amount, counterparty) index: a range seek with no row lookups.
+        # They supersede the old single-column indexes, which are dropped.
+        c.execute('CREATE INDEX IF NOT EXISTS idx_game_loser_ts ON game_transfers(loser_id, timestamp, amount, winner_id)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_game_winner_ts ON game_transfers(winner_id, timestamp, amount, loser_id)')
+        c.execute('DROP INDEX IF EXISTS idx_game_loser')
+        c.execute('DROP INDEX IF EXISTS idx_game_winner')
         c.execute('''
             CREATE TABLE IF NOT EXISTS badges (
                 id TEXT PRIMARY KEY,
@@ -728,8 +1200,11 @@ def init_db():
                 "SELECT 'connect4', winner_id, loser_id, stake, "
                 "CASE WHEN winner_id IS NULL THEN 'draw' ELSE 'win' END, timestamp "
                 "FROM connect4_results")
-        c.execute('CREATE INDEX IF NOT EXISTS idx_pay_payer ON pay_transfers(payer_id)')
-        c.execute('CREATE INDEX IF NOT EXISTS idx_pay_recipient ON pay_transfers(recipient_id)')
+        # Covering (user, timestamp, amount, counterparty) indexes, as for game_transfers above.
+        c.execute('CREATE INDEX IF NOT EXISTS idx_pay_payer_ts ON pay_transfers(payer_id, timestamp, amount, recipient_id)')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_pay_recipient_ts ON pay_transfers(recipient_id, timestamp, amount, payer_id)')
+        c.execute('DROP INDEX IF EXISTS idx_pay_payer')
+        c.execute('DROP INDEX IF EXISTS idx_pay_recipient')
         # Fixed-term savings ("bonds"): principal held in the bank while locked; on maturity
         # the bank repays principal + interest. status: active | matured | withdrawn.
         c.execute('''
@@ -1086,23 +1561,115 @@ def init_db():
                 (str(BOT_ID), badge_id, now_ts)
             )
         conn.commit()
+    BadgeOwnership.reset()
 
 if __name__ == '__main__':
     init_db()
 
+class BadgeOwnership:
+    """In-memory copy of ``user_badges`` as user id -> set of badge ids.
+
+    Seasonal and milestone badges are re-offered on every qualifying message, reaction and
+    voice tick, and each attempt used to be an INSERT OR IGNORE plus a commit even though the
+    user nearly always holds the badge already (April Fools' Day alone was thousands). With
+    this set an owned badge is turned away without touching SQLite.
+
+    Loaded whole on first use and kept in step by award_badge / revoke_badges. Badges removed
+    by another process (the remove scripts run standalone) are noticed through the writer's
+    ``PRAGMA data_version``, which moves whenever some other connection commits; that is
+    checked at most every REVALIDATE_SECONDS, so such a removal takes effect within that.
+    """
+    REVALIDATE_SECONDS = 30
+    _owned = None
+    _conn = None           # writer connection the set was loaded through
+    _version = None
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def _load(cls, conn):
+        """(Re)load from the table if it's missing or stale. Caller holds the DB write lock."""
+        import time
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if cls._owned is None or cls._conn is not conn or cls._version != version:
+            owned = {}
+            for uid, badge_id in conn.execute("SELECT user_id, badge_id FROM user_badges"):
+                owned.setdefault(str(uid), set()).add(badge_id)
+            with cls._lock:
+                cls._owned, cls._conn, cls._version = owned, conn, version
+        cls._checked_at = time.monotonic()
+
+    @classmethod
+    def owns(cls, user_id, badge_id) -> bool:
+        """Whether the cached set says ``user_id`` holds ``badge_id``. False when unsure."""
+        import time
+        if (cls._owned is None or cls._conn is not DatabaseManager._connection
+                or time.monotonic() - cls._checked_at > cls.REVALIDATE_SECONDS):
+            return False
+        with cls._lock:
+            return badge_id in cls._owned.get(str(user_id), ())
+
+    @classmethod
+    def note(cls, user_id, badge_id, held: bool) -> None:
+        with cls._lock:
+            if cls._owned is None:
+                return
+            badges = cls._owned.setdefault(str(user_id), set())
+            if held:
+                badges.add(badge_id)
+            else:
+                badges.discard(badge_id)
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._owned = cls._conn = cls._version = None
+
+
 def award_badge(user_id: str, badge_id: str):
+    """Give ``user_id`` a badge. Returns True only if it was newly awarded."""
     import time
+    if BadgeOwnership.owns(user_id, badge_id):
+        return False
     try:
-        # returns rowcount: 1 if inserted, 0 if ignored
-        result = DatabaseManager.execute(
-            "INSERT OR IGNORE INTO user_badges (user_id, badge_id, awarded_at) VALUES (?, ?, ?)",
-            (str(user_id), badge_id, int(time.time()))
-        )
-        return result > 0
+        with DatabaseManager._writing() as conn:
+            BadgeOwnership._load(conn)
+            if BadgeOwnership.owns(user_id, badge_id):
+                return False
+            c = conn.cursor()
+            # rowcount: 1 if inserted, 0 if ignored
+            c.execute(
+                "INSERT OR IGNORE INTO user_badges (user_id, badge_id, awarded_at) VALUES (?, ?, ?)",
+                (str(user_id), badge_id, int(time.time()))
+            )
+            conn.commit()
+            BadgeOwnership.note(user_id, badge_id, True)
+            return c.rowcount > 0
     except Exception as e:
         print(f"Error awarding badge: {e}")
         return False
 
+
+def revoke_badges(user_id: str, badge_id: str = None) -> int:
+    """Take one badge (or, with no ``badge_id``, every badge) from ``user_id``. Returns rows
+    removed."""
+    with DatabaseManager._writing() as conn:
+        c = conn.cursor()
+        if badge_id is None:
+            c.execute("DELETE FROM user_badges WHERE user_id = ?", (str(user_id),))
+        else:
+            c.execute("DELETE FROM user_badges WHERE user_id = ? AND badge_id = ?",
+                      (str(user_id), badge_id))
+        conn.commit()
+        removed = c.rowcount
+    if badge_id is None:
+        with BadgeOwnership._lock:
+            if BadgeOwnership._owned is not None:
+                BadgeOwnership._owned.pop(str(user_id), None)
+    else:
+        BadgeOwnership.note(user_id, badge_id, False)
+    return removed
+
 def get_user_badges(user_id: str):
     query = """
         SELECT b.id, b.name, b.description, b.icon_path, ub.awarded_at, b.rarity
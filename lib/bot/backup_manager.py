@@ -28,7 +28,6 @@ MAX_JSON_TOTAL_BYTES = 128 * 1024 * 1024
 MAX_JSON_FILE_BYTES = 16 * 1024 * 1024
 MAX_JSON_FILES = 10_000
 ALLOW_EMPTY_DB_BOOTSTRAP_ENV = "ALLOW_EMPTY_DB_BOOTSTRAP"
-ECONOMY_TOTAL_SUPPLY = 800_000
 ESSENTIAL_DATABASE_TABLES = frozenset({
     "bank",
     "economy_transactions",
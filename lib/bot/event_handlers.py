@@ -8,7 +8,7 @@ from lib.core.translation import translate_and_send
 from lib.features.summary import initialize_summary_data, update_summary_data, post_summary
 from lib.core.utils import post_summary_helper, generate_rank_card
 from lib.core.discord_helpers import has_role, has_any_role, send_embed_to_channels, edit_voice_channel_members, fetch_messages_with_context, estimate_tokens
-from lib.core.file_operations import load_persistent_views, save_persistent_views, load_json_file, save_json_file, set_file_status, is_file_status_active, load_webhook_deletions, save_webhook_deletions
+from lib.core.file_operations import save_persistent_views, load_json_file, save_json_file, set_file_status, is_file_status_active, load_webhook_deletions, save_webhook_deletions
 from lib.core.utils import is_lockdown_active
 from lib.core.image_processing import trim_image, find_non_overlapping_position, random_color_excluding_blue_and_dark
 from lib.core.log_functions import create_message_image, create_edited_message_image
@@ -451,14 +451,26 @@ def award_badge_notify(user_id: int, badge_id: str):
     falls back to a silent award so the badge is never lost."""
     client = _BADGE_NOTIFY_CLIENT
     if client is not None:
+        import asyncio
         try:
-            import asyncio
             asyncio.get_running_loop().create_task(
                 award_badge_with_notify(client, user_id, badge_id)
             )
             return
         except RuntimeError:
-            pass  # No running loop (e.g. offline script) - award silently below.
+            pass
+        # Off the loop - typically a manager call handed to an AsyncDatabaseManager
+        # worker thread - so hand the coroutine back to the bot's loop. With no running
+        # loop at all (e.g. offline script) award silently below.
+        try:
+            loop = client.loop
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(
+                    award_badge_with_notify(client, user_id, badge_id), loop
+                )
+                return
+        except Exception:
+            pass
     from database import award_badge
     if award_badge(user_id, badge_id):
         try:
@@ -470,20 +482,20 @@ def award_badge_notify(user_id: int, badge_id: str):
 
 async def award_badge_with_notify(client, user_id: int, badge_id: str):
     """Awards a badge and notifies the user via DM and logs to bot-usage-log."""
-    from database import award_badge, DatabaseManager
-    
-    newly_awarded = award_badge(user_id, badge_id)
+    from database import award_badge, AsyncDatabaseManager
+
+    newly_awarded = await AsyncDatabaseManager.run(award_badge, user_id, badge_id)
     if newly_awarded:
         # One-time UKPence reward for the badge (idempotent, paid from the bank).
         reward_paid = 0
         try:
             from lib.economy.badge_rewards import pay_badge_reward
-            reward_paid = pay_badge_reward(user_id, badge_id)
+            reward_paid = await AsyncDatabaseManager.run(pay_badge_reward, user_id, badge_id)
         except Exception:
             logger.error(f"Badge reward payment failed for {user_id}/{badge_id}", exc_info=True)
 
         # Get badge info
-        badge_info = DatabaseManager.fetch_one("SELECT name, description, icon_path, rarity FROM badges WHERE id = ?", (badge_id,))
+        badge_info = await AsyncDatabaseManager.fetch_one("SELECT name, description, icon_path, rarity FROM badges WHERE id = ?", (badge_id,))
         if not badge_info:
             logger.warning(f"Badge ID '{badge_id}' not found in database.")
             return
@@ -498,7 +510,8 @@ async def award_badge_with_notify(client, user_id: int, badge_id: str):
             reward_text = (
                 f"+{reward_paid:,} UKPence" if reward_paid else "No UKPence reward"
             )
-            create_notification(
+            await AsyncDatabaseManager.run(
+                create_notification,
                 user_id=user_id,
                 category="badge",
                 title=f"Badge earned: {badge_name}",
@@ -558,8 +571,8 @@ MAX_THREAD_USERS = 990
 
 def reattach_persistent_views(client):
     from commands.moderation.announcement_command import RoleButtonView
-    persistent_views = load_persistent_views()
-    for key, value in persistent_views.items():
+    from lib.core.persistent_views import PersistentViewRegistry
+    for key, value in PersistentViewRegistry.items():
         if key.startswith("archive_") and isinstance(value, dict) and "move_timestamp" in value and "msg_id" in value:
             channel_id = int(key.split("_")[1])
             channel = client.get_channel(channel_id)
@@ -1364,11 +1377,9 @@ async def on_message(client, message):
             
             # 1. Town Crier (First message of the day)
             today_str = now.strftime("%Y-%m-%d")
-            town_crier_data = load_json_file(TOWN_CRIER_TRACKING_FILE) or {}
-            if today_str not in town_crier_data:
-                town_crier_data[today_str] = str(message.author.id)
-                save_json_file(TOWN_CRIER_TRACKING_FILE, town_crier_data)
-                
+            from lib.core import activity_counters
+            if (activity_counters.get("town_crier", today_str, "first") == 0
+                    and activity_counters.increment("town_crier", today_str, "first") == 1):
                 # Only award if it's reasonably early (before 5 AM)
                 # This prevents awarding it to the first chatter when the bot starts mid-day
                 if now.hour < 5:
@@ -1398,15 +1409,7 @@ async def on_message(client, message):
             if now.weekday() in (5, 6):
                 # We need a unique key for the specific weekend (e.g., Year-WeekNumber)
                 weekend_key = f"{now.isocalendar()[0]}-W{now.isocalendar()[1]}"
-                ww_data = load_json_file(WEEKEND_WARRIOR_COUNTS_FILE) or {}
-                if weekend_key not in ww_data:
-                    ww_data[weekend_key] = {}
-                
-                uid_str = str(message.author.id)
-                ww_data[weekend_key][uid_str] = ww_data[weekend_key].get(uid_str, 0) + 1
-                save_json_file(WEEKEND_WARRIOR_COUNTS_FILE, ww_data)
-                
-                if ww_data[weekend_key][uid_str] >= 800:
+                if activity_counters.increment("weekend_warrior", weekend_key, message.author.id) >= 800:
                     await award_badge_with_notify(client, message.author.id, 'weekend_warrior')
 
             # 4. Periodic Pillar Check (Every 50 messages)
@@ -1563,6 +1566,11 @@ async def on_interaction(interaction: Interaction):
 
 
 async def on_member_join(member):
+    try:
+        from lib.features.xp_system import rank_index
+        rank_index.member_joined(member.id)
+    except Exception:
+        logger.debug("rank index join update failed", exc_info=True)
     try:
         # Oggers' join-watch: start listening to this joiner's first messages
         # (before the anti-raid early return, so quarantined joiners are covered).
@@ -1602,6 +1610,11 @@ def _client_for(member):
 
 
 async def on_member_remove(member):
+    try:
+        from lib.features.xp_system import rank_index
+        rank_index.member_left(member.id)
+    except Exception:
+        logger.debug("rank index leave update failed", exc_info=True)
     # If they are named on the live join-cluster report, cross them off it. A batch
     # emptying itself is worth seeing, and the card used to only learn about it when a
     # staff member pressed a button and got a failure back.
@@ -1825,11 +1838,8 @@ def track_morning_person(user_id: int) -> int:
     
     # 6 AM to 9 AM UK Time
     if 6 <= now.hour < 9:
-        data = load_json_file(MORNING_PERSON_COUNTS_FILE) or {}
-        uid = str(user_id)
-        data[uid] = data.get(uid, 0) + 1
-        save_json_file(MORNING_PERSON_COUNTS_FILE, data)
-        return data[uid]
+        from lib.core import activity_counters
+        return activity_counters.increment("morning_person", "", user_id)
     return 0
 
 def track_night_owl(user_id: int):
@@ -1838,26 +1848,20 @@ def track_night_owl(user_id: int):
     uk_tz = pytz.timezone("Europe/London")
     now = datetime.datetime.now(uk_tz)
     if 2 <= now.hour < 5:
-        data = load_json_file(NIGHT_OWL_COUNTS_FILE) or {}
-        uid = str(user_id)
-        data[uid] = data.get(uid, 0) + 1
-        save_json_file(NIGHT_OWL_COUNTS_FILE, data)
-        return data[uid]
+        from lib.core import activity_counters
+        return activity_counters.increment("night_owl", "", user_id)
     return 0
 
 def track_party_animal(user_id: int):
     import datetime
     import pytz
-    data = load_json_file(PARTY_ANIMAL_TARGETS_FILE) or {}
-    uid = str(user_id)
+    from lib.core import activity_counters
     uk_tz = pytz.timezone("Europe/London")
     date_str = datetime.datetime.now(uk_tz).strftime("%Y-%m-%d")
-    if uid not in data:
-        data[uid] = []
-    if date_str not in data[uid]:
-        data[uid].append(date_str)
-        save_json_file(PARTY_ANIMAL_TARGETS_FILE, data)
-    return len(data[uid])
+    # One count per distinct day: the per-day marker only reaches 1 once.
+    if activity_counters.increment("party_animal_day", date_str, user_id) == 1:
+        return activity_counters.increment("party_animal", "", user_id)
+    return activity_counters.get("party_animal", "", user_id)
 async def handle_shut_reaction(reaction, user):
     client = reaction.message._state._get_client()
     has_role = any(role.id in [ROLES.CABINET, ROLES.BORDER_FORCE] for role in user.roles)
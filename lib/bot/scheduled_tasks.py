@@ -28,27 +28,15 @@ MAX_THREAD_USERS = 990
 FORUM_CHANNEL_ID = 1341451323249266711
 
 def _update_daily_metric_file(date_str, key, value_to_add_or_set, is_total_value=False):
-    metrics_data = {}
-    if os.path.exists(ECONOMY_METRICS_FILE):
-        with open(ECONOMY_METRICS_FILE, "r") as f:
-            try:
-                metrics_data = json.load(f)
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding {ECONOMY_METRICS_FILE} while updating {key}.")
-
-    day_metrics = metrics_data.get(date_str, {})
-    if is_total_value:
-        day_metrics[key] = value_to_add_or_set
-    else:
-        current_value = day_metrics.get(key, 0)
-        day_metrics[key] = current_value + value_to_add_or_set
-
-    metrics_data[date_str] = day_metrics
-
-    atomic_write_json(ECONOMY_METRICS_FILE, metrics_data, indent=4)
+    from lib.economy.economy_manager import EconomyMetrics
+    EconomyMetrics.update_daily_metric(date_str, key, value_to_add_or_set, is_total_value)
 
 
 async def daily_summary(client):
+    # Yesterday's last few minutes of counters may still be in the write-behind cache;
+    # the top-chatter rewards below read the persisted file, so land them first.
+    _flush_summary_counters_now()
+
     uk_timezone = pytz.timezone("Europe/London")
     yesterday_dt = datetime.now(uk_timezone) - timedelta(days=1)
     yesterday_str = yesterday_dt.strftime("%Y-%m-%d")
@@ -104,25 +92,22 @@ async def daily_summary(client):
     else:
         logger.warning(f"No summary data file at {summary_file_path} for {yesterday_str}. Skipping top chatter rewards.")
 
-    metrics_data = {}
-    if os.path.exists(ECONOMY_METRICS_FILE):
-        with open(ECONOMY_METRICS_FILE, "r") as f:
-            try:
-                metrics_data = json.load(f)
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding {ECONOMY_METRICS_FILE}. Data for {yesterday_str} might be incomplete.")
-
-    day_metrics = metrics_data.get(yesterday_str, {})
-    day_metrics["chat_rewards_total"] = total_chat_rewards_this_cycle
-
     current_ukpence_balances = load_ukpence_data()
     total_circulation_at_eod = sum(current_ukpence_balances.values())
-    day_metrics["total_circulation_end_of_day"] = total_circulation_at_eod
+    from lib.economy.economy_manager import EconomyMetrics
+    EconomyMetrics.update_daily_metric(yesterday_str, "chat_rewards_total", total_chat_rewards_this_cycle, is_total_value=True)
+    EconomyMetrics.update_daily_metric(yesterday_str, "total_circulation_end_of_day", total_circulation_at_eod, is_total_value=True)
+    EconomyMetrics.flush()
 
-    metrics_data[yesterday_str] = day_metrics
+    logger.info(f"Finalized economy metrics for {yesterday_str}: ChatRewards={total_chat_rewards_this_cycle}, TotalCircEOD={total_circulation_at_eod}")
 
-    atomic_write_json(ECONOMY_METRICS_FILE, metrics_data, indent=4)
-    logger.info(f"Finalized economy metrics for {yesterday_str}: ChatRewards={day_metrics.get('chat_rewards_total', 'N/A')}, TotalCircEOD={total_circulation_at_eod}")
+    # The indexed copy the balance graph and /statement read; the JSON file below stays
+    # for the dashboard and the backups.
+    try:
+        from lib.economy.balance_snapshots import record as record_balance_snapshot
+        record_balance_snapshot(yesterday_str, current_ukpence_balances)
+    except Exception:
+        logger.error("balance_snapshots write failed", exc_info=True)
 
     if not os.path.exists(BALANCE_SNAPSHOT_DIR):
         try:
@@ -488,6 +473,56 @@ async def _bond_maturity_tick(client):
         logger.error("Bond maturity tick failed", exc_info=True)
 
 
+def _flush_summary_counters_now():
+    try:
+        from lib.features.summary import flush_summary_data
+        flush_summary_data()
+    except Exception:
+        logger.error("Summary counter flush failed", exc_info=True)
+
+
+async def _flush_summary_counters():
+    """Persist the daily-summary counters buffered in memory since the last tick."""
+    _flush_summary_counters_now()
+
+
+async def _flush_activity_counters():
+    """Write out badge activity counters changed since the last tick, even in a quiet spell
+    where no new message arrives to trigger a flush."""
+    try:
+        from lib.core import activity_counters
+        activity_counters.flush()
+    except Exception:
+        logger.error("Activity counter flush failed", exc_info=True)
+
+
+async def _flush_economy_metrics():
+    """Write out economy metric totals accumulated since the last tick."""
+    try:
+        from lib.economy.economy_manager import EconomyMetrics
+        EconomyMetrics.flush()
+    except Exception:
+        logger.error("Economy metrics flush failed", exc_info=True)
+
+
+async def _reconcile_guard_state():
+    """Check the in-memory economy guard figures against SQL and correct any drift."""
+    try:
+        from lib.economy import guard_state
+        await asyncio.to_thread(guard_state.reconcile)
+    except Exception:
+        logger.error("Economy guard state reconcile failed", exc_info=True)
+
+
+async def _audit_total_supply():
+    """Recompute total supply from the balances and check the running counter against it."""
+    try:
+        from lib.economy.reserve_policy import audit_total_supply
+        await asyncio.to_thread(audit_total_supply)
+    except Exception:
+        logger.error("Total supply audit failed", exc_info=True)
+
+
 async def _purge_message_archive(client):
     """Trim the rolling message archive (bulk-delete logging) past its retention window."""
     try:
@@ -531,6 +566,19 @@ def _register_client_jobs(client, scheduler):
                      id="render_engine_keeper", name="Keep headless Chrome warm",
                      next_run_time=discord.utils.utcnow() + timedelta(seconds=15))
 
+    # Daily-summary counters are buffered in memory per message/reaction; write them out
+    # as one row per day on a short interval (and at shutdown, from graceful_shutdown).
+    _add_process_job(scheduler, _flush_summary_counters, IntervalTrigger(seconds=30),
+                     id="flush_summary_counters", name="Flush daily summary counters")
+    _add_process_job(scheduler, _flush_activity_counters, IntervalTrigger(seconds=30),
+                     id="flush_activity_counters", name="Flush badge activity counters")
+    _add_process_job(scheduler, _flush_economy_metrics, IntervalTrigger(seconds=30),
+                     id="flush_economy_metrics", name="Flush economy metrics")
+    _add_process_job(scheduler, _reconcile_guard_state, IntervalTrigger(minutes=5),
+                     id="reconcile_guard_state", name="Reconcile economy guard state")
+    _add_process_job(scheduler, _audit_total_supply, IntervalTrigger(minutes=15),
+                     id="audit_total_supply", name="Audit the total supply counter")
+
     _add_process_job(scheduler, _bond_maturity_tick, IntervalTrigger(minutes=2), args=[client], id="bond_maturity_job", name="Pay matured bonds")
     _add_process_job(scheduler, _purge_message_archive, CronTrigger(hour=4, minute=30, timezone="Europe/London"), args=[client], id="purge_message_archive_job", name="Purge old message archive rows")
     _add_process_job(scheduler, award_booster_bonus, CronTrigger(hour=0, minute=0, timezone="Europe/London"), args=[client], id="award_booster_bonus_job", name="Award Daily Booster UKPence & Log SOD Circulation")
@@ -552,7 +600,8 @@ def _register_client_jobs(client, scheduler):
     _add_process_job(scheduler, backup_json_data, IntervalTrigger(minutes=5, timezone="Europe/London"), args=[client], id="backup_json_data_job", name="Backup JSON State")
     _add_process_job(scheduler, cleanup_webhook_reactions, IntervalTrigger(minutes=1), args=[client], id="cleanup_webhook_reactions_job", name="Cleanup Webhook Deletion Reactions")
 
-    _add_process_job(scheduler, process_economy_logs, IntervalTrigger(seconds=15), args=[client], id="process_economy_logs_interval", name="Process Economy Log Queue")
+    # Ticks at the busy interval; process_economy_logs backs off to 15s itself when idle.
+    _add_process_job(scheduler, process_economy_logs, IntervalTrigger(seconds=ECONOMY_LOG_BUSY_SECONDS), args=[client], id="process_economy_logs_interval", name="Process Economy Log Queue")
     _add_process_job(scheduler, process_voice_activity_log, IntervalTrigger(seconds=30), args=[client], id="process_voice_activity_log_interval", name="Post Voice Activity Log")
     # Discord's unusual-DM flag is not in discord.py, so this is a raw member sweep - 13
     # requests over a 12k guild. The flag lasts 24h, so 15 minutes is far finer than it
@@ -625,7 +674,7 @@ def _register_pending_scheduled_predictions(client, scheduler):
 
 async def apply_inactivity_tax(client):
     try:
-        from database import DatabaseManager
+        from database import AsyncDatabaseManager
         import time
         import config
         
@@ -642,7 +691,7 @@ async def apply_inactivity_tax(client):
             WHERE u.balance > 0
               AND COALESCE(x.last_xp_time, 0) < ?
         """
-        dormant_users = DatabaseManager.fetch_all(query, (limit,))
+        dormant_users = await AsyncDatabaseManager.fetch_all(query, (limit,))
         # BOT_ID holds the bank's own float - never tax the bank into itself.
         from config import BOT_ID
         dormant_users = [(u, b) for u, b in (dormant_users or []) if str(u) != str(BOT_ID)]
@@ -655,16 +704,23 @@ async def apply_inactivity_tax(client):
 
         # Charge on effective wealth (balance + recently sent − recently received) so a dormant
         # hoarder can't escape by shoving their stash onto another account just before the run.
-        # effective_wealth opens its own connections, so compute the plan BEFORE taking the lock;
-        # the tax is clamped to the real balance so it never takes more than is there.
-        from lib.economy.economy_manager import effective_wealth
-        plans = []  # (uid, tax_amount)
-        for uid, balance in dormant_users:
-            tax_amount = min(int(effective_wealth(uid, balance) * rate), int(balance))
-            if tax_amount > 0:
-                plans.append((uid, tax_amount))
-
-        charged = BankManager.collect_tax_batch(
+        # effective_wealth_batch opens its own connections, so compute the plan BEFORE taking
+        # the lock; the tax is clamped to the real balance so it never takes more than is there.
+        from lib.economy.economy_manager import effective_wealth_batch
+
+        def _plan():
+            plans = []  # (uid, tax_amount)
+            effective = effective_wealth_batch({str(uid): balance for uid, balance in dormant_users})
+            for uid, balance in dormant_users:
+                tax_amount = min(int(effective[str(uid)] * rate), int(balance))
+                if tax_amount > 0:
+                    plans.append((uid, tax_amount))
+            return plans
+
+        plans = await AsyncDatabaseManager.run_read(_plan)
+
+        charged = await AsyncDatabaseManager.run(
+            BankManager.collect_tax_batch,
             plans,
             description="Inactivity tax (60+ days dormant)",
             bank_description=f"Inactivity tax reclaimed from {len(plans)} users",
@@ -712,9 +768,9 @@ async def apply_wealth_demurrage(client):
         if rate <= 0 or threshold < 0:
             return
 
-        from database import DatabaseManager
+        from database import AsyncDatabaseManager, DatabaseManager
         from config import BOT_ID
-        from lib.economy.economy_manager import recent_transfer_io
+        from lib.economy.economy_manager import recent_transfer_io_batch
 
         now = int(time.time())
         window_start = now - window_days * 86400
@@ -729,7 +785,7 @@ async def apply_wealth_demurrage(client):
             ("SELECT user_id FROM ukpence WHERE balance > ? AND user_id != ?", (threshold, str(BOT_ID))),
             ("SELECT DISTINCT payer_id FROM pay_transfers WHERE timestamp > ?", (window_start,)),
         ):
-            for row in (DatabaseManager.fetch_all(src, params) or []):
+            for row in (await AsyncDatabaseManager.fetch_all(src, params) or []):
                 if row and row[0] is not None:
                     cand.add(str(row[0]))
         cand.discard(str(BOT_ID))
@@ -738,20 +794,27 @@ async def apply_wealth_demurrage(client):
             return
 
         # Phase 1 (no lock - these helpers open their own connections): work out what each
-        # candidate owes from a read-only snapshot.
-        plans = []  # (uid, amount)
-        for uid in cand:
-            bal_row = DatabaseManager.fetch_one("SELECT balance FROM ukpence WHERE user_id = ?", (uid,))
-            bal = int(bal_row[0]) if bal_row and bal_row[0] is not None else 0
-            if bal <= 0:
-                continue
-            # Effective wealth = what you hold + what you've shuffled out − what you've been sent.
-            # No peak term: money lost/spent genuinely left, so it isn't taxed.
-            inflow, outflow = recent_transfer_io(uid, window_days)
-            effective = max(0, bal + outflow - inflow)
-            amount = int((effective - threshold) * rate)
-            if amount > 0:
-                plans.append((uid, amount))
+        # candidate owes from a read-only snapshot, on the read pool. Balances and transfer
+        # totals come from a few grouped reads rather than a handful of queries per candidate.
+        def _plan():
+            plans = []  # (uid, amount)
+            balances = {}
+            for uid, bal in (DatabaseManager.fetch_all(
+                    "SELECT user_id, balance FROM ukpence WHERE balance > 0") or []):
+                if str(uid) in cand and bal is not None:
+                    balances[str(uid)] = int(bal)
+            io = recent_transfer_io_batch(balances, window_days)
+            for uid, bal in balances.items():
+                # Effective wealth = what you hold + what you've shuffled out − what you've been sent.
+                # No peak term: money lost/spent genuinely left, so it isn't taxed.
+                inflow, outflow = io[uid]
+                effective = max(0, bal + outflow - inflow)
+                amount = int((effective - threshold) * rate)
+                if amount > 0:
+                    plans.append((uid, amount))
+            return plans
+
+        plans = await AsyncDatabaseManager.run_read(_plan)
         if not plans:
             logger.info("[ECONOMY] Demurrage: nobody's effective excess rounded above 0.")
             return
@@ -759,7 +822,8 @@ async def apply_wealth_demurrage(client):
         # Phase 2: re-read/clamp every balance, write each user ledger, and credit
         # the bank as tax in one all-or-nothing transaction.
         label = f"Wealth demurrage ({rate:.0%}/wk over {threshold:,})"
-        charged = BankManager.collect_tax_batch(
+        charged = await AsyncDatabaseManager.run(
+            BankManager.collect_tax_batch,
             plans,
             description=label,
             bank_description=f"Weekly wealth demurrage from {len(plans)} users",
@@ -782,7 +846,7 @@ async def apply_wealth_demurrage(client):
         # from the richest players goes back out to the most active ones. The UKP already
         # sits in the bank; this only moves the accounting marker, so supply is untouched.
         from lib.economy.reserve_policy import fund_dividend_pot
-        added = fund_dividend_pot(total)
+        added = await AsyncDatabaseManager.run(fund_dividend_pot, total)
         if added:
             _update_daily_metric_file(current_date_str, "dividend_pot_in", added)
 
@@ -816,7 +880,7 @@ async def apply_economy_dormant_tax(client):
         if rate <= 0 or days <= 0:
             return
 
-        from database import DatabaseManager
+        from database import AsyncDatabaseManager
         from config import BOT_ID
         cut = int(time.time()) - days * 86400
 
@@ -826,7 +890,7 @@ async def apply_economy_dormant_tax(client):
         # in one table degrades the aim rather than skipping the run.
         last_active = {}
         for sql in (
-            "SELECT user_id, MAX(timestamp) FROM casino_results GROUP BY user_id",
+            "SELECT user_id, MAX(last_ts) FROM casino_user_daily GROUP BY user_id",
             "SELECT user_id, MAX(purchase_time) FROM shop_purchases GROUP BY user_id",
             "SELECT payer_id, MAX(timestamp) FROM pay_transfers GROUP BY payer_id",
             "SELECT user_id, MAX(opened_ts) FROM bonds GROUP BY user_id",
@@ -839,7 +903,7 @@ async def apply_economy_dormant_tax(client):
             "JOIN lottery_rounds r ON r.id = e.round_id GROUP BY e.user_id",
         ):
             try:
-                for uid, ts in (DatabaseManager.fetch_all(sql) or []):
+                for uid, ts in (await AsyncDatabaseManager.fetch_all(sql) or []):
                     if uid is None or ts is None:
                         continue
                     uid = str(uid)
@@ -849,7 +913,7 @@ async def apply_economy_dormant_tax(client):
                 logger.warning("[ECONOMY] Dormant-tax source unavailable, skipping it: %s",
                                sql.split(" FROM ")[-1].split(" ")[0], exc_info=True)
 
-        holders = DatabaseManager.fetch_all(
+        holders = await AsyncDatabaseManager.fetch_all(
             "SELECT user_id, balance FROM ukpence WHERE balance > ? AND user_id != ?",
             (floor, str(BOT_ID))) or []
 
@@ -865,7 +929,8 @@ async def apply_economy_dormant_tax(client):
             logger.info("[ECONOMY] Economy-dormant tax: nobody chargeable this run.")
             return
 
-        charged = BankManager.collect_tax_batch(
+        charged = await AsyncDatabaseManager.run(
+            BankManager.collect_tax_batch,
             plans,
             description=f"Dormant-account tax ({days}d without using the economy)",
             bank_description=f"Economy-dormant tax from {len(plans)} users",
@@ -957,63 +1022,148 @@ async def process_voice_activity_log(client):
         logger.error(f"Error posting voice activity log: {e}", exc_info=True)
 
 
+# Economy log drain. The job ticks every ECONOMY_LOG_BUSY_SECONDS but only does work once
+# its current interval has passed: ECONOMY_LOG_IDLE_SECONDS while the queue keeps up, the
+# busy interval (and up to ECONOMY_LOG_BURST messages per thread a run) while a backlog
+# remains. Each message carries as many rows as Discord's embed limits allow.
+ECONOMY_LOG_IDLE_SECONDS = 15
+ECONOMY_LOG_BUSY_SECONDS = 5
+ECONOMY_LOG_BURST = 3               # messages per thread per run; Discord allows 5 per 5s
+ECONOMY_LOG_STALE_SECONDS = 900     # warn when the oldest queued row is older than this
+_EMBED_FIELDS = 25
+_MESSAGE_EMBEDS = 10
+_MESSAGE_CHARS = 5900               # Discord's 6000 across every embed in a message, less slack
+
+_economy_log_state = {
+    "next_run": 0.0, "interval": ECONOMY_LOG_IDLE_SECONDS, "depth": 0, "oldest_age": 0,
+    "rows_sent": 0, "messages_sent": 0, "last_warned": 0.0,
+}
+
+
+def economy_log_metrics() -> dict:
+    """Queue depth and age as of the last drain, plus what it has sent since boot. Shown to
+    staff on /bank-status."""
+    state = _economy_log_state
+    return {key: state[key] for key in ("depth", "oldest_age", "interval", "rows_sent", "messages_sent")}
+
+
+def _pack_economy_log(entries, title, color):
+    """Split [(id, name, value)] into [(ids, embeds)] messages, each inside Discord's limits:
+    25 fields an embed, 10 embeds a message, 6000 characters across the whole message."""
+    messages = []
+    ids, embeds, chars = [], [], 0
+    for log_id, name, value in entries:
+        name, value = name[:256], (value or "\u200b")[:1024]
+        new_embed = not embeds or len(embeds[-1].fields) >= _EMBED_FIELDS
+        cost = len(name) + len(value) + (len(title) if not embeds else 0)
+        if ids and (chars + cost > _MESSAGE_CHARS or (new_embed and len(embeds) >= _MESSAGE_EMBEDS)):
+            messages.append((ids, embeds))
+            ids, embeds, chars = [], [], 0
+            new_embed, cost = True, len(name) + len(value) + len(title)
+        if new_embed:
+            # Only the first embed is titled; the rest continue it and save the characters.
+            embeds.append(discord.Embed(title=title if not embeds else None, color=color))
+        embeds[-1].add_field(name=name, value=value, inline=False)
+        ids.append(log_id)
+        chars += cost
+    if ids:
+        messages.append((ids, embeds))
+    return messages
+
+
 async def process_economy_logs(client):
+    import time
+    state = _economy_log_state
+    if time.monotonic() < state["next_run"]:
+        return
     try:
+        from database import AsyncDatabaseManager
+        logs = await AsyncDatabaseManager.fetch_all(
+            "SELECT id, timestamp, log_text FROM economy_transactions ORDER BY id ASC LIMIT ?",
+            (ECONOMY_LOG_BURST * _MESSAGE_EMBEDS * _EMBED_FIELDS,))
+        if logs:
+            await _drain_economy_logs(client, logs)
+    except Exception as e:
+        logger.error(f"Error processing economy logs queue: {e}")
+    finally:
+        await _measure_economy_log_backlog()
+
+
+async def _drain_economy_logs(client, logs):
+    from database import AsyncDatabaseManager
+
+    async def _thread(channel_id):
+        # Threads fall out of the cache once auto-archived; fetching revives them.
+        channel = client.get_channel(channel_id)
+        if channel is None:
+            try:
+                channel = await client.fetch_channel(channel_id)
+            except Exception:
+                return None
+        return channel
+
+    economy_log_thread = await _thread(CHANNELS.ECONOMY_LOG_THREAD)
+    passive_rewards_thread = await _thread(CHANNELS.PASSIVE_CHAT_REWARDS_THREAD)
+
+    usage, rewards, unroutable = [], [], []
+    for log_id, timestamp, text in logs:
+        # Parse log_text format: "emoji description|reason"
+        if "|" in text:
+            description_part, reason_part = text.rsplit("|", 1)
+        else:
+            description_part = text
+            reason_part = "Unspecified"
+
+        reason_stripped = reason_part.strip()
+        entry = (log_id, f"<t:{timestamp}:T> - {reason_stripped}", description_part.strip())
+        if reason_stripped == "Chatting activity reward" and passive_rewards_thread:
+            rewards.append(entry)
+        elif economy_log_thread:
+            usage.append(entry)
+        else:
+            unroutable.append(log_id)
+
+    def _delete(ids):
+        # Deleting is what marks a row sent, so it happens in one transaction per message
+        # right after that message lands: a failure later in the run can neither resend
+        # these rows nor lose the ones not yet sent.
         from database import DatabaseManager
-        import discord
-        logs = DatabaseManager.fetch_all("SELECT id, timestamp, log_text FROM economy_transactions ORDER BY id ASC LIMIT 10")
-        if not logs:
-            return
-            
-        async def _thread(channel_id):
-            # Threads fall out of the cache once auto-archived; fetching revives them.
-            channel = client.get_channel(channel_id)
-            if channel is None:
-                try:
-                    channel = await client.fetch_channel(channel_id)
-                except Exception:
-                    return None
-            return channel
+        with DatabaseManager.transaction() as c:
+            c.executemany("DELETE FROM economy_transactions WHERE id = ?", [(i,) for i in ids])
+
+    # No thread to post to: nothing will ever send these, so don't let them pile up.
+    if unroutable:
+        await AsyncDatabaseManager.run(_delete, unroutable)
+
+    for thread, entries, title, color in (
+        (economy_log_thread, usage, "💰 Economy Activity", 0x2ecc71),
+        (passive_rewards_thread, rewards, "📈 Chat Activity Rewards", 0x3498db),
+    ):
+        if not entries:
+            continue
+        for ids, embeds in _pack_economy_log(entries, title, color)[:ECONOMY_LOG_BURST]:
+            await thread.send(embeds=embeds)
+            await AsyncDatabaseManager.run(_delete, ids)
+            _economy_log_state["rows_sent"] += len(ids)
+            _economy_log_state["messages_sent"] += 1
 
-        economy_log_thread = await _thread(CHANNELS.ECONOMY_LOG_THREAD)
-        passive_rewards_thread = await _thread(CHANNELS.PASSIVE_CHAT_REWARDS_THREAD)
 
-        usage_embed = discord.Embed(title="💰 Economy Activity", color=0x2ecc71)
-        economy_embed = discord.Embed(title="📈 Chat Activity Rewards", color=0x3498db)
-        
-        usage_count = 0
-        economy_count = 0
-        ids_to_delete = []
-        
-        for log_id, timestamp, text in logs:
-            # Parse log_text format: "emoji description|reason"
-            if "|" in text:
-                description_part, reason_part = text.rsplit("|", 1)
-            else:
-                description_part = text
-                reason_part = "Unspecified"
-            
-            reason_stripped = reason_part.strip()
-            field_name = f"<t:{timestamp}:T> - {reason_stripped}"
-            field_value = description_part.strip()
-            
-            if reason_stripped == "Chatting activity reward" and passive_rewards_thread:
-                economy_embed.add_field(name=field_name, value=field_value, inline=False)
-                economy_count += 1
-            elif economy_log_thread:
-                usage_embed.add_field(name=field_name, value=field_value, inline=False)
-                usage_count += 1
-                
-            ids_to_delete.append(log_id)
-        
-        if ids_to_delete:
-            if usage_count > 0 and economy_log_thread:
-                await economy_log_thread.send(embed=usage_embed)
-            if economy_count > 0 and passive_rewards_thread:
-                await passive_rewards_thread.send(embed=economy_embed)
-                
-            placeholders = ",".join(["?"] * len(ids_to_delete))
-            DatabaseManager.execute(f"DELETE FROM economy_transactions WHERE id IN ({placeholders})", tuple(ids_to_delete))
-            
-    except Exception as e:
-        logger.error(f"Error processing economy logs queue: {e}")
+async def _measure_economy_log_backlog():
+    """Record queue depth/age and pick the next interval from it."""
+    import time
+    state = _economy_log_state
+    try:
+        from database import AsyncDatabaseManager
+        row = await AsyncDatabaseManager.fetch_one(
+            "SELECT COUNT(*), MIN(timestamp) FROM economy_transactions")
+        depth = int(row[0]) if row else 0
+        state["depth"] = depth
+        state["oldest_age"] = max(0, int(time.time()) - int(row[1])) if depth and row[1] else 0
+    except Exception:
+        logger.error("Economy log backlog check failed", exc_info=True)
+    state["interval"] = ECONOMY_LOG_BUSY_SECONDS if state["depth"] else ECONOMY_LOG_IDLE_SECONDS
+    state["next_run"] = time.monotonic() + state["interval"] - 0.5   # tolerate tick jitter
+    if state["oldest_age"] > ECONOMY_LOG_STALE_SECONDS and time.monotonic() - state["last_warned"] > 600:
+        state["last_warned"] = time.monotonic()
+        logger.warning("[ECONOMY] Economy log queue is behind: %s rows, oldest %ss old.",
+                       state["depth"], state["oldest_age"])
@@ -0,0 +1,182 @@
+"""Per-user activity counters for the message-driven badges.
+
+Night owl, morning person, party animal, town crier and weekend warrior each used to keep
+a JSON file that was loaded whole and rewritten on every message in its window - and the
+weekend-warrior one kept every user for every ISO week forever. Here a count lives in
+memory, keyed ``(kind, period, user)``, so ``increment`` is a dict update that hands back
+the new count for the badge threshold check. Changed counts are written to the compact
+``activity_counters`` table at most every FLUSH_INTERVAL seconds through the telemetry
+group commit, and a period's rows carry an expiry so old weekends and days are purged
+rather than kept forever.
+
+``period`` is whatever window the counter is for - ``""`` for a lifetime count, a date or
+an ISO week otherwise. A (kind, period) is read from the table the first time it is
+touched, so a restart picks up where the last flush left off.
+"""
+
+import threading
+import time
+
+from database import DatabaseManager, TelemetryQueue
+
+FLUSH_INTERVAL = 5.0
+PURGE_INTERVAL = 3600
+
+# How long a period's counts are kept after it was last touched, by kind. Kinds not listed
+# (lifetime counts, period "") never expire.
+EXPIRY_SECONDS = {
+    "weekend_warrior": 10 * 86400,
+    "town_crier": 2 * 86400,
+    "party_animal_day": 2 * 86400,
+}
+
+_lock = threading.Lock()
+_counts: dict[tuple[str, str, str], int] = {}
+_loaded: set[tuple[str, str]] = set()
+_dirty: set[tuple[str, str, str]] = set()
+_last_flush = time.monotonic()
+_last_purge = 0.0
+
+
+def _load(kind: str, period: str) -> None:
+    """Pull one (kind, period) from the table. Caller holds _lock."""
+    rows = DatabaseManager.fetch_all(
+        "SELECT user_id, count FROM activity_counters WHERE kind = ? AND period = ?",
+        (kind, period)) or []
+    for user, count in rows:
+        _counts.setdefault((kind, period, user), count)
+    _loaded.add((kind, period))
+
+
+def get(kind: str, period: str, user) -> int:
+    key = (kind, period, str(user))
+    with _lock:
+        if (kind, period) not in _loaded:
+            _load(kind, period)
+        return _counts.get(key, 0)
+
+
+def increment(kind: str, period: str, user, by: int = 1) -> int:
+    """Add ``by`` to a counter and return its new value. No disk I/O on the caller's path."""
+    key = (kind, period, str(user))
+    with _lock:
+        if (kind, period) not in _loaded:
+            _load(kind, period)
+        count = _counts.get(key, 0) + by
+        _counts[key] = count
+        _dirty.add(key)
+        due = time.monotonic() - _last_flush >= FLUSH_INTERVAL
+    if due:
+        flush()
+    return count
+
+
+def flush() -> int:
+    """Queue every changed counter for the telemetry group commit (and purge expired
+    periods now and then). Returns counters queued; any the full backlog refused stay
+    dirty for the next flush."""
+    global _last_flush, _last_purge
+    now = time.time()
+    with _lock:
+        rows = [(kind, period, user, _counts[(kind, period, user)],
+                 int(now + EXPIRY_SECONDS[kind]) if kind in EXPIRY_SECONDS else None)
+                for kind, period, user in _dirty]
+        _dirty.clear()
+        _last_flush = time.monotonic()
+        purge = time.monotonic() - _last_purge >= PURGE_INTERVAL
+        if purge:
+            _last_purge = time.monotonic()
+    written = 0
+    for row in rows:
+        if not TelemetryQueue.submit(
+                "INSERT INTO activity_counters (kind, period, user_id, count, expires_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT(kind, period, user_id) DO UPDATE SET "
+                "count = excluded.count, expires_at = excluded.expires_at", row):
+            # Backlog full: keep this and the rest dirty so the next flush retries them.
+            with _lock:
+                _dirty.update(r[:3] for r in rows[written:])
+            break
+        written += 1
+    if purge:
+        _purge(now)
+    return written
+
+
+def _purge(now: float) -> None:
+    """Drop expired periods from the table and from memory."""
+    TelemetryQueue.submit(
+        "DELETE FROM activity_counters WHERE expires_at IS NOT NULL AND expires_at < ?",
+        (int(now),))
+    with _lock:
+        # A period untouched for its kind's whole expiry is done with; forget it here too.
+        stale = {key for key in _loaded if key[0] in EXPIRY_SECONDS}
+        touched = {(k, p) for k, p, _u in _dirty}
+        for kind, period in stale - touched:
+            if not _period_is_recent(kind, period, now):
+                _loaded.discard((kind, period))
+                for key in [k for k in _counts if k[0] == kind and k[1] == period]:
+                    del _counts[key]
+
+
+def _period_is_recent(kind: str, period: str, now: float) -> bool:
+    """Whether a date ("YYYY-MM-DD") or ISO week ("YYYY-Www") period is within its kind's
+    expiry. Unparseable periods count as recent and are left alone."""
+    import datetime
+    try:
+        if "-W" in period:
+            year, week = period.split("-W")
+            start = datetime.date.fromisocalendar(int(year), int(week), 1)
+            end = start + datetime.timedelta(days=7)
+        else:
+            end = datetime.date.fromisoformat(period) + datetime.timedelta(days=1)
+    except ValueError:
+        return True
+    ended = time.mktime(end.timetuple())
+    return now - ended < EXPIRY_SECONDS[kind]
+
+
+def import_legacy_counters() -> None:
+    """One-shot copy of the old JSON counter files into the table (lifetime counts whole,
+    dated ones only while still current). Recorded so it never runs twice."""
+    import datetime
+    import config
+    from lib.core import state_store
+    from lib.core.file_operations import load_json_file
+
+    if state_store.was_imported("activity_counters"):
+        return
+    rows = []
+    for kind, path in (("night_owl", config.NIGHT_OWL_COUNTS_FILE),
+                       ("morning_person", config.MORNING_PERSON_COUNTS_FILE)):
+        for user, count in (load_json_file(path) or {}).items():
+            rows.append((kind, "", str(user), int(count), None))
+
+    now = time.time()
+    today = datetime.date.today()
+    recent_days = {(today - datetime.timedelta(days=d)).isoformat() for d in (0, 1)}
+    for user, dates in (load_json_file(config.PARTY_ANIMAL_TARGETS_FILE) or {}).items():
+        rows.append(("party_animal", "", str(user), len(set(dates)), None))
+        for day in set(dates) & recent_days:
+            rows.append(("party_animal_day", day, str(user), 1,
+                         int(now + EXPIRY_SECONDS["party_animal_day"])))
+
+    for week, users in (load_json_file(config.WEEKEND_WARRIOR_COUNTS_FILE) or {}).items():
+        if _period_is_recent("weekend_warrior", week, now):
+            for user, count in users.items():
+                rows.append(("weekend_warrior", week, str(user), int(count),
+                             int(now + EXPIRY_SECONDS["weekend_warrior"])))
+
+    for day in (load_json_file(config.TOWN_CRIER_TRACKING_FILE) or {}):
+        if day in recent_days:
+            rows.append(("town_crier", day, "first", 1, int(now + EXPIRY_SECONDS["town_crier"])))
+
+    with DatabaseManager.transaction() as c:
+        c.executemany(
+            "INSERT OR IGNORE INTO activity_counters (kind, period, user_id, count, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)", rows)
+        state_store.mark_imported_in_transaction(c, "activity_counters", "", len(rows))
+    with _lock:
+        _loaded.clear()
+        _counts.clear()
+        _dirty.clear()
+    print(f"[counters] Imported {len(rows)} activity counters from the JSON files")
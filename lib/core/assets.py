@@ -0,0 +1,109 @@
+"""Images for rendered cards, fitted to the size they are drawn at.
+
+The rank card, leaderboard and rich list inline their images as base64 data URIs, and the
+files behind them are far bigger than anything on the card: a 2.7 MB coin drawn at 32px,
+full-resolution backgrounds behind an 85px leaderboard row. Every one of those bytes was
+base64-encoded, pushed through Chrome and decoded again, per render and per row.
+
+``fitted(path, size)`` returns a copy of the image scaled down to ``size`` (CSS pixels -
+Chrome renders at device scale 1) and recompressed as WebP, built once into
+config.ASSET_BUILD_DIR and rebuilt only when the source changes. ``cover=True`` is for
+``background-size: cover`` boxes, where the image must fill the box rather than fit in it.
+``scripts/build_assets.py`` builds every known asset up front so no render pays for it.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+
+from PIL import Image
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Display boxes, in CSS pixels. Icons get twice their drawn size so they stay crisp if the
+# card is ever rendered at a higher device scale; backgrounds are only ever seen at 1x.
+RANK_BACKGROUND = (1000, 600)   # rank_card.html .card, background-size: cover
+TITLE_BANNER = (640, 120)       # rank_card.html .title-banner
+LEADERBOARD_ROW = (420, 85)     # leaderboard.html .leaderboard-item, two to an 850px grid
+COIN_ICON = (64, 64)            # .coin-icon, drawn at 32px
+BADGE_ICON = (80, 80)           # badge cells are at most 40px
+
+_QUALITY = 85
+_SKIP = {".svg", ".gif"}        # vector, or possibly animated: left as they are
+
+
+def _asset_files():
+    """(path, size, cover) for every asset the card renderers embed."""
+    data = config.DATA_DIR
+    backgrounds = sorted(glob.glob(os.path.join(data, "rank_cards", "*.png")))
+    for path in backgrounds:
+        if os.path.basename(path) == "title_banner_texture.png":
+            yield path, TITLE_BANNER, True
+        else:
+            yield path, RANK_BACKGROUND, True
+        yield path, LEADERBOARD_ROW, True
+    for name in ("shutcoin.png", "ukpence.png"):
+        yield os.path.join(data, name), COIN_ICON, False
+    for path in sorted(glob.glob(os.path.join(data, "badges", "*"))):
+        if os.path.isfile(path):
+            yield path, BADGE_ICON, False
+
+
+def _built_path(path: str, size, cover: bool) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    tag = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+    mode = "c" if cover else "f"
+    return os.path.join(config.ASSET_BUILD_DIR, f"{stem}-{tag}-{size[0]}x{size[1]}{mode}.webp")
+
+
+def _build(path: str, out: str, size, cover: bool) -> None:
+    with Image.open(path) as im:
+        im.load()
+        w, h = im.size
+        scale = (max if cover else min)(size[0] / w, size[1] / h)
+        if scale < 1:
+            im = im.resize((max(1, round(w * scale)), max(1, round(h * scale))), Image.LANCZOS)
+        if im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+        os.makedirs(config.ASSET_BUILD_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=config.ASSET_BUILD_DIR, suffix=".webp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                im.save(f, "WEBP", quality=_QUALITY, method=6)
+            os.replace(tmp, out)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def fitted(path: str, size, cover: bool = False) -> str:
+    """Path of ``path`` scaled to ``size`` and recompressed, building it if it's missing or
+    older than the source. Falls back to ``path`` itself when the result wouldn't be any
+    smaller, the format is left alone, or the build fails."""
+    if os.path.splitext(path)[1].lower() in _SKIP:
+        return path
+    out = _built_path(path, size, cover)
+    try:
+        source_mtime = os.path.getmtime(path)
+        if not os.path.exists(out) or os.path.getmtime(out) < source_mtime:
+            _build(path, out, size, cover)
+        if os.path.getsize(out) >= os.path.getsize(path):
+            return path
+        return out
+    except Exception:
+        logger.warning("Could not build a fitted copy of %s", path, exc_info=True)
+        return path
+
+
+def build_all() -> list[tuple[str, int, int]]:
+    """Build every known asset now. Returns (path, source bytes, fitted bytes) for each."""
+    report = []
+    for path, size, cover in _asset_files():
+        if os.path.exists(path):
+            built = fitted(path, size, cover)
+            report.append((path, os.path.getsize(path), os.path.getsize(built)))
+    return report
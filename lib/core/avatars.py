@@ -0,0 +1,293 @@
+"""Avatars (and custom emojis) inlined into rendered pages as data URIs.
+
+Leaderboard and rich list pages used to fetch their twenty avatars one after another, each at
+the CDN's default 1024px, and remember at most a hundred of them in a dict that forgot the
+oldest - not the least used - and forgot everything on restart. Here:
+
+* ``avatar_uris(client, urls)`` resolves a whole page at once: hits come from memory or disk,
+  and every miss is fetched concurrently (at most AVATAR_FETCH_CONCURRENCY in flight), so a
+  cold page costs about one round trip rather than one per row. Two renders asking for the
+  same avatar at once share a single fetch.
+* Discord CDN URLs are asked for at AVATAR_SIZE, about what the templates draw (48px rows,
+  32px stats icons), instead of the full-size image.
+* memory - an LRU of data URIs trimmed by bytes;
+  disk   - config.AVATAR_CACHE_DIR, one file per (URL path, size), least recently used
+           dropped past its budget. The URL path carries Discord's avatar hash, so a member
+           who changes their avatar gets a new entry and a cached one is never stale.
+
+A failed fetch falls back to the default avatar URL and is not cached.
+"""
+
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AVATAR = "https://cdn.discordapp.com/embed/avatars/0.png"
+_CDN_HOSTS = {"cdn.discordapp.com", "media.discordapp.net"}
+
+_lock = threading.Lock()
+_memory: "OrderedDict[str, str]" = OrderedDict()
+_memory_bytes = 0
+_disk: "OrderedDict[str, int] | None" = None   # key -> size, oldest first; scanned on first use
+_disk_bytes = 0
+
+_inflight: "dict[str, asyncio.Future]" = {}
+_semaphore: "tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None" = None
+
+_counters = {"hits_memory": 0, "hits_disk": 0, "fetches": 0, "failures": 0}
+
+
+def sized_url(url: str, size: int) -> str:
+    """``url`` asking the Discord CDN for a ``size`` px image. Other hosts are left alone."""
+    parts = urlsplit(url)
+    if parts.hostname not in _CDN_HOSTS:
+        return url
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "size"] + [("size", str(size))]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _key(url: str, size: int) -> str:
+    parts = urlsplit(url)
+    return hashlib.sha1(f"{parts.netloc}{parts.path}:{size}".encode()).hexdigest()
+
+
+def _mime(data: bytes) -> str:
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:3] == b"GIF":
+        return "image/gif"
+    if data[:2] == b"\xff\xd8":
+        return "image/jpeg"
+    return "image/png"
+
+
+def _to_uri(data: bytes) -> str:
+    return f"data:{_mime(data)};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+# --- memory tier ---------------------------------------------------------------------
+def _remember(key: str, uri: str) -> None:
+    """Caller holds _lock."""
+    global _memory_bytes
+    budget = int(config.AVATAR_CACHE_MEMORY_BYTES)
+    old = _memory.pop(key, None)
+    if old is not None:
+        _memory_bytes -= len(old)
+    _memory[key] = uri
+    _memory_bytes += len(uri)
+    while _memory_bytes > budget and _memory:
+        _k, dropped = _memory.popitem(last=False)
+        _memory_bytes -= len(dropped)
+
+
+def _from_memory(key: str) -> str | None:
+    with _lock:
+        uri = _memory.get(key)
+        if uri is not None:
+            _memory.move_to_end(key)
+            _counters["hits_memory"] += 1
+        return uri
+
+
+# --- disk tier (blocking: call from a thread) ------------------------------------------
+def _path(key: str) -> str:
+    return os.path.join(config.AVATAR_CACHE_DIR, key)
+
+
+def _load_disk_index() -> None:
+    """Scan the cache dir once, oldest file first. Caller holds _lock."""
+    global _disk, _disk_bytes
+    entries = []
+    root = config.AVATAR_CACHE_DIR
+    if os.path.isdir(root):
+        for name in os.listdir(root):
+            if name.endswith(".tmp"):
+                continue
+            try:
+                st = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name, st.st_size))
+    entries.sort()
+    _disk = OrderedDict((name, size) for _m, name, size in entries)
+    _disk_bytes = sum(_disk.values())
+
+
+def _forget_disk(key: str) -> None:
+    global _disk_bytes
+    size = _disk.pop(key, None)
+    if size is not None:
+        _disk_bytes -= size
+
+
+def _from_disk(keys: list[str]) -> dict[str, str]:
+    """Data URIs for whichever of ``keys`` are on disk, promoted into memory."""
+    with _lock:
+        if _disk is None:
+            _load_disk_index()
+        known = [k for k in keys if k in _disk]
+    found = {}
+    for key in known:
+        try:
+            with open(_path(key), "rb") as f:
+                found[key] = _to_uri(f.read())
+            os.utime(_path(key))                 # recency for the next boot's scan
+        except OSError:
+            pass
+    with _lock:
+        for key in known:
+            if key in found:
+                _disk.move_to_end(key)
+                _remember(key, found[key])
+                _counters["hits_disk"] += 1
+            else:
+                _forget_disk(key)
+    return found
+
+
+def _to_disk(key: str, data: bytes) -> None:
+    """Write one avatar and trim the tier back under budget. Never raises."""
+    global _disk_bytes
+    budget = int(config.AVATAR_CACHE_DISK_BYTES)
+    if budget <= 0 or len(data) > budget:
+        return
+    path = _path(key)
+    try:
+        os.makedirs(config.AVATAR_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Avatar cache could not write {path}: {e}")
+        return
+    doomed = []
+    with _lock:
+        if _disk is None:
+            _load_disk_index()
+        _forget_disk(key)
+        _disk[key] = len(data)
+        _disk_bytes += len(data)
+        while _disk_bytes > budget and len(_disk) > 1:
+            old = next(iter(_disk))
+            _forget_disk(old)
+            doomed.append(old)
+    for old in doomed:
+        try:
+            os.remove(_path(old))
+        except OSError:
+            pass
+
+
+# --- fetching --------------------------------------------------------------------------
+def _fetch_slots() -> asyncio.Semaphore:
+    global _semaphore
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore[0] is not loop:
+        _semaphore = (loop, asyncio.Semaphore(max(1, int(config.AVATAR_FETCH_CONCURRENCY))))
+    return _semaphore[1]
+
+
+async def _download(client, url: str) -> bytes | None:
+    async with _fetch_slots():
+        _counters["fetches"] += 1
+        try:
+            async with client.session.get(url) as resp:
+                if resp.status == 200:
+                    return await resp.read()
+                logger.warning(f"Avatar fetch {url} returned {resp.status}")
+        except Exception as e:
+            logger.warning(f"Error fetching avatar {url}: {e}")
+    _counters["failures"] += 1
+    return None
+
+
+async def _fetch(client, key: str, url: str) -> str:
+    """Fetch one miss, or wait on the fetch already running for it."""
+    pending = _inflight.get(key)
+    if pending is not None and pending.get_loop() is asyncio.get_running_loop():
+        return await asyncio.shield(pending)
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        try:
+            data = await asyncio.wait_for(_download(client, url), config.AVATAR_FETCH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Avatar fetch {url} timed out")
+            data = None
+        if data is None:
+            future.set_result(DEFAULT_AVATAR)
+            return DEFAULT_AVATAR
+        uri = _to_uri(data)
+        with _lock:
+            _remember(key, uri)
+        future.set_result(uri)
+        await asyncio.to_thread(_to_disk, key, data)
+        return uri
+    finally:
+        if not future.done():                   # cancelled: anyone waiting gets the default
+            future.set_result(DEFAULT_AVATAR)
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+async def avatar_uris(client, urls, size: int | None = None) -> list[str]:
+    """Data URIs for ``urls``, in order: cached ones straight away, the rest fetched
+    concurrently. Without a client the URLs are returned as they are."""
+    urls = list(urls)
+    if client is None:
+        return urls
+    size = size or config.AVATAR_SIZE
+    keys = [_key(url, size) for url in urls]
+    found = {}
+    for key in keys:
+        uri = _from_memory(key)
+        if uri is not None:
+            found[key] = uri
+    missing = [k for k in dict.fromkeys(keys) if k not in found]
+    if missing:
+        found.update(await asyncio.to_thread(_from_disk, missing))
+    to_fetch = {}
+    for key, url in zip(keys, urls):
+        if key not in found:
+            to_fetch.setdefault(key, sized_url(url, size))
+    if to_fetch:
+        fetched = await asyncio.gather(*(_fetch(client, k, u) for k, u in to_fetch.items()))
+        found.update(zip(to_fetch, fetched))
+    return [found[k] for k in keys]
+
+
+async def avatar_uri(client, url: str, size: int | None = None) -> str:
+    return (await avatar_uris(client, [url], size))[0]
+
+
+def stats() -> dict:
+    with _lock:
+        out = dict(_counters)
+        out["memory_entries"] = len(_memory)
+        out["memory_bytes"] = _memory_bytes
+        out["disk_entries"] = len(_disk) if _disk is not None else None
+        out["disk_bytes"] = _disk_bytes if _disk is not None else None
+    return out
+
+
+def clear(disk: bool = False) -> None:
+    """Drop the memory tier (and the disk tier too if ``disk``)."""
+    global _memory_bytes, _disk, _disk_bytes
+    with _lock:
+        _memory.clear()
+        _memory_bytes = 0
+        if disk:
+            import shutil
+            shutil.rmtree(config.AVATAR_CACHE_DIR, ignore_errors=True)
+            _disk = None
+            _disk_bytes = 0
@@ -33,7 +33,7 @@ import discord
 
 import config
 from config import CHANNELS, JSON_DATA_DIR, ROLES
-from database import DatabaseManager
+from database import AsyncDatabaseManager, DatabaseManager, TelemetryQueue
 
 log = logging.getLogger(__name__)
 
@@ -173,7 +173,8 @@ def _save_state(state: dict[str, Any]) -> None:
 # --- member profiles ----------------------------------------------------------------
 # A takeover is only visible against what that account normally does, so this keeps the
 # cheapest possible baseline: how long they have been here, how much they talk, and how
-# often they post links. One upsert per message at a few thousand messages a day.
+# often they post links. One upsert per message at a few thousand messages a day, queued
+# for the telemetry group commit - a read in the same half-second missing it costs nothing.
 def ensure_schema() -> None:
     try:
         DatabaseManager.execute('''
@@ -209,7 +210,7 @@ def record_message(user_id, has_link: bool, now: int | None = None) -> dict[str,
     before = get_profile(user_id) or {"first_seen": current, "last_seen": current,
                                       "messages": 0, "link_messages": 0}
     try:
-        DatabaseManager.execute(
+        TelemetryQueue.submit(
             "INSERT INTO member_profile (user_id, first_seen, last_seen, messages, link_messages) "
             "VALUES (?, ?, ?, 1, ?) "
             "ON CONFLICT(user_id) DO UPDATE SET last_seen = excluded.last_seen, "
@@ -648,7 +649,7 @@ async def observe_message(client: Any, message: Any) -> None:
 
         uid = message.author.id
         name = getattr(message.author, "display_name", None) or str(uid)
-        profile = record_message(uid, has_external_link(content))
+        profile = await AsyncDatabaseManager.run_read(record_message, uid, has_external_link(content))
 
         finding = check_coordinated(uid, content, message.channel.id,
                                     getattr(message, "jump_url", ""), name)
@@ -3,7 +3,45 @@ import os
 import tempfile
 from typing import Any
 from functools import lru_cache
-from config import PERSISTENT_VIEWS_FILE, WEBHOOK_DELETIONS_FILE, WHITELIST_FILE
+import config
+from config import WEBHOOK_DELETIONS_FILE, WHITELIST_FILE
+
+# JSON state files whose contents now live in the kv_store table, one row per top-level
+# key (see lib/core/state_store). load_json_file/save_json_file route these paths to the
+# store and import the old file on first touch, so callers keep working unchanged and can
+# move to load_json_key/save_json_key, or the store itself, one at a time. Matched on the
+# files' home paths rather than the (patchable) config values, so tests pointing config at
+# a temp file still get a plain file whenever this module happens to be imported.
+KV_BACKED_FILES = {
+    os.path.abspath(os.path.join(config.JSON_DATA_DIR, f"{namespace}.json")): namespace
+    for namespace in (
+        "skyrim_profiles",
+        "wordle_state",
+        "crossword_state",
+        "county_state",
+        "join_watch_buffers",
+    )
+}
+# Namespaces whose one-shot import is known to have run, so the hot path doesn't ask the
+# store again on every load/save.
+_kv_imported = set()
+
+
+def _kv_namespace(filename: str):
+    """The store namespace for a KV-backed file (imported on first use), else None."""
+    namespace = KV_BACKED_FILES.get(os.path.abspath(filename))
+    if namespace is not None and namespace not in _kv_imported:
+        from lib.core import state_store
+        if (state_store.import_json_file(namespace, filename) is not None
+                or state_store.was_imported(namespace)):
+            _kv_imported.add(namespace)
+    return namespace
+
+
+def import_kv_backed_files() -> None:
+    """Run every KV-backed file's one-shot import up front (called at startup)."""
+    for path in KV_BACKED_FILES:
+        _kv_namespace(path)
 
 def atomic_write_json(filename: str, data: Any, indent: int = None) -> None:
     """Write JSON durably: serialise to a temp file in the same directory, fsync,
@@ -27,14 +65,43 @@ def atomic_write_json(filename: str, data: Any, indent: int = None) -> None:
         raise
 
 def load_json_file(filename: str) -> dict:
+    namespace = _kv_namespace(filename)
+    if namespace is not None:
+        from lib.core import state_store
+        return state_store.items(namespace)
     if os.path.exists(filename):
         with open(filename, "r") as f:
             return json.load(f)
     return {}
 
 def save_json_file(filename: str, data: Any) -> None:
+    namespace = _kv_namespace(filename)
+    if namespace is not None:
+        from lib.core import state_store
+        state_store.replace(namespace, data)
+        return
     atomic_write_json(filename, data, indent=4)
 
+def load_json_key(filename: str, key: str, default: Any = None) -> Any:
+    """One top-level key of a JSON state file - a single row for a KV-backed file."""
+    namespace = _kv_namespace(filename)
+    if namespace is not None:
+        from lib.core import state_store
+        return state_store.get(namespace, key, default)
+    return (load_json_file(filename) or {}).get(str(key), default)
+
+def save_json_key(filename: str, key: str, value: Any) -> None:
+    """Set one top-level key of a JSON state file without rewriting the others when the
+    file is KV-backed."""
+    namespace = _kv_namespace(filename)
+    if namespace is not None:
+        from lib.core import state_store
+        state_store.put(namespace, key, value)
+        return
+    data = load_json_file(filename) or {}
+    data[str(key)] = value
+    save_json_file(filename, data)
+
 def load_whitelist() -> list:
     try:
         with open(WHITELIST_FILE, "r") as f:
@@ -46,14 +113,14 @@ def save_whitelist(whitelist: list) -> None:
     atomic_write_json(WHITELIST_FILE, whitelist)
 
 def load_persistent_views() -> dict:
-    try:
-        with open(PERSISTENT_VIEWS_FILE, "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+    """Every registered view as one dict. Prefer PersistentViewRegistry.get/put/delete
+    for a single entry."""
+    from lib.core.persistent_views import PersistentViewRegistry
+    return PersistentViewRegistry.all()
 
 def save_persistent_views(data: dict) -> None:
-    atomic_write_json(PERSISTENT_VIEWS_FILE, data)
+    from lib.core.persistent_views import PersistentViewRegistry
+    PersistentViewRegistry.replace_all(data)
 
 def load_webhook_deletions() -> dict:
     try:
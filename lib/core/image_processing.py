@@ -4,16 +4,20 @@ import io
 import os
 import uuid
 import random
+from contextlib import asynccontextmanager
 from functools import lru_cache
 from PIL import Image, ImageChops
 import tempfile
 import logging
 import gc
+import threading
+from collections import OrderedDict
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
-from config import CHROME_PATH
+from config import ASSET_URI_CACHE_BYTES, BASE_DIR, CHROME_PATH, RENDER_IN_MEMORY, RENDER_WORKERS
+from lib.core import render_cache
 
 import shutil
 import atexit
@@ -23,43 +27,49 @@ user_data_dir = os.path.abspath(os.path.join(os.getcwd(), ".chrome_data"))
 if not os.path.exists(user_data_dir):
     os.makedirs(user_data_dir, exist_ok=True)
 
-chrome_options = Options()
-chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
-
-if CHROME_PATH and os.path.exists(CHROME_PATH):
-    chrome_options.binary_location = CHROME_PATH
-
-chrome_options.add_argument("--headless")
-# Removed --force-device-scale-factor=2 as it quadruples memory usage on rendering
-chrome_options.add_argument("--disable-gpu")
-chrome_options.add_argument("--disable-software-rasterizer")
-chrome_options.add_argument("--no-sandbox")
-chrome_options.add_argument("--disable-dev-shm-usage")
-chrome_options.add_argument("--disable-logging")
-chrome_options.add_argument("--log-level=3")
-chrome_options.add_argument("--mute-audio")
-chrome_options.add_argument("--disable-extensions")
-chrome_options.add_argument("--disable-background-networking")
-chrome_options.add_argument("--no-first-run")
-chrome_options.add_argument("--disable-sync")
-chrome_options.add_argument("--remote-debugging-pipe") # More stable than port for headless
-
-# Aggressive memory and disk optimizations for t3.micro
-chrome_options.add_argument("--disable-site-isolation-trials") # Saves significant per-tab memory
-chrome_options.add_argument("--js-flags=--max-old-space-size=256") # Cap JS heap
-chrome_options.add_argument("--disk-cache-size=1") # Prevent disk bloat
-chrome_options.add_argument("--disable-application-cache")
-chrome_options.add_argument("--disable-background-timer-throttling")
-chrome_options.add_argument("--incognito") # Don't persist session data to disk
+
+def _build_chrome_options(profile_dir: str) -> Options:
+    """Chrome flags for one headless engine. Each pool worker needs its own profile dir -
+    two Chromes can't share one."""
+    options = Options()
+    options.add_argument(f"--user-data-dir={profile_dir}")
+
+    if CHROME_PATH and os.path.exists(CHROME_PATH):
+        options.binary_location = CHROME_PATH
+
+    options.add_argument("--headless")
+    # Removed --force-device-scale-factor=2 as it quadruples memory usage on rendering
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-software-rasterizer")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-logging")
+    options.add_argument("--log-level=3")
+    options.add_argument("--mute-audio")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--no-first-run")
+    options.add_argument("--disable-sync")
+    options.add_argument("--remote-debugging-pipe") # More stable than port for headless
+
+    # Aggressive memory and disk optimizations for t3.micro
+    options.add_argument("--disable-site-isolation-trials") # Saves significant per-tab memory
+    options.add_argument("--js-flags=--max-old-space-size=256") # Cap JS heap
+    options.add_argument("--disk-cache-size=1") # Prevent disk bloat
+    options.add_argument("--disable-application-cache")
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--incognito") # Don't persist session data to disk
+    return options
+
+
+chrome_options = _build_chrome_options(user_data_dir)
 
 import time
-_browser = None
-_render_count = 0
-_browser_started_at = 0.0
-# One headless Chrome stays warm for the whole bot process (torn down only when the process exits,
-# e.g. on a deploy restart). It is NOT shut down on idle; instead maintain_render_engine() recycles
-# it for memory leaks in the background, while no render is in flight, so /rank and the casino games
-# almost never pay a cold launch. These thresholds drive that background recycle.
+# Each pool worker keeps one headless Chrome warm for the whole bot process (torn down only when
+# the process exits, e.g. on a deploy restart). It is NOT shut down on idle; instead
+# maintain_render_engine() recycles it for memory leaks in the background, while that worker has no
+# render in flight, so /rank and the casino games almost never pay a cold launch. These thresholds
+# drive that background recycle, counted per worker.
 _RECYCLE_AFTER_RENDERS = 15      # background keeper recycles once this many renders have happened
 MAX_BROWSER_AGE_SECONDS = 1800   # ...or after 30 min of life (slow-leak backstop), if it rendered
 MAX_RENDERS_BEFORE_RESTART = 30  # inline hard cap get_browser uses (also set on a render failure
@@ -103,99 +113,199 @@ def _sweep_chrome_tmp(max_age_seconds=60):
         logging.info(f"Swept {removed} leaked Chrome temp dir(s) from {tmp}.")
 
 
-def _launch_browser():
-    """Tear down any existing Chrome and start a fresh one. The caller MUST hold rendering_lock
-    (or otherwise guarantee no screenshot is in flight) so the browser is never quit mid-render."""
-    global _browser, _render_count, _browser_started_at
+class _RenderWorker:
+    """One warm headless Chrome and its own recycle accounting. Only the render holding ``lock``
+    (taken through RenderPool.acquire) may drive ``browser``."""
+
+    def __init__(self, index: int):
+        self.index = index
+        # Worker 0 keeps the original profile dir, so a one-worker pool is the old single engine.
+        self.user_data_dir = user_data_dir if index == 0 else f"{user_data_dir}-{index}"
+        self.options = chrome_options if index == 0 else _build_chrome_options(self.user_data_dir)
+        self.browser = None
+        self.render_count = 0      # renders since the last launch (drives the recycle)
+        self.started_at = 0.0
+        self.renders = 0           # lifetime renders, for metrics
+        self.claims = 0            # renders holding or queued on this worker's lock
+        self.staged = False        # tab holds the preloaded stage page (see _load_document)
+        self.lock = asyncio.Lock()
+
+    def launch(self):
+        """Tear down this worker's Chrome and start a fresh one. The caller MUST hold the worker
+        (or otherwise guarantee no screenshot is in flight on it) so it is never quit mid-render."""
+        if self.browser is not None:
+            logging.info(f"Recycling headless Chrome engine #{self.index} to clear memory.")
+            try:
+                self.browser.quit()   # kill the underlying Chrome process
+            except Exception as e:
+                logging.warning(f"Error while quitting Chrome: {e}")
+            finally:
+                self.browser = None
+                self.staged = False
+
+        # Fresh profile + clear leaked /tmp Chrome dirs so the disk can't fill
+        if os.path.exists(self.user_data_dir):
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+        os.makedirs(self.user_data_dir, exist_ok=True)
+        _sweep_chrome_tmp()
+
+        try:
+            self.browser = webdriver.Chrome(service=Service(_get_chromedriver_path()), options=self.options)
+        except Exception as e:
+            logging.warning(f"Failed to use ChromeDriverManager, falling back to default driver: {e}")
+            self.browser = webdriver.Chrome(options=self.options)
+
+        self.restage()   # warm up (so the first real render doesn't fail) and preload assets
+
+        self.render_count = 0
+        self.started_at = time.time()
+        return self.browser
 
-    if _browser is not None:
-        logging.info("Recycling headless Chrome engine to clear memory.")
+    def restage(self):
+        """Put the tab back on the stage page after something navigated it away (a live-site
+        capture, say), so renders stay on the in-memory path."""
         try:
-            _browser.quit()   # kill the underlying Chrome process
+            self.browser.get("about:blank")
+        except Exception:
+            pass
+        self.staged = _preload_static_assets(self.browser)
+
+    def get_browser(self):
+        """Return this worker's live Chrome, launching it if it is down or has hit the inline
+        render cap. There is no idle shutdown: the engine is kept warm for the bot's whole life and
+        recycled for memory leaks in the background by maintain_render_engine(), so a user render
+        rarely waits on a launch."""
+        if self.browser is None or self.render_count >= MAX_RENDERS_BEFORE_RESTART:
+            self.launch()
+        self.render_count += 1
+        self.renders += 1
+        return self.browser
+
+    def maintain(self):
+        """Pre-warm or leak-recycle this engine. Caller holds the worker, so no render is in flight."""
+        if self.browser is None:
+            self.launch()                       # pre-warm (just after boot, or after a crash)
+            return "warmed"
+        # Only recycle a browser that has actually rendered (leaks accumulate with use); a browser
+        # that is simply sitting idle at 0 renders is left warm rather than needlessly relaunched.
+        if self.render_count >= _RECYCLE_AFTER_RENDERS or (
+                self.render_count > 0 and (time.time() - self.started_at) > MAX_BROWSER_AGE_SECONDS):
+            self.launch()                       # proactive leak recycle, off the user path
+            return "recycled"
+        return None
+
+    def cleanup(self):
+        try:
+            if self.browser:
+                self.browser.quit()
         except Exception as e:
-            logging.warning(f"Error while quitting Chrome: {e}")
+            logging.warning(f"Error while cleaning up Chrome on exit: {e}")
+        finally:
+            self.browser = None
+            if os.path.exists(self.user_data_dir):
+                shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class RenderPool:
+    """N warm render workers behind one admission semaphore. A render waits for a free slot, then
+    takes the least-loaded worker, so with N workers N renders run side by side instead of each
+    queueing behind the last. With N=1 this is exactly the old single Chrome behind one lock.
+
+    ``slots`` is also handed out on its own (as ``rendering_lock``) for heavy work that needs no
+    browser; every worker holder also holds a slot, so a slot always has a worker free."""
+
+    def __init__(self, size: int):
+        self.workers = [_RenderWorker(i) for i in range(max(1, int(size)))]
+        self.slots = asyncio.Semaphore(len(self.workers))
+        self.queued = 0            # renders waiting for a slot
+        self.peak_queued = 0
+        self.recycles = 0
+
+    def _pick(self):
+        # Free workers first; among them a warm one with the fewest renders since launch (furthest
+        # from its recycle). A worker that is still being handed back counts by its queue.
+        return min(self.workers, key=lambda w: (w.claims, w.browser is None, w.render_count, w.index))
+
+    @asynccontextmanager
+    async def acquire(self, worker: _RenderWorker = None):
+        """Hold a slot and one worker for the duration of a render (or ``worker`` specifically,
+        as the background keeper does)."""
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await self.slots.acquire()
         finally:
-            _browser = None
+            self.queued -= 1
+        try:
+            chosen = worker or self._pick()
+            chosen.claims += 1
+            try:
+                async with chosen.lock:
+                    yield chosen
+            finally:
+                chosen.claims -= 1
+        finally:
+            self.slots.release()
 
-    # Fresh profile + clear leaked /tmp Chrome dirs so the disk can't fill
-    if os.path.exists(user_data_dir):
-        shutil.rmtree(user_data_dir, ignore_errors=True)
-    os.makedirs(user_data_dir, exist_ok=True)
-    _sweep_chrome_tmp()
+    def metrics(self) -> dict:
+        """Snapshot of pool load: queue depth, busy/warm workers and render counts."""
+        return {
+            "workers": len(self.workers),
+            "warm": sum(1 for w in self.workers if w.browser is not None),
+            "busy": sum(1 for w in self.workers if w.lock.locked()),
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "renders": sum(w.renders for w in self.workers),
+            "recycles": self.recycles,
+            "per_worker": [w.render_count for w in self.workers],
+        }
 
-    try:
-        _browser = webdriver.Chrome(service=Service(_get_chromedriver_path()), options=chrome_options)
-    except Exception as e:
-        logging.warning(f"Failed to use ChromeDriverManager, falling back to default driver: {e}")
-        _browser = webdriver.Chrome(options=chrome_options)
 
-    try:
-        _browser.get("about:blank")   # warm up so the first real render doesn't fail
-    except Exception:
-        pass
+render_pool = RenderPool(RENDER_WORKERS)
 
-    _render_count = 0
-    _browser_started_at = time.time()
-    return _browser
+# Admission to the render pool (one slot per worker). Heavy image work that needs no browser still
+# queues on it so it can't stack up alongside the renders on a t3.micro.
+rendering_lock = render_pool.slots
+
+
+def render_pool_metrics() -> dict:
+    return render_pool.metrics()
 
 
 def get_browser():
-    """Return the live headless Chrome, launching it if it is down or has hit the inline render
-    cap. There is no idle shutdown: the engine is kept warm for the bot's whole life and recycled
-    for memory leaks in the background by maintain_render_engine(), so a user render rarely waits
-    on a launch."""
-    global _render_count
-    if _browser is None or _render_count >= MAX_RENDERS_BEFORE_RESTART:
-        _launch_browser()
-    _render_count += 1
-    return _browser
+    """Return the first worker's live Chrome. For scripts that drive a browser directly outside
+    the pool; bot code takes a worker with ``render_pool.acquire()``."""
+    return render_pool.workers[0].get_browser()
+
 
 def cleanup_browser():
-    global _browser
-    try:
-        if _browser:
-            _browser.quit()
-    except Exception as e:
-        logging.warning(f"Error while cleaning up Chrome on exit: {e}")
-    finally:
-        _browser = None
-        if os.path.exists(user_data_dir):
-            shutil.rmtree(user_data_dir, ignore_errors=True)
+    for worker in render_pool.workers:
+        worker.cleanup()
 
 atexit.register(cleanup_browser)
 
-# Global lock to prevent concurrent heavy image processing (critical for t3.micro)
-rendering_lock = asyncio.Semaphore(1)
-
-
-def _maintain_render_engine_sync():
-    """Pre-warm or leak-recycle the engine. Caller holds rendering_lock, so no render is in flight."""
-    if _browser is None:
-        _launch_browser()                       # pre-warm (just after boot, or after a crash)
-        return "warmed"
-    # Only recycle a browser that has actually rendered (leaks accumulate with use); a browser that
-    # is simply sitting idle at 0 renders is left warm rather than needlessly relaunched.
-    if _render_count >= _RECYCLE_AFTER_RENDERS or (
-            _render_count > 0 and (time.time() - _browser_started_at) > MAX_BROWSER_AGE_SECONDS):
-        _launch_browser()                       # proactive leak recycle, off the user path
-        return "recycled"
-    return None
-
 
 async def maintain_render_engine():
-    """Keep one headless Chrome warm for the bot's lifetime. Scheduled every ~60s: it pre-warms the
-    engine and recycles it for memory leaks HERE, in the background while no render is in flight, so
-    /rank and the casino games almost never pay a cold launch. Holding rendering_lock guarantees we
-    never quit a browser mid-screenshot (and a recycle only ever delays a render that arrives during
+    """Keep every pool worker's headless Chrome warm for the bot's lifetime. Scheduled every ~60s:
+    it pre-warms each engine and recycles it for memory leaks HERE, in the background while that
+    worker has no render in flight, so /rank and the casino games almost never pay a cold launch.
+    Workers are visited one at a time, so at most one is ever offline for a relaunch while the
+    rest keep serving (and with one worker a recycle only ever delays a render that arrives during
     the ~2s relaunch, which would have paid that cost as a cold start anyway)."""
     loop = asyncio.get_running_loop()
-    async with rendering_lock:
-        try:
-            result = await loop.run_in_executor(None, _maintain_render_engine_sync)
-            if result:
-                logging.info(f"Render engine {result} by the background keeper.")
-        except Exception:
-            logging.warning("Render engine keeper tick failed", exc_info=True)
+    for worker in render_pool.workers:
+        async with render_pool.acquire(worker):
+            try:
+                result = await loop.run_in_executor(None, worker.maintain)
+                if result:
+                    if result == "recycled":
+                        render_pool.recycles += 1
+                    logging.info(f"Render engine #{worker.index} {result} by the background keeper.")
+            except Exception:
+                logging.warning("Render engine keeper tick failed", exc_info=True)
+    if render_pool.peak_queued > 1:
+        logging.info(f"Render pool: {render_pool.metrics()}")
+        render_pool.peak_queued = render_pool.queued
 
 def trim_image(im: Image.Image, tolerance: int = 6) -> Image.Image:
     """Trim near-white margins from a rendered HTML screenshot."""
@@ -221,81 +331,180 @@ def trim_image(im: Image.Image, tolerance: int = 6) -> Image.Image:
 
     return im.crop(bbox) if bbox and bbox != full_bbox else im
 
-@lru_cache(maxsize=100)
-def _get_cached_avatar_data_uri(url: str, b64_data: str) -> str:
-    """Cache the final data URI string."""
-    return f"data:image/png;base64,{b64_data}"
+async def get_avatar_data_uri(client, url: str, size: int | None = None) -> str:
+    """One avatar or emoji as a data URI, through the avatar cache (lib/core/avatars.py).
+    Pages with several should resolve them together with avatars.avatar_uris."""
+    from lib.core import avatars
+    return await avatars.avatar_uri(client, url, size)
+
+_MIME_TYPES = {".svg": "image/svg+xml", ".gif": "image/gif", ".webp": "image/webp",
+               ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+# Data URIs memoised by (path, mtime, size, cover), so a card's coin, background and badges are
+# encoded once rather than per render (and per row on a leaderboard). Trimmed by bytes.
+_data_uris: "OrderedDict[tuple, str]" = OrderedDict()
+_data_uri_bytes = 0
+_data_uri_lock = threading.Lock()
+
+
+def encode_image_to_data_uri(image_path: str, size=None, cover: bool = False) -> str:
+    """``image_path`` as a data URI. With ``size`` (the CSS box it's drawn in) the image is
+    first fitted to it and recompressed - see lib/core/assets.py - which for the card
+    backgrounds and coins is most of the page's weight."""
+    global _data_uri_bytes
+    key = (os.path.abspath(image_path), os.path.getmtime(image_path),
+           tuple(size) if size else None, cover)
+    with _data_uri_lock:
+        uri = _data_uris.get(key)
+        if uri is not None:
+            _data_uris.move_to_end(key)
+            return uri
+
+    source = image_path
+    if size:
+        from lib.core.assets import fitted
+        source = fitted(image_path, size, cover)
+    mime_type = _MIME_TYPES.get(os.path.splitext(source)[1].lower(), "image/png")
+    with open(source, "rb") as img_file:
+        data = img_file.read()
+    encoded = base64.b64encode(data).decode("utf-8")
+    uri = f"data:{mime_type};base64,{encoded}"
+
+    with _data_uri_lock:
+        if key not in _data_uris:
+            _data_uris[key] = uri
+            _data_uri_bytes += len(uri)
+            while _data_uri_bytes > ASSET_URI_CACHE_BYTES and len(_data_uris) > 1:
+                _old_key, old = _data_uris.popitem(last=False)
+                _data_uri_bytes -= len(old)
+    return uri
 
-async def get_avatar_data_uri(client, url: str) -> str:
-    """Fetch and cache avatar data URIs (limited to 100 entries for t3.micro)."""
-    if client is None:
-        return url
+from typing import Tuple
 
-    # Check if already in cache (we'll use a manual check for the async part)
-    if not hasattr(client, "_avatar_cache"):
-        client._avatar_cache = {}
-    
-    if url in client._avatar_cache:
-        return client._avatar_cache[url]
-    
+
+async def _cached_render(key, render) -> io.BytesIO:
+    """Return the cached image for ``key``, or await ``render()`` and cache what it draws. A hit
+    never queues for a render worker. ``key`` None bypasses the cache."""
+    if key is None:
+        return await render()
+    loop = asyncio.get_running_loop()
+    data = render_cache.get_memory(key)
+    if data is None:
+        data = await loop.run_in_executor(None, render_cache.get_disk, key)
+    if data is not None:
+        return io.BytesIO(data)
+    buffer = await render()
+    data = buffer.getvalue()
+    render_cache.put(key, data)
+    loop.run_in_executor(None, render_cache.put_disk, key, data)   # off the caller's path
+    return buffer
+
+
+# --- page loading --------------------------------------------------------------------------
+# Every page used to be written to a temp file and navigated to over file://, then deleted - a
+# disk write and read per render, and a 1MB rank card full of base64 avatars is not rare. Now
+# each worker keeps one tab open on a "stage" page that has already pulled in the remote scripts
+# and stylesheets our templates use (Tailwind, Twemoji, Google Fonts), and a render writes its
+# document straight into that tab. The assets then come from the browser's memory cache for the
+# worker's whole life instead of being fetched per page.
+#
+# The document goes in with document.open/write/close rather than CDP Page.setDocumentContent:
+# that patches the DOM in place and doesn't run the page's <script>s, which Tailwind and the
+# templates' twemoji onload hooks rely on. open/write/close is a real new document - scripts run,
+# listeners from the last page are dropped, and load fires - just without a navigation.
+_TEMPLATE_DIR = os.path.join(BASE_DIR, "templates")
+_WRITE_DOCUMENT_JS = "document.open(); document.write(arguments[0]); document.close();"
+
+
+@lru_cache(maxsize=1)
+def _static_asset_urls() -> tuple:
+    """(scripts, stylesheets): the remote assets referenced by templates/*.html."""
+    import glob
+    import re
+    scripts, styles = set(), set()
+    for path in glob.glob(os.path.join(_TEMPLATE_DIR, "*.html")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            continue
+        scripts.update(re.findall(r'<script[^>]*\ssrc="(https://[^"]+)"', text))
+        for tag in re.findall(r"<link\b[^>]*>", text):
+            href = re.search(r'href="(https://[^"]+)"', tag)
+            if href and 'rel="stylesheet"' in tag:
+                styles.add(href.group(1))
+        styles.update(re.findall(r"@import url\('(https://[^']+)'\)", text))
+    return tuple(sorted(scripts)), tuple(sorted(styles))
+
+
+def _stage_html() -> str:
+    scripts, styles = _static_asset_urls()
+    head = "".join(f'<link rel="stylesheet" href="{u}">' for u in styles)
+    head += "".join(f'<script src="{u}" crossorigin="anonymous"></script>' for u in scripts)
+    return f"<!DOCTYPE html><html><head>{head}</head><body></body></html>"
+
+
+def _wait_loaded(browser, timeout: float):
+    from selenium.webdriver.support.ui import WebDriverWait
+    WebDriverWait(browser, timeout).until(
+        lambda b: b.execute_script("return document.readyState") == "complete"
+    )
+
+
+def _preload_static_assets(browser) -> bool:
+    """Put a fresh browser's tab on the stage page. Returns whether it got there; if not,
+    renders on this browser keep using the temp-file path."""
+    if not RENDER_IN_MEMORY:
+        return False
     try:
-        async with client.session.get(url) as resp:
-            if resp.status == 200:
-                data = await resp.read()
-                b64_data = base64.b64encode(data).decode("utf-8")
-                data_uri = f"data:image/png;base64,{b64_data}"
-                
-                # Manual LRU logic to keep it simple and safe for t3.micro
-                if len(client._avatar_cache) >= 100:
-                    # Pop a random (or first) item if full
-                    client._avatar_cache.pop(next(iter(client._avatar_cache)))
-                
-                client._avatar_cache[url] = data_uri
-                return data_uri
+        browser.execute_script(_WRITE_DOCUMENT_JS, _stage_html())
+        _wait_loaded(browser, 10)
+        return True
     except Exception as e:
-        print(f"Error fetching avatar {url}: {e}")
-    
-    return "https://cdn.discordapp.com/embed/avatars/0.png"
-
-def encode_image_to_data_uri(image_path: str) -> str:
-    ext = os.path.splitext(image_path)[1].lower()
-    mime_type = "image/png"  # Default
-    if ext == ".svg":
-        mime_type = "image/svg+xml"
-    elif ext == ".gif":
-        mime_type = "image/gif"
-    elif ext == ".webp":
-        mime_type = "image/webp"
-    elif ext in [".jpg", ".jpeg"]:
-        mime_type = "image/jpeg"
-
-    with open(image_path, "rb") as img_file:
-        data = img_file.read()
-    encoded = base64.b64encode(data).decode("utf-8")
-    return f"data:{mime_type};base64,{encoded}"
+        logging.warning(f"Could not stage render page, falling back to temp files: {e}")
+        return False
+
+
+def _load_document(worker: "_RenderWorker", browser, html_str: str):
+    """Load ``html_str`` into ``browser`` and wait for it to finish loading - in memory on a
+    staged tab, or through a temp file as before if the tab isn't staged or the write fails."""
+    if RENDER_IN_MEMORY and worker.staged:
+        try:
+            browser.execute_script(_WRITE_DOCUMENT_JS, html_str)
+            _wait_loaded(browser, 10)
+            return
+        except Exception as e:
+            logging.warning(f"In-memory page load failed, using a temp file: {e}")
+            worker.staged = False     # the tab is in an unknown state; the next launch restages
+
+    with tempfile.NamedTemporaryFile(suffix=".html", delete=False, mode="w", encoding="utf-8") as tmp:
+        tmp.write(html_str)
+        tmp_path = tmp.name
+    try:
+        browser.get(f"file://{os.path.abspath(tmp_path)}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
-from typing import Tuple
 
 def _screenshot_html_sync(
     html_str: str,
     size: Tuple[int, int] = (1600, 1000),
     apply_trim: bool = True,
-    element_selector: str = None
+    element_selector: str = None,
+    worker: "_RenderWorker" = None
 ) -> io.BytesIO:
-    """Synchronous implementation of screenshot_html."""
-    global _browser, _render_count
-
-    with tempfile.NamedTemporaryFile(suffix=".html", delete=False, mode="w", encoding="utf-8") as tmp:
-        tmp.write(html_str)
-        tmp_path = tmp.name
+    """Synchronous implementation of screenshot_html. Runs on ``worker`` (the first pool worker if
+    none is given, for scripts calling this directly)."""
+    worker = worker or render_pool.workers[0]
 
     last_err = None
     for attempt in range(2):
         try:
             buffer = io.BytesIO()
-            browser = get_browser()
+            browser = worker.get_browser()
             browser.set_window_size(size[0], size[1])
-            browser.get(f"file://{os.path.abspath(tmp_path)}")
+            _load_document(worker, browser, html_str)
 
             if element_selector:
                 from selenium.webdriver.common.by import By
@@ -348,23 +557,17 @@ def _screenshot_html_sync(
             # Aggressive memory cleanup for t3.micro
             gc.collect()
 
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-
             return buffer
 
         except Exception as e:
             last_err = e
             if attempt == 0:
                 logging.warning(f"Screenshot attempt failed ({e}), restarting Chrome and retrying...")
-                # Force browser restart on next get_browser() call
-                _render_count = MAX_RENDERS_BEFORE_RESTART
+                # Force this worker's browser to restart on its next get_browser() call
+                worker.render_count = MAX_RENDERS_BEFORE_RESTART
             else:
                 logging.error(f"Screenshot retry also failed: {e}")
 
-    # Cleanup temp file if both attempts failed
-    if os.path.exists(tmp_path):
-        os.remove(tmp_path)
     raise last_err
 
 async def screenshot_html(
@@ -372,14 +575,23 @@ async def screenshot_html(
     size: Tuple[int, int] = (1600, 1000),
     *,
     apply_trim: bool = True,
-    element_selector: str = None
+    element_selector: str = None,
+    cache: bool = True
 ) -> io.BytesIO:
-    """Render HTML into a trimmed PNG (non-blocking, queued)."""
-    async with rendering_lock:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, _screenshot_html_sync, html_str, size, apply_trim, element_selector
-        )
+    """Render HTML into a trimmed PNG (non-blocking, queued for a pool worker). Identical renders
+    come from the render cache; pass ``cache=False`` for pages that can change without their HTML
+    changing, or that will never be drawn twice."""
+    async def render():
+        async with render_pool.acquire() as worker:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                None, _screenshot_html_sync, html_str, size, apply_trim, element_selector, worker
+            )
+
+    key = None
+    if cache and render_cache.enabled():
+        key = render_cache.render_key("png", html_str, tuple(size), apply_trim, element_selector)
+    return await _cached_render(key, render)
 
 
 def _screenshot_html_sequence_sync(
@@ -387,24 +599,22 @@ def _screenshot_html_sequence_sync(
     size: Tuple[int, int] = (1600, 1000),
     element_selector: str = None,
     durations: list = None,
-    loop: int = None
+    loop: int = None,
+    worker: "_RenderWorker" = None
 ) -> io.BytesIO:
-    """Synchronous implementation of screenshot_html_sequence."""
-    global _browser, _render_count
+    """Synchronous implementation of screenshot_html_sequence. Runs on ``worker`` (the first pool
+    worker if none is given, for scripts calling this directly)."""
+    worker = worker or render_pool.workers[0]
 
     if not html_strings:
         raise ValueError("html_strings list cannot be empty")
 
-    with tempfile.NamedTemporaryFile(suffix=".html", delete=False, mode="w", encoding="utf-8") as tmp:
-        tmp.write(html_strings[0])
-        tmp_path = tmp.name
-
     last_err = None
     for attempt in range(2):
         try:
-            browser = get_browser()
+            browser = worker.get_browser()
             browser.set_window_size(size[0], size[1])
-            browser.get(f"file://{os.path.abspath(tmp_path)}")
+            _load_document(worker, browser, html_strings[0])
 
             from selenium.webdriver.common.by import By
             from selenium.webdriver.support.ui import WebDriverWait
@@ -505,21 +715,16 @@ def _screenshot_html_sequence_sync(
 
             gc.collect()
 
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-
             return buffer
 
         except Exception as e:
             last_err = e
             if attempt == 0:
                 logging.warning(f"Screenshot sequence attempt failed ({e}), restarting Chrome and retrying...")
-                _render_count = MAX_RENDERS_BEFORE_RESTART
+                worker.render_count = MAX_RENDERS_BEFORE_RESTART
             else:
                 logging.error(f"Screenshot sequence retry also failed: {e}")
 
-    if os.path.exists(tmp_path):
-        os.remove(tmp_path)
     raise last_err
 
 
@@ -529,14 +734,24 @@ async def screenshot_html_sequence(
     *,
     element_selector: str = None,
     durations: list = None,
-    loop: int = None
+    loop: int = None,
+    cache: bool = True
 ) -> io.BytesIO:
-    """Render a sequence of HTML strings into an animated GIF (non-blocking, queued)."""
-    async with rendering_lock:
-        async_loop = asyncio.get_event_loop()
-        return await async_loop.run_in_executor(
-            None, _screenshot_html_sequence_sync, html_strings, size, element_selector, durations, loop
-        )
+    """Render a sequence of HTML strings into an animated GIF (non-blocking, queued for a pool
+    worker). Cached like screenshot_html; ``cache=False`` opts out."""
+    async def render():
+        async with render_pool.acquire() as worker:
+            async_loop = asyncio.get_event_loop()
+            return await async_loop.run_in_executor(
+                None, _screenshot_html_sequence_sync, html_strings, size, element_selector,
+                durations, loop, worker
+            )
+
+    key = None
+    if cache and render_cache.enabled():
+        key = render_cache.render_key("gif", list(html_strings), tuple(size), element_selector,
+                                      list(durations or ()), loop)
+    return await _cached_render(key, render)
 
 
 
@@ -7,6 +7,7 @@ import aiohttp
 import discord
 
 from lib.core.image_processing import screenshot_html, get_avatar_data_uri
+from lib.core.avatars import avatar_uris
 from lib.core.file_operations import read_html_template
 
 async def replace_custom_emojis(client, text: str) -> str:
@@ -16,12 +17,12 @@ async def replace_custom_emojis(client, text: str) -> str:
     if not matches:
         return text
         
-    for is_animated, name, emoji_id in set(matches):
-        ext = "gif" if is_animated == "a" else "png"
-        url = f"https://cdn.discordapp.com/emojis/{emoji_id}.{ext}"
-        
-        data_uri = await get_avatar_data_uri(client, url)
-        
+    emojis = list(set(matches))
+    urls = [f"https://cdn.discordapp.com/emojis/{emoji_id}.{'gif' if is_animated == 'a' else 'png'}"
+            for is_animated, _name, emoji_id in emojis]
+    data_uris = await avatar_uris(client, urls)
+
+    for (is_animated, name, emoji_id), data_uri in zip(emojis, data_uris):
         img_tag = f'<img src="{data_uri}" alt=":{name}:" class="discord-emoji" style="width: 1.4em; height: 1.4em; vertical-align: middle; display: inline-block;" />'
         
         original_str = f"&lt;{is_animated}:{name}:{emoji_id}&gt;"
@@ -239,7 +240,8 @@ async def create_message_image(client, message, title):
     html_content = html_content.replace("{content}", escaped_content)
     html_content = html_content.replace("{attached_image_html}", attached_image_html)
 
-    return await screenshot_html(html_content, size=(800, estimated_height), element_selector=".container")
+    return await screenshot_html(html_content, size=(800, estimated_height), element_selector=".container",
+                                 cache=False)
 
 
 def highlight_diff(before, after):
@@ -391,7 +393,8 @@ async def create_edited_message_image(client, before, after):
     html_content = html_content.replace("{after_content}", highlighted_after_content)
     html_content = html_content.replace("{after_attached_image_html}", after_attached_image_html)
 
-    return await screenshot_html(html_content, size=(800, estimated_height), element_selector=".container")
+    return await screenshot_html(html_content, size=(800, estimated_height), element_selector=".container",
+                                 cache=False)
 
 async def create_quote_image(client, message):
     avatar_url = (
@@ -612,4 +615,5 @@ async def create_quote_image(client, message):
     html_content = html_content.replace("{attached_image_html}", attached_image_html)
     html_content = html_content.replace("{reply_html}", reply_html)
 
-    return await screenshot_html(html_content, size=(650, estimated_height), element_selector=".container")
+    return await screenshot_html(html_content, size=(650, estimated_height), element_selector=".container",
+                                 cache=False)
@@ -0,0 +1,121 @@
+"""Registry of in-flight persistent views, one row per message.
+
+Every game table, Skyrim delve, county spawn, wager and archive countdown that must keep
+its buttons across a restart registers an entry here under its message id (or a string
+key such as ``archive_<channel id>``). Entries are the same dicts the games always stored -
+most carry their own ``type`` - and reattach_persistent_views iterates them at boot.
+
+This used to be a single persistent_views.json that every button press loaded, changed
+by one key and fsynced back whole; with a dozen live casino tables that was hundreds of
+KB per click. Now each entry is its own ``persistent_views`` row, so an upsert or delete
+touches exactly one. The old file is imported once on first use and then left alone.
+"""
+
+import json
+import os
+import time
+
+import config
+from database import DatabaseManager
+
+_HOME_FILE = config.PERSISTENT_VIEWS_FILE     # the legacy file, imported once
+_IMPORT_NAME = "persistent_views"
+
+
+class PersistentViewRegistry:
+    _imported = False           # set once the one-shot import is known to have run
+
+    # --- backing -----------------------------------------------------------------
+    @staticmethod
+    def _read_file(path) -> dict:
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @classmethod
+    def _ensure_imported(cls) -> None:
+        from lib.core import state_store
+        if cls._imported:
+            return
+        if state_store.was_imported(_IMPORT_NAME):
+            cls._imported = True
+            return
+        data = {}
+        if os.path.exists(_HOME_FILE):
+            try:
+                data = cls._read_file(_HOME_FILE)
+            except (OSError, ValueError) as e:
+                print(f"[views] Could not import {_HOME_FILE}: {e}")
+                return
+        now = int(time.time())
+        with DatabaseManager.transaction() as c:
+            for key, entry in (data.items() if isinstance(data, dict) else ()):
+                c.execute(
+                    "INSERT OR IGNORE INTO persistent_views (message_id, type, payload, updated_at) "
+                    "VALUES (?, ?, ?, ?)", (str(key), cls._type_of(entry), json.dumps(entry), now))
+            state_store.mark_imported_in_transaction(c, _IMPORT_NAME, _HOME_FILE, len(data))
+        cls._imported = True
+
+    @staticmethod
+    def _type_of(entry):
+        return entry.get("type") if isinstance(entry, dict) else None
+
+    # --- per entry ---------------------------------------------------------------
+    @classmethod
+    def get(cls, message_id):
+        cls._ensure_imported()
+        row = DatabaseManager.fetch_one(
+            "SELECT payload FROM persistent_views WHERE message_id = ?", (str(message_id),))
+        return json.loads(row[0]) if row else None
+
+    @classmethod
+    def put(cls, message_id, entry) -> None:
+        cls._ensure_imported()
+        DatabaseManager.execute(
+            "INSERT INTO persistent_views (message_id, type, payload, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(message_id) DO UPDATE SET type = excluded.type, "
+            "payload = excluded.payload, updated_at = excluded.updated_at",
+            (str(message_id), cls._type_of(entry), json.dumps(entry), int(time.time())))
+
+    @classmethod
+    def delete(cls, message_id) -> bool:
+        """Drop an entry. Returns whether there was one."""
+        cls._ensure_imported()
+        return DatabaseManager.execute(
+            "DELETE FROM persistent_views WHERE message_id = ?", (str(message_id),)) > 0
+
+    # --- whole registry ----------------------------------------------------------
+    @classmethod
+    def items(cls, view_type=None):
+        """``(key, entry)`` pairs, optionally only those of one ``type``."""
+        cls._ensure_imported()
+        if view_type is None:
+            rows = DatabaseManager.fetch_all("SELECT message_id, payload FROM persistent_views")
+        else:
+            rows = DatabaseManager.fetch_all(
+                "SELECT message_id, payload FROM persistent_views WHERE type = ?", (view_type,))
+        return [(key, json.loads(payload)) for key, payload in (rows or [])]
+
+    @classmethod
+    def all(cls) -> dict:
+        return dict(cls.items())
+
+    @classmethod
+    def replace_all(cls, views: dict) -> None:
+        """Make the registry hold exactly ``views``, touching only the entries that changed
+        (the old whole-file save, kept for callers not yet moved to put/delete)."""
+        cls._ensure_imported()
+        wanted = {str(k): json.dumps(v) for k, v in views.items()}
+        current = dict(DatabaseManager.fetch_all(
+            "SELECT message_id, payload FROM persistent_views") or [])
+        now = int(time.time())
+        with DatabaseManager.transaction() as c:
+            for key, payload in wanted.items():
+                if current.get(key) != payload:
+                    c.execute(
+                        "INSERT OR REPLACE INTO persistent_views (message_id, type, payload, updated_at) "
+                        "VALUES (?, ?, ?, ?)", (key, cls._type_of(json.loads(payload)), payload, now))
+            for key in current.keys() - wanted.keys():
+                c.execute("DELETE FROM persistent_views WHERE message_id = ?", (key,))
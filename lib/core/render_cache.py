@@ -0,0 +1,220 @@
+"""Content-addressed cache of rendered HTML screenshots.
+
+A lot of what we render is a picture we've already drawn: a leaderboard page nobody has
+moved on, the same slot result, a rank card reopened a minute later. Each of those used to
+cost a full Chrome page load and screenshot - and a place in the render queue behind
+whatever else was drawing. Here the finished PNG/GIF is kept under a hash of everything
+that decides what it looks like (the HTML, the window size, trim and the element clipped
+to), so a repeat comes straight back without touching a browser.
+
+Two tiers, both evicted by bytes rather than by count (a rank card and a 40-frame slot GIF
+are not the same size):
+
+* memory - an LRU of the most recent images, small enough for a t3.micro;
+* disk   - config.RENDER_CACHE_DIR, least-recently-used files dropped once it passes its
+           budget, so hits survive a restart.
+
+Pages that can change without their HTML changing (anything pulling a live URL into the
+browser) opt out with ``cache=False`` on screenshot_html / screenshot_html_sequence, and
+one-off pictures that will never repeat should too, so they don't push useful ones out.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every cached image after a change to how pages are rendered.
+_KEY_VERSION = 1
+
+_lock = threading.Lock()
+_memory: "OrderedDict[str, bytes]" = OrderedDict()
+_memory_bytes = 0
+_disk: "OrderedDict[str, int] | None" = None   # key -> size, oldest first; scanned on first use
+_disk_bytes = 0
+
+# Hit/miss counters since boot, reported by stats().
+_counters = {"hits_memory": 0, "hits_disk": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+
+def enabled() -> bool:
+    return bool(getattr(config, "RENDER_CACHE_ENABLED", True))
+
+
+def render_key(kind: str, *parts) -> str:
+    """Hash of everything that decides a rendered image. ``parts`` are the render's own
+    arguments (HTML string or list of them, size, trim, selector, ...)."""
+    h = hashlib.sha256(f"{_KEY_VERSION}:{kind}".encode())
+    for part in parts:
+        if isinstance(part, (list, tuple)):
+            h.update(b"[%d" % len(part))
+            for item in part:
+                h.update(b"\x00" + repr(item).encode("utf-8", "surrogatepass"))
+            h.update(b"]")
+        else:
+            h.update(b"\x01" + (part if isinstance(part, str) else repr(part)).encode("utf-8", "surrogatepass"))
+    return h.hexdigest()
+
+
+def _path(key: str) -> str:
+    return os.path.join(config.RENDER_CACHE_DIR, key[:2], key)
+
+
+# --- memory tier ---------------------------------------------------------------------
+def get_memory(key: str) -> bytes | None:
+    """Memory-tier lookup only - cheap enough to do on the event loop."""
+    with _lock:
+        data = _memory.get(key)
+        if data is not None:
+            _memory.move_to_end(key)
+            _counters["hits_memory"] += 1
+        return data
+
+
+def _remember(key: str, data: bytes) -> None:
+    """Insert into the memory tier and evict past the budget. Caller holds _lock. An image
+    bigger than a quarter of the budget is left to the disk tier alone."""
+    global _memory_bytes
+    budget = int(getattr(config, "RENDER_CACHE_MEMORY_BYTES", 0))
+    if len(data) > budget // 4:
+        return
+    old = _memory.pop(key, None)
+    if old is not None:
+        _memory_bytes -= len(old)
+    _memory[key] = data
+    _memory_bytes += len(data)
+    while _memory_bytes > budget and _memory:
+        _k, dropped = _memory.popitem(last=False)
+        _memory_bytes -= len(dropped)
+        _counters["evictions"] += 1
+
+
+def put(key: str, data: bytes) -> None:
+    """Keep a freshly rendered image in the memory tier."""
+    with _lock:
+        _counters["stores"] += 1
+        _remember(key, data)
+
+
+# --- disk tier (blocking: call from an executor) ---------------------------------------
+def _load_disk_index():
+    """Scan the cache dir once, oldest file first. Caller holds _lock."""
+    global _disk, _disk_bytes
+    entries = []
+    root = config.RENDER_CACHE_DIR
+    if os.path.isdir(root):
+        for sub in os.listdir(root):
+            subdir = os.path.join(root, sub)
+            if not os.path.isdir(subdir):
+                continue
+            for name in os.listdir(subdir):
+                if name.endswith(".tmp"):
+                    continue
+                try:
+                    st = os.stat(os.path.join(subdir, name))
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, name, st.st_size))
+    entries.sort()
+    _disk = OrderedDict((name, size) for _m, name, size in entries)
+    _disk_bytes = sum(_disk.values())
+
+
+def get_disk(key: str) -> bytes | None:
+    """Disk-tier lookup. A hit is promoted into memory; a miss counts as a miss."""
+    with _lock:
+        if _disk is None:
+            _load_disk_index()
+        known = key in _disk
+    data = None
+    if known:
+        path = _path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)                       # recency for the next boot's scan
+        except OSError:
+            data = None
+    with _lock:
+        if data is None:
+            if known:
+                _forget_disk(key)
+            _counters["misses"] += 1
+            return None
+        _disk.move_to_end(key)
+        _counters["hits_disk"] += 1
+        _remember(key, data)
+    return data
+
+
+def _forget_disk(key: str) -> None:
+    global _disk_bytes
+    size = _disk.pop(key, None)
+    if size is not None:
+        _disk_bytes -= size
+
+
+def put_disk(key: str, data: bytes) -> None:
+    """Write ``data`` to the disk tier and trim it back under its byte budget. Never raises -
+    a cache that can't write is just a slower cache."""
+    global _disk_bytes
+    budget = int(getattr(config, "RENDER_CACHE_DISK_BYTES", 0))
+    if budget <= 0 or len(data) > budget:
+        return
+    path = _path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Render cache could not write {path}: {e}")
+        return
+    doomed = []
+    with _lock:
+        if _disk is None:
+            _load_disk_index()
+        _forget_disk(key)
+        _disk[key] = len(data)
+        _disk_bytes += len(data)
+        while _disk_bytes > budget and len(_disk) > 1:
+            old = next(iter(_disk))
+            _forget_disk(old)
+            doomed.append(old)
+            _counters["evictions"] += 1
+    for old in doomed:
+        try:
+            os.remove(_path(old))
+        except OSError:
+            pass
+
+
+def stats() -> dict:
+    with _lock:
+        out = dict(_counters)
+        out["memory_entries"] = len(_memory)
+        out["memory_bytes"] = _memory_bytes
+        out["disk_entries"] = len(_disk) if _disk is not None else None
+        out["disk_bytes"] = _disk_bytes if _disk is not None else None
+    lookups = out["hits_memory"] + out["hits_disk"] + out["misses"]
+    out["hit_rate"] = round((out["hits_memory"] + out["hits_disk"]) / lookups, 3) if lookups else 0.0
+    return out
+
+
+def clear(disk: bool = False) -> None:
+    """Drop the memory tier (and the disk tier too if ``disk``). Counters are kept."""
+    global _memory_bytes, _disk, _disk_bytes
+    with _lock:
+        _memory.clear()
+        _memory_bytes = 0
+        if disk:
+            import shutil
+            shutil.rmtree(config.RENDER_CACHE_DIR, ignore_errors=True)
+            _disk = None
+            _disk_bytes = 0
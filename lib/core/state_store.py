@@ -0,0 +1,151 @@
+"""Namespaced key/value state kept in the main database.
+
+A lot of feature state used to be one JSON file per feature - a dict keyed by user id or
+date - loaded whole, changed in one place and rewritten whole with an fsync. Here each
+top-level key is its own ``kv_store`` row, so a write costs one small upsert however many
+other keys the feature holds, and several keys can change in one transaction. Values are
+stored as JSON, so whatever the files held round-trips unchanged (keys come back as
+strings, exactly as they did from a file).
+
+A namespace is seeded once from its legacy file by ``import_json_file``. The file is left
+on disk untouched and the import is recorded, so a later boot never re-imports stale
+contents over newer rows. ``lib.core.file_operations`` routes the files listed in
+``KV_BACKED_FILES`` here, so ``load_json_file``/``save_json_file`` callers keep working
+while they move to per-key ``get``/``put`` one at a time.
+"""
+
+import json
+import os
+import threading
+import time
+
+from database import DatabaseManager
+
+# Namespace recording which legacy files have been imported (key = namespace).
+_IMPORTED = "__imported__"
+
+# namespace -> {key: value JSON} as last read or written through ``replace``, so a
+# whole-dict save only writes the keys whose JSON actually changed.
+_MIRROR = {}
+_MIRROR_LOCK = threading.Lock()
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def _put_in_transaction(cursor, namespace, key, text, now):
+    cursor.execute(
+        "INSERT INTO kv_store (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, "
+        "updated_at = excluded.updated_at",
+        (namespace, key, text, now))
+
+
+def get(namespace: str, key, default=None):
+    row = DatabaseManager.fetch_one(
+        "SELECT value FROM kv_store WHERE namespace = ? AND key = ?", (namespace, str(key)))
+    return json.loads(row[0]) if row else default
+
+
+def items(namespace: str) -> dict:
+    rows = DatabaseManager.fetch_all(
+        "SELECT key, value FROM kv_store WHERE namespace = ?", (namespace,)) or []
+    return {key: json.loads(text) for key, text in rows}
+
+
+def put(namespace: str, key, value) -> None:
+    update(namespace, puts={key: value})
+
+
+def delete(namespace: str, key) -> bool:
+    with DatabaseManager.transaction() as c:
+        c.execute("DELETE FROM kv_store WHERE namespace = ? AND key = ?", (namespace, str(key)))
+        removed = c.rowcount > 0
+    with _MIRROR_LOCK:
+        _MIRROR.get(namespace, {}).pop(str(key), None)
+    return removed
+
+
+def update(namespace: str, puts: dict | None = None, deletes=()) -> None:
+    """Write several keys and delete others in one transaction - all or nothing."""
+    now = int(time.time())
+    texts = {str(k): _dumps(v) for k, v in (puts or {}).items()}
+    gone = [str(k) for k in deletes]
+    with DatabaseManager.transaction() as c:
+        for key, text in texts.items():
+            _put_in_transaction(c, namespace, key, text, now)
+        for key in gone:
+            c.execute("DELETE FROM kv_store WHERE namespace = ? AND key = ?", (namespace, key))
+    with _MIRROR_LOCK:
+        mirror = _MIRROR.get(namespace)
+        if mirror is not None:
+            mirror.update(texts)
+            for key in gone:
+                mirror.pop(key, None)
+
+
+def replace(namespace: str, data: dict) -> int:
+    """Make the namespace hold exactly ``data``, writing only keys that changed and
+    deleting keys that are gone. Returns how many rows were touched."""
+    if not isinstance(data, dict):
+        raise TypeError(f"{namespace}: only dict-shaped state can live in the store")
+    texts = {str(k): _dumps(v) for k, v in data.items()}
+    with _MIRROR_LOCK:
+        mirror = _MIRROR.get(namespace)
+    if mirror is None:
+        rows = DatabaseManager.fetch_all(
+            "SELECT key, value FROM kv_store WHERE namespace = ?", (namespace,)) or []
+        mirror = dict(rows)
+    changed = {k: t for k, t in texts.items() if mirror.get(k) != t}
+    gone = [k for k in mirror if k not in texts]
+    if changed or gone:
+        now = int(time.time())
+        with DatabaseManager.transaction() as c:
+            for key, text in changed.items():
+                _put_in_transaction(c, namespace, key, text, now)
+            for key in gone:
+                c.execute("DELETE FROM kv_store WHERE namespace = ? AND key = ?", (namespace, key))
+    with _MIRROR_LOCK:
+        _MIRROR[namespace] = texts
+    return len(changed) + len(gone)
+
+
+def was_imported(name: str) -> bool:
+    """Whether the one-shot import recorded under ``name`` has already run."""
+    return get(_IMPORTED, name) is not None
+
+
+def mark_imported_in_transaction(cursor, name: str, path: str, keys: int) -> None:
+    _put_in_transaction(cursor, _IMPORTED, name, _dumps({"path": path, "keys": keys}),
+                        int(time.time()))
+
+
+def import_json_file(namespace: str, path: str) -> int | None:
+    """Seed ``namespace`` from a legacy JSON dict file, once. Returns the keys imported,
+    or None if this namespace was already imported (or never had a file)."""
+    if was_imported(namespace):
+        return None
+    data = {}
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # Leave it unmarked so the next boot tries again rather than losing the file.
+            print(f"[state] Could not import {path}: {e}")
+            return None
+        if not isinstance(data, dict):
+            print(f"[state] {path} is not a JSON object; not imported")
+            return None
+    now = int(time.time())
+    with DatabaseManager.transaction() as c:
+        for key, value in data.items():
+            # Never clobber a row written since (e.g. a restored old file on a later boot).
+            c.execute(
+                "INSERT OR IGNORE INTO kv_store (namespace, key, value, updated_at) "
+                "VALUES (?, ?, ?, ?)", (namespace, str(key), _dumps(value), now))
+        mark_imported_in_transaction(c, namespace, path, len(data))
+    with _MIRROR_LOCK:
+        _MIRROR.pop(namespace, None)
+    return len(data)
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from config import *
 from lib.core.constants import CUSTOM_RANK_BACKGROUNDS, CHAT_LEVEL_ROLE_THRESHOLDS
 from lib.core.image_processing import trim_image, encode_image_to_data_uri, screenshot_html, find_non_overlapping_position
+from lib.core.assets import BADGE_ICON, COIN_ICON, RANK_BACKGROUND, TITLE_BANNER
 from lib.core.file_operations import read_html_template, load_whitelist, save_whitelist, load_persistent_views, save_persistent_views, load_json_file, save_json_file, set_file_status, is_file_status_active
 from lib.core.discord_helpers import restrict_channel_for_new_members, has_role, has_any_role, toggle_user_role, validate_and_format_date, send_embed_to_channels, edit_voice_channel_members, fetch_messages_with_context, estimate_tokens
 from lib.economy.economy_manager import get_shutcoins, SHUTCOIN_ENABLED, get_bb
@@ -129,14 +130,14 @@ async def generate_rank_card(interaction: discord.Interaction, member: discord.M
                 from lib.economy.economy_manager import get_shutcoins
                 shutcoin_count = get_shutcoins(member.id)
                 shutcoin_icon_path = os.path.join(BASE_DIR, "data", "shutcoin.png")
-                shutcoin_icon_uri = encode_image_to_data_uri(shutcoin_icon_path)
+                shutcoin_icon_uri = encode_image_to_data_uri(shutcoin_icon_path, COIN_ICON)
                 shutcoin_html = f'<div class="coin-box"><img src="{shutcoin_icon_uri}" class="coin-icon" /><span class="xp-text">{shutcoin_count:,}</span></div>'
             except Exception as e:
                 logger.error(f"Error getting shutcoins: {e}")
 
         britbuck_amount = get_bb(member.id)
         britbuck_icon_path = os.path.join(BASE_DIR, "data", "ukpence.png")
-        britbuck_icon_uri = encode_image_to_data_uri(britbuck_icon_path)
+        britbuck_icon_uri = encode_image_to_data_uri(britbuck_icon_path, COIN_ICON)
         britbuck_html = f'<div class="coin-box"><img src="{britbuck_icon_uri}" class="coin-icon" /><span class="xp-text">{britbuck_amount:,}</span></div>'
 
         user_id_str = str(member.id)
@@ -176,13 +177,13 @@ async def generate_rank_card(interaction: discord.Interaction, member: discord.M
         if not os.path.exists(background_path):
             bg_file = "unionjack.png"
             background_path = os.path.join(BASE_DIR, "data", "rank_cards", bg_file)
-        background_data_uri = encode_image_to_data_uri(background_path)
+        background_data_uri = encode_image_to_data_uri(background_path, RANK_BACKGROUND, cover=True)
         
         # Encode title banner texture
         title_banner_path = os.path.join(BASE_DIR, "data", "rank_cards", "title_banner_texture.png")
         title_bg_uri = ""
         if os.path.exists(title_banner_path):
-            title_bg_uri = encode_image_to_data_uri(title_banner_path)
+            title_bg_uri = encode_image_to_data_uri(title_banner_path, TITLE_BANNER, cover=True)
 
         # Add badges
         badges_html = ""
@@ -203,7 +204,7 @@ async def generate_rank_card(interaction: discord.Interaction, member: discord.M
                 icon_file_path = os.path.join(BASE_DIR, "data", "badges", icon)
                 badge_inner_html = ""
                 if os.path.exists(icon_file_path):
-                    data_uri = encode_image_to_data_uri(icon_file_path)
+                    data_uri = encode_image_to_data_uri(icon_file_path, BADGE_ICON)
                     badge_inner_html = f'<div class="badge-item {rarity_class}"><img src="{data_uri}" alt="{b_name}"></div>'
                 else:
                     # Assume it's a raw emoji
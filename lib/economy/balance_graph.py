@@ -8,22 +8,17 @@ inline-SVG line chart (no charting deps) via the headless-Chrome pipeline, style
 the /ukpeconomy dashboard. Gated behind a button so /balance stays instant.
 """
 
-import glob
-import json
 import logging
-import os
 from datetime import datetime
 
 import discord
 import pytz
 
-import config
 from lib.economy.economy_manager import get_bb
 
 log = logging.getLogger(__name__)
 
 _UK = pytz.timezone("Europe/London")
-_PREFIX = "ukpence_balances_"
 _MAX_POINTS = 300  # cap rendered points (downsampled) so the SVG stays light
 _DEFAULT_DAYS = 30  # the graph opens on the last 30 days; range buttons adjust it
 
@@ -36,24 +31,12 @@ def _midnight_epoch(date_str):
 def _snapshot_points(uid):
     """One (ts, balance) per daily snapshot, placed at end-of-day (the snapshot is the
     end-of-day ledger). Covers long-range history from before granular logging existed."""
-    pts = []
-    for path in glob.glob(os.path.join(config.BALANCE_SNAPSHOT_DIR, f"{_PREFIX}*.json")):
-        date_str = os.path.basename(path)[len(_PREFIX):-len(".json")]
-        try:
-            datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            continue
-        try:
-            with open(path, "r") as f:
-                data = json.load(f)
-        except Exception:
-            continue
-        if uid in data:
-            try:
-                pts.append((_midnight_epoch(date_str) + 86400, int(data[uid])))
-            except (TypeError, ValueError):
-                continue
-    return pts
+    try:
+        from lib.economy.balance_snapshots import history
+        return [(_midnight_epoch(date_str) + 86400, bal) for date_str, bal in history(uid)]
+    except Exception:
+        log.debug("balance_snapshots query failed", exc_info=True)
+        return []
 
 
 def _history_points(uid):
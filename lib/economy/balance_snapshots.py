@@ -0,0 +1,79 @@
+"""Daily end-of-day balance snapshots, indexed per user.
+
+The nightly job has always written one whole-guild ``ukpence_balances_<date>.json`` file
+into BALANCE_SNAPSHOT_DIR, and every balance graph and /statement used to glob and parse
+all of them to pick out one user's value - cost growing with days x members. The same
+snapshot now also lands in the ``balance_snapshots`` table, keyed (user_id, date), so a
+user's whole history is a single primary-key range read. The JSON files are still written
+(the economy dashboard and the backups read them); ``import_snapshot_files`` copies the
+historical ones into the table once.
+"""
+
+import glob
+import json
+import os
+from datetime import datetime
+
+import config
+from database import DatabaseManager
+
+PREFIX = "ukpence_balances_"
+
+
+def _rows(date_str, balances):
+    rows = []
+    for uid, balance in balances.items():
+        try:
+            rows.append((str(uid), date_str, int(balance)))
+        except (TypeError, ValueError):
+            continue
+    return rows
+
+
+def record(date_str: str, balances: dict) -> int:
+    """Store one day's snapshot (replacing any earlier one for that date). Returns rows."""
+    rows = _rows(date_str, balances)
+    with DatabaseManager.transaction() as c:
+        c.executemany(
+            "INSERT OR REPLACE INTO balance_snapshots (user_id, date, balance) VALUES (?, ?, ?)",
+            rows)
+    return len(rows)
+
+
+def history(uid) -> list[tuple[str, int]]:
+    """[(date, balance)] for one user, oldest first."""
+    rows = DatabaseManager.fetch_all(
+        "SELECT date, balance FROM balance_snapshots WHERE user_id = ? ORDER BY date",
+        (str(uid),)) or []
+    return [(date, int(balance)) for date, balance in rows]
+
+
+def import_snapshot_files() -> None:
+    """One-shot copy of every historical snapshot file into the table. Recorded so it
+    never runs twice; from then on the nightly job writes the table itself."""
+    from lib.core import state_store
+
+    if state_store.was_imported("balance_snapshots"):
+        return
+    rows, files = [], 0
+    for path in glob.glob(os.path.join(config.BALANCE_SNAPSHOT_DIR, f"{PREFIX}*.json")):
+        date_str = os.path.basename(path)[len(PREFIX):-len(".json")]
+        try:
+            datetime.strptime(date_str, "%Y-%m-%d")
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (ValueError, OSError):
+            print(f"[snapshots] Skipping unreadable snapshot {path}")
+            continue
+        if isinstance(data, dict):
+            rows.extend(_rows(date_str, data))
+            files += 1
+
+    with DatabaseManager.transaction() as c:
+        # A date already in the table came from the nightly job, which is authoritative.
+        c.executemany(
+            "INSERT OR IGNORE INTO balance_snapshots (user_id, date, balance) VALUES (?, ?, ?)",
+            rows)
+        state_store.mark_imported_in_transaction(
+            c, "balance_snapshots", config.BALANCE_SNAPSHOT_DIR, len(rows))
+    print(f"[snapshots] Imported {len(rows)} balances from {files} daily snapshot files")
@@ -4,6 +4,7 @@ import sqlite3
 import logging
 from typing import Dict, Any
 from database import DatabaseManager
+from lib.economy import guard_state
 
 logger = logging.getLogger(__name__)
 
@@ -153,6 +154,7 @@ class BankManager:
                 BankManager._deposit_in_transaction(
                     conn.cursor(), amount, description, now,
                 )
+            guard_state.note_bank(amount)
             logger.info(f"Bank deposit: {amount} UKP. Reason: {description}")
             return True
         except sqlite3.Error as e:
@@ -170,6 +172,7 @@ class BankManager:
                 BankManager._deposit_in_transaction(
                     conn.cursor(), amount, description, now, tax_deposit=True,
                 )
+            guard_state.note_bank(amount)
             logger.info(f"Bank tax deposit: {amount} UKP. Reason: {description}")
             return True
         except sqlite3.Error as e:
@@ -190,6 +193,7 @@ class BankManager:
             if not success:
                 logger.warning(f"Insufficient funds in bank for withdrawal of {amount} UKP.")
                 return False
+            guard_state.note_bank(-amount)
             logger.info(f"Bank withdrawal: {amount} UKP. Reason: {description}")
             return True
         except sqlite3.Error as e:
@@ -251,6 +255,7 @@ class BankManager:
                 change = UKPenceManager._add_amount_in_transaction(
                     cursor, user_id, net_amount, user_reason, now,
                 )
+            guard_state.note_bank(tax_amount - amount)
             UKPenceManager._finish_change(change, high_roller=True)
             return True
         except sqlite3.Error as e:
@@ -326,6 +331,7 @@ class BankManager:
                     changes.append(UKPenceManager._add_amount_in_transaction(
                         cursor, user_id, amount, reason, now,
                     ))
+            guard_state.note_bank(-(total + welcome_total))
             for change in changes:
                 UKPenceManager._finish_change(change, high_roller=True)
             if welcome_total:
@@ -371,6 +377,7 @@ class BankManager:
                         "(timestamp, payer_id, recipient_id, amount) VALUES (?, ?, ?, ?)",
                         (now, str(user_id), str(BOT_ID), amount),
                     )
+            guard_state.note_bank(amount)
             UKPenceManager._finish_change(change, bankrupt=True)
             return True
         except sqlite3.Error as e:
@@ -445,6 +452,7 @@ class BankManager:
                         now,
                         tax_deposit=True,
                     )
+            guard_state.note_bank(sum(row[1] for row in charged_rows))
             for change in changes:
                 UKPenceManager._finish_change(change)
             return charged_rows
@@ -563,6 +571,7 @@ class BankManager:
                     "INSERT INTO economy_transactions (timestamp, log_text) VALUES (?, ?)",
                     (now, log_text),
                 )
+            guard_state.note_bank(amount - old_balance)
             logger.info(f"Bank balance reset to {amount} UKP")
             return True
         except sqlite3.Error as e:
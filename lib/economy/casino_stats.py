@@ -6,6 +6,13 @@ that we can answer per-user questions (games played, win/loss/push, net P/L, big
 win, per-game breakdown) and build leaderboards - all from indexed columns rather than
 parsing the free-text economy ledger.
 
+The same transaction also folds the round into two rollups, ``casino_hourly`` (game,
+hour) and ``casino_user_daily`` (player, game, day), and every read here goes to those:
+a player's stats are a few dozen day rows rather than every hand they ever played, and
+the house edge over the last 24h/7d/30d (:func:`house_edge`) is at most 720 hour rows
+per game. ``casino_results`` stays the per-round record for the streak badges and the
+backfill scripts; :func:`rebuild_rollups` recomputes both tables from it.
+
 This module deliberately depends only on ``DatabaseManager`` so any game module can
 import it without pulling in rendering/economy code or risking a circular import.
 """
@@ -50,18 +57,78 @@ def record_result(user_id, game: str, bet, staked, payout, outcome=None) -> None
         payout = int(payout)
         net = payout - staked
         result = "win" if net > 0 else ("loss" if net < 0 else "push")
-        DatabaseManager.execute(
-            "INSERT INTO casino_results "
-            "(user_id, game, bet, staked, payout, net, outcome, result, timestamp) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (str(user_id), str(game), bet, staked, payout, net,
-             (str(outcome) if outcome is not None else None), result, int(time.time())),
-        )
+        now = int(time.time())
+        uid, game = str(user_id), str(game)
+        with DatabaseManager.transaction() as c:
+            c.execute(
+                "INSERT INTO casino_results "
+                "(user_id, game, bet, staked, payout, net, outcome, result, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (uid, game, bet, staked, payout, net,
+                 (str(outcome) if outcome is not None else None), result, now),
+            )
+            c.execute(_HOURLY_UPSERT, (game, now - now % 3600, staked, payout, net))
+            c.execute(_DAILY_UPSERT, (uid, game, now - now % 86400,
+                                      int(result == "win"), int(result == "loss"),
+                                      int(result == "push"), staked, payout, net, net, net, now))
         _check_casino_badges(user_id, game, result, net)
     except Exception:
         logger.error("Failed to record casino result (%s/%s)", user_id, game, exc_info=True)
 
 
+_HOURLY_UPSERT = (
+    "INSERT INTO casino_hourly (game, hour, rounds, staked, payout, net) "
+    "VALUES (?, ?, 1, ?, ?, ?) "
+    "ON CONFLICT (game, hour) DO UPDATE SET rounds = rounds + 1, "
+    "staked = staked + excluded.staked, payout = payout + excluded.payout, "
+    "net = net + excluded.net"
+)
+_DAILY_UPSERT = (
+    "INSERT INTO casino_user_daily (user_id, game, day, rounds, wins, losses, pushes, "
+    "staked, payout, net, min_net, max_net, last_ts) "
+    "VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (user_id, game, day) DO UPDATE SET rounds = rounds + 1, "
+    "wins = wins + excluded.wins, losses = losses + excluded.losses, "
+    "pushes = pushes + excluded.pushes, staked = staked + excluded.staked, "
+    "payout = payout + excluded.payout, net = net + excluded.net, "
+    "min_net = MIN(min_net, excluded.min_net), max_net = MAX(max_net, excluded.max_net), "
+    "last_ts = MAX(last_ts, excluded.last_ts)"
+)
+
+
+def rebuild_rollups(cursor) -> int:
+    """Recompute casino_hourly and casino_user_daily from casino_results, inside the
+    caller's transaction. Returns the number of rounds folded in."""
+    cursor.execute("DELETE FROM casino_hourly")
+    cursor.execute("DELETE FROM casino_user_daily")
+    cursor.execute(
+        "INSERT INTO casino_hourly (game, hour, rounds, staked, payout, net) "
+        "SELECT game, timestamp - timestamp % 3600, COUNT(*), SUM(staked), SUM(payout), "
+        "SUM(net) FROM casino_results GROUP BY 1, 2")
+    cursor.execute(
+        "INSERT INTO casino_user_daily (user_id, game, day, rounds, wins, losses, pushes, "
+        "staked, payout, net, min_net, max_net, last_ts) "
+        "SELECT user_id, game, timestamp - timestamp % 86400, COUNT(*), "
+        "SUM(result = 'win'), SUM(result = 'loss'), SUM(result = 'push'), "
+        "SUM(staked), SUM(payout), SUM(net), MIN(net), MAX(net), MAX(timestamp) "
+        "FROM casino_results GROUP BY 1, 2, 3")
+    row = cursor.execute("SELECT COALESCE(SUM(rounds), 0) FROM casino_hourly").fetchone()
+    return int(row[0])
+
+
+def import_rollups() -> None:
+    """One-shot fill of the rollup tables from the rounds recorded before they existed.
+    Recorded so it never runs twice; from then on record_result keeps them current."""
+    from lib.core import state_store
+
+    if state_store.was_imported("casino_rollups"):
+        return
+    with DatabaseManager.transaction() as c:
+        rounds = rebuild_rollups(c)
+        state_store.mark_imported_in_transaction(c, "casino_rollups", "", rounds)
+    print(f"[casino] Rolled up {rounds} recorded casino rounds")
+
+
 # Number of distinct house games (blackjack, higherlower, slots, videopoker, reddog, tcp,
 # roulette, mines, penalty, chest, blockade, darts) - all here. Connect 4 is PvP and lives elsewhere.
 _CASINO_GAME_COUNT = 12
@@ -78,16 +145,16 @@ def _award_silently(user_id, badge_id):
 
 
 def _check_casino_badges(user_id, game, result, net):
-    """Best-effort casino milestone badges, derived from casino_results (which already
-    includes the row just inserted). Never raises into the record path."""
+    """Best-effort casino milestone badges, derived from the rollups and casino_results
+    (which already include the round just recorded). Never raises into the record path."""
     try:
         uid = str(user_id)
         total = DatabaseManager.fetch_one(
-            "SELECT COUNT(*) FROM casino_results WHERE user_id = ?", (uid,))
+            "SELECT COALESCE(SUM(rounds), 0) FROM casino_user_daily WHERE user_id = ?", (uid,))
         if total and total[0] >= 1000:
             _award_silently(user_id, "centurion")
         distinct = DatabaseManager.fetch_one(
-            "SELECT COUNT(DISTINCT game) FROM casino_results WHERE user_id = ?", (uid,))
+            "SELECT COUNT(DISTINCT game) FROM casino_user_daily WHERE user_id = ?", (uid,))
         if distinct and distinct[0] >= _CASINO_GAME_COUNT:
             _award_silently(user_id, "dealers_choice")
         if result == "win":
@@ -130,13 +197,9 @@ def get_user_casino_stats(user_id) -> dict:
     negative single-round net (0 if they've never lost). Empty/zeroed if no rounds.
     """
     rows = DatabaseManager.fetch_all(
-        "SELECT game, COUNT(*), "
-        "SUM(CASE WHEN result='win' THEN 1 ELSE 0 END), "
-        "SUM(CASE WHEN result='loss' THEN 1 ELSE 0 END), "
-        "SUM(CASE WHEN result='push' THEN 1 ELSE 0 END), "
-        "COALESCE(SUM(staked),0), COALESCE(SUM(payout),0), COALESCE(SUM(net),0), "
-        "COALESCE(MAX(net),0), COALESCE(MIN(net),0) "
-        "FROM casino_results WHERE user_id = ? GROUP BY game",
+        "SELECT game, SUM(rounds), SUM(wins), SUM(losses), SUM(pushes), "
+        "SUM(staked), SUM(payout), SUM(net), MAX(max_net), MIN(min_net) "
+        "FROM casino_user_daily WHERE user_id = ? GROUP BY game ORDER BY game",
         (str(user_id),),
     ) or []
 
@@ -160,18 +223,32 @@ def get_user_casino_stats(user_id) -> dict:
     return {"total": total, "per_game": per_game}
 
 
-def get_net_standings(game: str = None, top: int = 5):
+def _scope(game: str = None, days: int = None):
+    """WHERE clause and params limiting casino_user_daily to ``game`` and/or the last
+    ``days`` days (today counted as one)."""
+    clauses, params = [], []
+    if game:
+        clauses.append("game = ?")
+        params.append(game)
+    if days:
+        now = int(time.time())
+        clauses.append("day >= ?")
+        params.append(now - now % 86400 - (int(days) - 1) * 86400)
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def get_net_standings(game: str = None, top: int = 5, days: int = None):
     """Return ``(winners, losers)`` for the net-P/L leaderboard.
 
     ``winners`` are the ``top`` players by highest net, ``losers`` the ``top`` by
     lowest net - with anyone already in ``winners`` removed from ``losers`` so a small
     player pool can't list the same person on both sides. Each entry is
-    ``(user_id, net, games)``. Pass ``game`` to scope to one game, or None for overall.
+    ``(user_id, net, games)``. Pass ``game`` to scope to one game, or None for overall,
+    and ``days`` to count only the last few (UTC) days.
     """
-    where = "WHERE game = ?" if game else ""
-    gparams = [game] if game else []
-    base = ("SELECT user_id, COALESCE(SUM(net),0) AS net, COUNT(*) AS games "
-            f"FROM casino_results {where} GROUP BY user_id ")
+    where, gparams = _scope(game, days)
+    base = ("SELECT user_id, SUM(net) AS net, SUM(rounds) AS games "
+            f"FROM casino_user_daily {where} GROUP BY user_id ")
     winners = DatabaseManager.fetch_all(
         base + "ORDER BY net DESC, games DESC LIMIT ?", tuple(gparams + [int(top)])
     ) or []
@@ -224,26 +301,52 @@ def session_footer_html(player_id, *, session_count, session_net, current_net=0,
     )
 
 
-def get_casino_leaderboard(metric: str = "net", game: str = None, limit: int = 10) -> list:
-    """Top players by a metric across all games (or one ``game``).
+def get_casino_leaderboard(metric: str = "net", game: str = None, limit: int = 10,
+                           days: int = None) -> list:
+    """Top players by a metric across all games (or one ``game``), lifetime or over the
+    last ``days`` days.
 
     ``metric``: ``net`` (profit), ``payout`` (total won), ``staked`` (total wagered),
     ``games`` (rounds played) or ``biggest_win`` (best single round). Returns a list of
     ``{"user_id", "value", "games"}`` ordered high -> low.
     """
     agg = {
-        "net": "COALESCE(SUM(net),0)",
-        "payout": "COALESCE(SUM(payout),0)",
-        "staked": "COALESCE(SUM(staked),0)",
-        "games": "COUNT(*)",
-        "biggest_win": "COALESCE(MAX(net),0)",
-    }.get(metric, "COALESCE(SUM(net),0)")
-
-    where = "WHERE game = ?" if game else ""
-    params = ([game] if game else []) + [int(limit)]
+        "net": "SUM(net)",
+        "payout": "SUM(payout)",
+        "staked": "SUM(staked)",
+        "games": "SUM(rounds)",
+        "biggest_win": "MAX(max_net)",
+    }.get(metric, "SUM(net)")
+
+    where, params = _scope(game, days)
     rows = DatabaseManager.fetch_all(
-        f"SELECT user_id, {agg} AS value, COUNT(*) AS games "
-        f"FROM casino_results {where} GROUP BY user_id ORDER BY value DESC LIMIT ?",
-        tuple(params),
+        f"SELECT user_id, {agg} AS value, SUM(rounds) AS games "
+        f"FROM casino_user_daily {where} GROUP BY user_id ORDER BY value DESC LIMIT ?",
+        tuple(params + [int(limit)]),
     ) or []
     return [{"user_id": r[0], "value": r[1], "games": r[2]} for r in rows]
+
+
+def house_edge(hours: int = 24) -> dict:
+    """The house's side of the last ``hours`` hours (to the hour: the current hour so far
+    plus the ``hours - 1`` before it), per game and overall.
+
+    Returns ``{game: {...}, "all": {...}}`` where each entry has ``rounds``, ``staked``,
+    ``payout``, ``house_net`` (what the house kept: staked - payout) and ``edge``
+    (house_net / staked, None before anything was staked).
+    """
+    now = int(time.time())
+    since = now - now % 3600 - (int(hours) - 1) * 3600
+    rows = DatabaseManager.fetch_all(
+        "SELECT game, SUM(rounds), SUM(staked), SUM(payout) FROM casino_hourly "
+        "WHERE hour >= ? GROUP BY game ORDER BY game", (since,)) or []
+
+    def entry(rounds, staked, payout):
+        house = staked - payout
+        return {"rounds": rounds, "staked": staked, "payout": payout, "house_net": house,
+                "edge": (house / staked) if staked else None}
+
+    out = {game: entry(rounds, staked, payout) for game, rounds, staked, payout in rows}
+    out["all"] = entry(sum(r[1] for r in rows), sum(r[2] for r in rows),
+                       sum(r[3] for r in rows))
+    return out
@@ -1,7 +1,7 @@
 from database import DatabaseManager
-import json
 import logging
-import os
+import threading
+import time
 from config import ECONOMY_METRICS_FILE
 
 logger = logging.getLogger(__name__)
@@ -216,6 +216,8 @@ class UKPenceManager:
             return
         user_id, old_balance, new_balance, history_row = change
         _mark_balance_point_committed(history_row)
+        from lib.economy import guard_state
+        guard_state.note_balance(user_id, new_balance - old_balance)
 
         from config import BOT_ID
         if str(user_id) == str(BOT_ID):
@@ -300,43 +302,106 @@ class UKPenceManager:
         return change is not None
 
 class EconomyMetrics:
-    @staticmethod
-    def update_daily_metric(date_str: str, key: str, value_to_add_or_set: int, is_total_value: bool = False) -> None:
-        metrics_data = {}
-        if os.path.exists(ECONOMY_METRICS_FILE):
-            with open(ECONOMY_METRICS_FILE, "r") as f:
-                try:
-                    metrics_data = json.load(f)
-                except json.JSONDecodeError:
-                    pass
-
-        day_metrics = metrics_data.get(date_str, {})
-        if is_total_value:
-            day_metrics[key] = value_to_add_or_set
-        else:
-            current_value = day_metrics.get(key, 0)
-            day_metrics[key] = current_value + value_to_add_or_set
-
-        metrics_data[date_str] = day_metrics
+    """Per-day economy totals in the ``economy_metrics`` (date, key, value) table.
 
-        from lib.core.file_operations import atomic_write_json
-        atomic_write_json(ECONOMY_METRICS_FILE, metrics_data, indent=4)
+    Updates land in an in-memory accumulator - a chat reward is a dict bump, not a rewrite
+    of every day ever recorded - and are upserted at most every FLUSH_INTERVAL seconds (and
+    by the scheduler/shutdown flush). Reads overlay the unflushed changes on the table, so
+    they are exact without forcing a write.
+    """
+    FLUSH_INTERVAL = 30.0
+
+    _lock = threading.Lock()
+    # (date, key) -> ("add" | "set", value); an add after a set folds into the set.
+    _pending: dict[tuple[str, str], tuple[str, int]] = {}
+    _last_flush = time.monotonic()
+
+    @classmethod
+    def update_daily_metric(cls, date_str: str, key: str, value_to_add_or_set: int, is_total_value: bool = False) -> None:
+        with cls._lock:
+            mode, value = cls._pending.get((date_str, key), ("add", 0))
+            if is_total_value:
+                cls._pending[(date_str, key)] = ("set", value_to_add_or_set)
+            else:
+                cls._pending[(date_str, key)] = (mode, value + value_to_add_or_set)
+            due = time.monotonic() - cls._last_flush >= cls.FLUSH_INTERVAL
+        if due:
+            cls.flush()
+
+    @classmethod
+    def flush(cls) -> int:
+        """Upsert every pending change in one transaction. Returns the metrics written."""
+        with cls._lock:
+            pending, cls._pending = cls._pending, {}
+            cls._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        adds = [(d, k, v) for (d, k), (mode, v) in pending.items() if mode == "add"]
+        sets = [(d, k, v) for (d, k), (mode, v) in pending.items() if mode == "set"]
+        try:
+            with DatabaseManager.transaction() as c:
+                c.executemany(
+                    "INSERT INTO economy_metrics (date, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT(date, key) DO UPDATE SET value = value + excluded.value", adds)
+                c.executemany(
+                    "INSERT INTO economy_metrics (date, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT(date, key) DO UPDATE SET value = excluded.value", sets)
+        except Exception:
+            # Put them back (under anything that arrived meanwhile) for the next attempt.
+            with cls._lock:
+                for mk, (mode, value) in pending.items():
+                    later = cls._pending.get(mk)
+                    if later is None:
+                        cls._pending[mk] = (mode, value)
+                    elif later[0] == "add":
+                        cls._pending[mk] = (mode, value + later[1])
+            raise
+        return len(pending)
+
+    @classmethod
+    def _overlay(cls, metrics: dict, date_str: str) -> dict:
+        for (d, key), (mode, value) in list(cls._pending.items()):
+            if d == date_str:
+                metrics[key] = value if mode == "set" else metrics.get(key, 0) + value
+        return metrics
+
+    @classmethod
+    def get_daily_metrics(cls, date_str: str) -> dict:
+        rows = DatabaseManager.fetch_all(
+            "SELECT key, value FROM economy_metrics WHERE date = ?", (date_str,)) or []
+        with cls._lock:
+            return cls._overlay(dict(rows), date_str)
+
+    @classmethod
+    def get_all_metrics(cls) -> dict:
+        data = {}
+        for date_str, key, value in (DatabaseManager.fetch_all(
+                "SELECT date, key, value FROM economy_metrics ORDER BY date") or []):
+            data.setdefault(date_str, {})[key] = value
+        with cls._lock:
+            for date_str in {d for d, _k in cls._pending}:
+                data[date_str] = cls._overlay(data.get(date_str, {}), date_str)
+        return data
 
     @staticmethod
-    def get_daily_metrics(date_str: str) -> dict:
-        if os.path.exists(ECONOMY_METRICS_FILE):
-            with open(ECONOMY_METRICS_FILE, "r") as f:
-                data = json.load(f)
-                return data.get(date_str, {})
-        return {}
+    def import_metrics_file() -> None:
+        """One-shot copy of the old economy_metrics.json into the table, recorded so it
+        never runs twice."""
+        from lib.core import state_store
+        from lib.core.file_operations import load_json_file
 
-    @staticmethod
-    def get_all_metrics() -> dict:
-        if os.path.exists(ECONOMY_METRICS_FILE):
-            with open(ECONOMY_METRICS_FILE, "r") as f:
-                data = json.load(f)
-                return data
-        return {}
+        if state_store.was_imported("economy_metrics"):
+            return
+        rows = []
+        for date_str, day in (load_json_file(ECONOMY_METRICS_FILE) or {}).items():
+            for key, value in (day or {}).items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    rows.append((date_str, key, value))
+        with DatabaseManager.transaction() as c:
+            c.executemany(
+                "INSERT OR IGNORE INTO economy_metrics (date, key, value) VALUES (?, ?, ?)", rows)
+            state_store.mark_imported_in_transaction(c, "economy_metrics", ECONOMY_METRICS_FILE, len(rows))
+        print(f"[db] Imported {len(rows)} economy metrics from {ECONOMY_METRICS_FILE}")
 
 def get_shutcoins(user_id: int) -> int:
     return ShutcoinManager.get_balance(user_id)
@@ -398,6 +463,43 @@ def recent_transfer_io(user_id, days: int = None) -> tuple[int, int]:
     return (inflow, outflow)
 
 
+def recent_transfer_io_batch(user_ids, days: int = None) -> dict[str, tuple[int, int]]:
+    """recent_transfer_io for many users at once: {uid: (inflow, outflow)}, every requested
+    uid present. Four grouped queries over the window however many users are asked about,
+    so a weekly tax run doesn't issue four SUMs per candidate."""
+    import time
+    import config
+    if days is None:
+        days = int(getattr(config, "TRANSFER_LOOKBACK_DAYS", 7))
+    cutoff = int(time.time()) - days * 86400
+    io = {str(uid): [0, 0] for uid in user_ids}
+    if not io:
+        return {}
+    for table, incoming_col, outgoing_col in (
+        ("pay_transfers", "recipient_id", "payer_id"),
+        ("game_transfers", "winner_id", "loser_id"),
+    ):
+        try:
+            for slot, col in ((0, incoming_col), (1, outgoing_col)):
+                rows = DatabaseManager.fetch_all(
+                    f"SELECT {col}, SUM(amount) FROM {table} "
+                    f"WHERE timestamp > ? GROUP BY {col}", (cutoff,)) or []
+                for uid, total in rows:
+                    entry = io.get(str(uid))
+                    if entry is not None and total is not None:
+                        entry[slot] += int(total)
+        except Exception:
+            pass
+    return {uid: (inflow, outflow) for uid, (inflow, outflow) in io.items()}
+
+
+def effective_wealth_batch(balances: dict, days: int = None) -> dict[str, int]:
+    """effective_wealth for every {uid: balance} given, from one recent_transfer_io_batch."""
+    io = recent_transfer_io_batch(balances, days)
+    return {str(uid): max(0, int(bal) + io[str(uid)][1] - io[str(uid)][0])
+            for uid, bal in balances.items()}
+
+
 def daily_transfer_used(user_id, bot_id=None) -> int:
     """UKP this member has moved to other members today: /pay sent, plus wagers lost.
 
@@ -433,14 +535,26 @@ def daily_transfer_used(user_id, bot_id=None) -> int:
     return used
 
 
-def daily_transfer_state(user_id, bot_id=None) -> tuple[int, int, int]:
-    """(used today, remaining, when it resets) against DAILY_PAY_CAP."""
-    from datetime import datetime, timedelta
+def daily_transfer_state(user_id, bot_id=None, *, cached: bool = False) -> tuple[int, int, int]:
+    """(used today, remaining, when it resets) against DAILY_PAY_CAP.
+
+    ``cached`` takes today's usage from the in-memory guard state (lib/economy/guard_state.py)
+    rather than two SUMs - what a casino stake check wants on every click. /pay keeps the
+    exact SQL read. Falls back to SQL if the guard state can't be loaded.
+    """
     import config
+    cap = int(getattr(config, "DAILY_PAY_CAP", 10000))
+    if cached:
+        try:
+            from lib.economy import guard_state
+            used = guard_state.outflow_today(user_id)
+            return used, max(0, cap - used), guard_state.resets_at()
+        except Exception:
+            logger.error("guard state read failed; counting the allowance in SQL", exc_info=True)
+    from datetime import datetime, timedelta
     import pytz
     uk = pytz.timezone("Europe/London")
     midnight = datetime.now(uk).replace(hour=0, minute=0, second=0, microsecond=0)
-    cap = int(getattr(config, "DAILY_PAY_CAP", 10000))
     used = daily_transfer_used(user_id, bot_id)
     return used, max(0, cap - used), int((midnight + timedelta(days=1)).timestamp())
 
@@ -456,7 +570,7 @@ def wager_blocked_reason(user_id, stake, bot_id=None, name="You") -> str | None:
     stake = int(stake)
     if stake <= 0:
         return None
-    used, remaining, reset = daily_transfer_state(user_id, bot_id)
+    used, remaining, reset = daily_transfer_state(user_id, bot_id, cached=True)
     if stake <= remaining:
         return None
     import config
@@ -527,9 +641,12 @@ def record_game_transfer(loser_id, winner_id, amount) -> None:
         return
     try:
         import time
+        now = int(time.time())
         DatabaseManager.execute(
             "INSERT INTO game_transfers (timestamp, loser_id, winner_id, amount) VALUES (?, ?, ?, ?)",
-            (int(time.time()), str(loser_id), str(winner_id), amount))
+            (now, str(loser_id), str(winner_id), amount))
+        from lib.economy import guard_state
+        guard_state.note_outflow(loser_id, amount, now)
     except Exception:
         pass
     # Losing on purpose is a way to move UKP without the /pay cap or its tax, so the pair's
@@ -5,7 +5,8 @@ import logging
 from string import Template
 from datetime import datetime, timedelta
 import pytz
-from lib.core.image_processing import encode_image_to_data_uri, screenshot_html, get_avatar_data_uri
+from lib.core.image_processing import encode_image_to_data_uri, screenshot_html
+from lib.core.avatars import DEFAULT_AVATAR, avatar_uris
 
 from lib.economy.economy_manager import get_all_balances as load_ukpence_data
 from database import DatabaseManager
@@ -14,20 +15,17 @@ logger = logging.getLogger(__name__)
 
 
 try:
-    from config import ECONOMY_METRICS_FILE, BALANCE_SNAPSHOT_DIR
+    from config import BALANCE_SNAPSHOT_DIR
 except ImportError:
-    from config import ECONOMY_METRICS_FILE
     BALANCE_SNAPSHOT_DIR = "balance_snapshots"
 
 
 def get_daily_metrics(date_str: str):
-    if not os.path.exists(ECONOMY_METRICS_FILE):
-        return {}
+    from lib.economy.economy_manager import EconomyMetrics
     try:
-        with open(ECONOMY_METRICS_FILE, "r") as f:
-            all_metrics = json.load(f)
-        return all_metrics.get(date_str, {})
-    except (json.JSONDecodeError, FileNotFoundError):
+        return EconomyMetrics.get_daily_metrics(date_str)
+    except Exception:
+        logger.error("Could not read economy metrics for %s", date_str, exc_info=True)
         return {}
 
 def load_balance_snapshot(date_str: str):
@@ -44,7 +42,7 @@ def load_balance_snapshot(date_str: str):
 # Recent injections = bank -> player rewards, summed per source for yesterday.
 # economy_transactions is a drained processing queue (rows are deleted after they're
 # posted to the log channel), so it's useless for history. Instead each source writes a
-# running daily total into the persistent economy_metrics.json (same store the nightly
+# running daily total into the persistent economy_metrics table (same store the nightly
 # chat/stage/booster aggregates already use), and we read yesterday's totals here.
 # (Casino/lottery are excluded - net of stakes they're a sink, not an injection.)
 _INJECTION_SOURCES = [
@@ -76,6 +74,32 @@ def _build_injections_html(metrics: dict) -> str:
     return "\n".join(cards)
 
 
+# The house's side of the casino over rolling windows, read from the hourly rollup.
+_HOUSE_EDGE_WINDOWS = [("Last 24 Hours", 24), ("Last 7 Days", 7 * 24), ("Last 30 Days", 30 * 24)]
+
+
+def _build_house_edge_html() -> str:
+    from lib.economy.casino_stats import house_edge
+    cards = []
+    for label, hours in _HOUSE_EDGE_WINDOWS:
+        try:
+            house = house_edge(hours)["all"]
+        except Exception:
+            logger.error("Could not read casino house edge for %sh", hours, exc_info=True)
+            house = {"edge": None, "house_net": 0, "rounds": 0}
+        edge = "N/A" if house["edge"] is None else f"{house['edge'] * 100:+.2f}%"
+        edge_class = ("growth-neutral" if not house["edge"] else
+                      "growth-positive" if house["edge"] > 0 else "growth-negative")
+        cards.append(
+            "<div class='stat-item'>"
+            f"<div class='stat-label'>{label}</div>"
+            f"<div class='stat-value {edge_class}'>{edge}</div>"
+            f"<div class='stat-sub'>{house['house_net']:+,} UKP over {house['rounds']:,} rounds</div>"
+            "</div>"
+        )
+    return "\n".join(cards)
+
+
 async def create_economy_stats_image(guild: discord.Guild, client: discord.Client) -> str:
     logger.info("[ECON DEBUG] create_economy_stats_image called")
     ukpence_data_current = load_ukpence_data()
@@ -165,6 +189,7 @@ async def create_economy_stats_image(guild: discord.Guild, client: discord.Clien
                 growth_class = "growth-negative"
 
     injections_html = _build_injections_html(get_daily_metrics(yesterday_str_key))
+    house_edge_html = _build_house_edge_html()
 
     biggest_earner_name, biggest_earner_amount, biggest_earner_change_class = "N/A", "N/A", "change-neutral"
     biggest_loser_name, biggest_loser_amount, biggest_loser_change_class = "N/A", "N/A", "change-neutral"
@@ -182,17 +207,20 @@ async def create_economy_stats_image(guild: discord.Guild, client: discord.Clien
         else: dist_brackets["100,001+ UKP"] += 1
         
     top_richest_html_parts = []
-    for i, (user_id_str, balance) in enumerate(top_5_richest):
-        member_display_name = f"User ID {user_id_str}"
-        avatar_url = "https://cdn.discordapp.com/embed/avatars/0.png"
-
-        if guild:
-            member = guild.get_member(int(user_id_str))
-            if member:
-                member_display_name = discord.utils.escape_markdown(member.display_name)
-                avatar_url = str(member.display_avatar.url)
+    top_richest_names, top_richest_avatar_urls = [], []
+    for user_id_str, _balance in top_5_richest:
+        member = guild.get_member(int(user_id_str)) if guild else None
+        if member:
+            top_richest_names.append(discord.utils.escape_markdown(member.display_name))
+            top_richest_avatar_urls.append(str(member.display_avatar.url))
+        else:
+            top_richest_names.append(f"User ID {user_id_str}")
+            top_richest_avatar_urls.append(DEFAULT_AVATAR)
+    top_richest_avatars = await avatar_uris(client, top_richest_avatar_urls)
 
-        avatar_data = await get_avatar_data_uri(client, avatar_url)
+    for i, (user_id_str, balance) in enumerate(top_5_richest):
+        member_display_name = top_richest_names[i]
+        avatar_data = top_richest_avatars[i]
 
         top_richest_html_parts.append(
             f"<div class='user-item'>"
@@ -235,6 +263,7 @@ async def create_economy_stats_image(guild: discord.Guild, client: discord.Clien
         yesterday_date=yesterday_dt.strftime("%d %B %Y"),
         
         injections_html=injections_html,
+        house_edge_html=house_edge_html,
 
         biggest_earner_name=discord.utils.escape_markdown(str(biggest_earner_name)),
         biggest_earner_amount=str(biggest_earner_amount),
@@ -256,4 +285,4 @@ async def create_economy_stats_image(guild: discord.Guild, client: discord.Clien
         net_ukpence_change_absolute_str=net_ukpence_change_absolute_str,
         net_ukpence_change_class=net_ukpence_change_class
     )
-    return await screenshot_html(formatted_html, size=(1050, 1600))
+    return await screenshot_html(formatted_html, size=(1050, 1800))
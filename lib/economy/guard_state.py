@@ -0,0 +1,169 @@
+"""In-memory economy guard state: what a casino stake is checked against.
+
+Accepting a stake used to cost several aggregate queries - two SUMs for the member's daily
+transfer allowance (``daily_transfer_used``) and a bank read for the dynamic max bet - on
+every blackjack hit, mines reveal and slots spin. The answers change only when money moves,
+and every move goes through a handful of committed paths, so they are kept here instead:
+
+* ``supply``   - total supply, the bank's own float included (reserve_policy.total_supply);
+* ``reserves`` - the bank's balance (its BOT_ID row);
+* ``outflow``  - per member, UKP moved to other members today (/pay plus wagers lost),
+                 exactly what ``daily_transfer_used`` counts.
+
+Loaded from SQL on first use (and again whenever the database connection is swapped), then
+moved by deltas the committed write paths report: ``UKPenceManager._finish_change`` for a
+member's balance, the BankManager entry points for the bank's, ``DatabaseManager.transfer``
+and ``record_game_transfer`` for outflow. A UK midnight empties the outflow map.
+
+Deltas are applied just after their commit, so a load racing a write can be off by that one
+write; anything that edits balances behind the managers' backs (scripts, raw SQL) isn't seen
+at all. ``reconcile()`` re-reads everything from SQL on a schedule, logs any drift and
+replaces the in-memory figures, which bounds both. Decisions that must be exact - the mint
+ceiling, which fails closed - still read SQL.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+# {"conn", "day", "until", "supply", "reserves", "outflow": {uid: int}}; "until" is the next
+# UK midnight, so the per-read day check is one float comparison.
+_state: dict | None = None
+
+
+def _uk_day_start(now: float = None) -> int:
+    from datetime import datetime
+    import pytz
+    uk = pytz.timezone("Europe/London")
+    moment = datetime.now(uk) if now is None else datetime.fromtimestamp(now, uk)
+    return int(moment.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+
+
+def _read_sql(day: int) -> dict:
+    """Every guard figure straight from the tables."""
+    from config import BOT_ID
+    from database import DatabaseManager
+    bank = str(BOT_ID)
+    from lib.economy.reserve_policy import total_supply
+    supply = total_supply()
+    row = DatabaseManager.fetch_one("SELECT balance FROM ukpence WHERE user_id = ?", (bank,))
+    reserves = int(row[0] or 0) if row else 0
+    outflow: dict[str, int] = {}
+    for uid, total in DatabaseManager.fetch_all(
+            "SELECT payer_id, SUM(amount) FROM pay_transfers "
+            "WHERE recipient_id != ? AND timestamp >= ? GROUP BY payer_id", (bank, day)) or []:
+        outflow[str(uid)] = outflow.get(str(uid), 0) + int(total or 0)
+    for uid, total in DatabaseManager.fetch_all(
+            "SELECT loser_id, SUM(amount) FROM game_transfers "
+            "WHERE timestamp >= ? GROUP BY loser_id", (day,)) or []:
+        outflow[str(uid)] = outflow.get(str(uid), 0) + int(total or 0)
+    return {"day": day, "until": _uk_day_start(day + 26 * 3600),
+            "supply": supply, "reserves": reserves, "outflow": outflow}
+
+
+def _roll_day(state: dict) -> None:
+    if time.time() >= state["until"]:
+        day = _uk_day_start()
+        state["day"], state["until"], state["outflow"] = day, _uk_day_start(day + 26 * 3600), {}
+
+
+def _current() -> dict:
+    """The live state, loading it if there is none for this connection. The SQL read runs
+    outside _lock so a writer reporting a delta never waits on it."""
+    global _state
+    from database import DatabaseManager
+    with _lock:
+        if _state is not None and _state["conn"] is DatabaseManager._connection:
+            _roll_day(_state)
+            return _state
+    fresh = _read_sql(_uk_day_start())
+    fresh["conn"] = DatabaseManager._connection
+    with _lock:
+        if _state is None or _state["conn"] is not fresh["conn"]:
+            _state = fresh
+        _roll_day(_state)
+        return _state
+
+
+# --- reads --------------------------------------------------------------------------------
+def supply() -> int:
+    return _current()["supply"]
+
+
+def reserves() -> int:
+    return _current()["reserves"]
+
+
+def outflow_today(user_id) -> int:
+    return _current()["outflow"].get(str(user_id), 0)
+
+
+def resets_at() -> int:
+    """When today's outflow resets: the next UK midnight."""
+    return _current()["until"]
+
+
+# --- deltas from committed writes ------------------------------------------------------------
+# Each is a no-op until something has read the state: a fresh load already includes them.
+def note_balance(user_id, delta: int) -> None:
+    """A member's (or the bank's own) ukpence row moved by ``delta``."""
+    from config import BOT_ID
+    if not delta:
+        return
+    with _lock:
+        if _state is None:
+            return
+        _state["supply"] += int(delta)
+        if str(user_id) == str(BOT_ID):
+            _state["reserves"] += int(delta)
+
+
+def note_bank(delta: int) -> None:
+    """The bank's balance moved by ``delta`` through a BankManager path."""
+    if not delta:
+        return
+    with _lock:
+        if _state is None:
+            return
+        _state["supply"] += int(delta)
+        _state["reserves"] += int(delta)
+
+
+def note_outflow(user_id, amount: int, ts: int) -> None:
+    """``user_id`` moved ``amount`` to another member at ``ts`` (/pay or a lost wager)."""
+    if amount <= 0:
+        return
+    with _lock:
+        if _state is None:
+            return
+        _roll_day(_state)
+        if ts >= _state["day"]:
+            uid = str(user_id)
+            _state["outflow"][uid] = _state["outflow"].get(uid, 0) + int(amount)
+
+
+def reconcile() -> dict:
+    """Re-read every figure from SQL and replace the in-memory ones. Returns what had
+    drifted, {name: (memory, sql)}, outflow entries keyed ``outflow:<uid>``."""
+    global _state
+    from database import DatabaseManager
+    fresh = _read_sql(_uk_day_start())
+    fresh["conn"] = DatabaseManager._connection
+    drift = {}
+    with _lock:
+        held = _state
+        if held is not None and held["conn"] is fresh["conn"] and held["day"] == fresh["day"]:
+            for name in ("supply", "reserves"):
+                if held[name] != fresh[name]:
+                    drift[name] = (held[name], fresh[name])
+            for uid in set(held["outflow"]) | set(fresh["outflow"]):
+                mine, actual = held["outflow"].get(uid, 0), fresh["outflow"].get(uid, 0)
+                if mine != actual:
+                    drift[f"outflow:{uid}"] = (mine, actual)
+        _state = fresh
+    if drift:
+        logger.warning("[ECONOMY] Guard state drifted from SQL, corrected: %s", drift)
+    return drift
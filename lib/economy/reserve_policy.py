@@ -42,12 +42,52 @@ def bank_reserves() -> int:
 
 
 def total_supply() -> int:
-    """Every UKP in existence, the bank's own float included."""
+    """Every UKP in existence, the bank's own float included.
+
+    Read from the economy_supply counter, which triggers on ukpence move in the same
+    transaction as each balance write - one row, not a scan. Falls back to the scan on a
+    database that has no counter yet (no table, or a table init_db hasn't seeded).
+    """
+    import sqlite3
     from database import DatabaseManager
-    row = DatabaseManager.fetch_one("SELECT SUM(balance) FROM ukpence")
+    try:
+        row = DatabaseManager.fetch_one("SELECT total FROM economy_supply WHERE id = 1")
+    except sqlite3.OperationalError:
+        row = None
+    if row is None:
+        row = DatabaseManager.fetch_one("SELECT SUM(balance) FROM ukpence")
     return int(row[0]) if row and row[0] is not None else 0
 
 
+def audit_total_supply() -> tuple[int, int]:
+    """Recompute SUM(balance) and check the supply counter against it. Returns
+    (counter, actual).
+
+    A counter that has drifted is alerted CRITICAL and reset to the real sum - only a write
+    that bypassed the triggers can cause it. Supply sitting off the closed-economy total is
+    a warning: the emergency mint is the one sanctioned way for it to move, and it logs its
+    own CRITICAL when it does.
+    """
+    from database import DatabaseManager
+    with DatabaseManager.transaction() as c:
+        c.execute("SELECT COALESCE(SUM(balance), 0) FROM ukpence")
+        actual = int(c.fetchone()[0])
+        c.execute("SELECT total FROM economy_supply WHERE id = 1")
+        row = c.fetchone()
+        counter = int(row[0]) if row else None
+        if counter != actual:
+            c.execute("INSERT OR REPLACE INTO economy_supply (id, total) VALUES (1, ?)", (actual,))
+    if counter != actual:
+        logger.critical("SUPPLY COUNTER DRIFT: counter said %s UKP, ukpence sums to %s (%+d). "
+                        "Reset to the real sum - something wrote balances around the triggers.",
+                        counter, actual, actual - (counter or 0))
+    closed = int(_cfg("ECONOMY_TOTAL_SUPPLY", 800_000))
+    if actual != closed:
+        logger.warning("[ECONOMY] Total supply is %s UKP, %+d off the closed-economy %s.",
+                       actual, actual - closed, closed)
+    return (counter if counter is not None else 0), actual
+
+
 def throttle_multiplier(reserves: int = None) -> float:
     """How much of a discretionary reward the bank will currently pay (0.25 - 1.0)."""
     if not _cfg("RESERVE_POLICY_ENABLED", True):
@@ -106,7 +146,8 @@ def max_casino_net_payout(static_max_net: int = 250_000) -> int:
     if not _cfg("DYNAMIC_MAX_BET_ENABLED", True):
         return static_max_net
     try:
-        reserves = bank_reserves()
+        from lib.economy import guard_state
+        reserves = guard_state.reserves()     # in memory: this runs on every stake
         if reserves <= 0:
             return 500
         pct = float(_cfg("MAX_EXPOSURE_PCT", 0.80))
@@ -125,7 +166,8 @@ def max_casino_bet(game_max_multiplier: float = 3.0, static_max: int = 250_000)
     if not _cfg("DYNAMIC_MAX_BET_ENABLED", True):
         return static_max
     try:
-        reserves = bank_reserves()
+        from lib.economy import guard_state
+        reserves = guard_state.reserves()     # in memory: this runs on every stake
         if reserves <= 0:
             return 100
         pct = float(_cfg("MAX_EXPOSURE_PCT", 0.80))
@@ -11,7 +11,7 @@ import discord
 from discord import Interaction
 
 import config
-from lib.core.file_operations import load_persistent_views, save_persistent_views
+from lib.core.persistent_views import PersistentViewRegistry
 from lib.features.counties import engine as E
 from lib.features.counties.data import COUNTIES, base_stats, match_county
 
@@ -148,15 +148,12 @@ class CountySpawnView(discord.ui.View):
 
 
 def _register_spawn(message_id: int, county_key: str, channel_id: int) -> None:
-    views = load_persistent_views()
-    views[str(message_id)] = {"type": "county", "county": county_key, "channel_id": channel_id}
-    save_persistent_views(views)
+    PersistentViewRegistry.put(message_id, {"type": "county", "county": county_key,
+                                            "channel_id": channel_id})
 
 
 def _unregister_spawn(message_id: int) -> None:
-    views = load_persistent_views()
-    if views.pop(str(message_id), None) is not None:
-        save_persistent_views(views)
+    PersistentViewRegistry.delete(message_id)
 
 
 async def _expire_previous(client, old: dict) -> None:
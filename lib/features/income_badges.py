@@ -1,13 +1,14 @@
 """Shared badge helpers for the economy features.
 
 Kept in its own module (importing only config + file_operations, and lazily importing
-award_badge_with_notify) so any feature can use it without circular imports.
+database and award_badge_with_notify) so any feature can use it without circular imports.
 """
 
 import logging
+import threading
 
 import config
-from lib.core.file_operations import load_json_file, save_json_file
+from lib.core.file_operations import load_json_file
 
 log = logging.getLogger(__name__)
 
@@ -22,25 +23,92 @@ async def award_badge_safe(client, user_id, badge_id):
         log.debug("badge award failed: %s -> %s", badge_id, user_id, exc_info=True)
 
 
+# Income sources as bits of one integer per user. Append only: the positions are what is
+# stored, so a source keeps its bit for good and new ones go on the end.
+INCOME_SOURCES = ("chat", "tree", "benefits", "bond", "casino", "welcome", "hof", "ticket",
+                  "crossword", "wordle")
+_SOURCE_BITS = {name: 1 << i for i, name in enumerate(INCOME_SOURCES)}
+JACK_OF_ALL_TRADES_SOURCES = 5
+
+_source_masks = None       # user id -> mask, loaded whole on first use
+_source_masks_conn = None  # writer connection it was loaded through (a new database reloads)
+_source_masks_lock = threading.Lock()
+
+
+def _masks():
+    global _source_masks, _source_masks_conn
+    from database import DatabaseManager
+    conn = DatabaseManager.get_connection()
+    if _source_masks is None or _source_masks_conn is not conn:
+        rows = DatabaseManager.fetch_all("SELECT user_id, mask FROM income_sources") or []
+        _source_masks, _source_masks_conn = {str(uid): int(mask) for uid, mask in rows}, conn
+    return _source_masks
+
+
+def add_income_source(user_id, source) -> tuple[bool, int]:
+    """Set ``source``'s bit for a user: (newly added, distinct sources now held). Only a new
+    bit is written, OR-ed into the row so concurrent writers can't lose one another's."""
+    from database import TelemetryQueue
+    bit = _SOURCE_BITS[source]
+    uid = str(user_id)
+    with _source_masks_lock:
+        masks = _masks()
+        mask = masks.get(uid, 0)
+        if mask & bit:
+            return False, mask.bit_count()
+        mask |= bit
+        masks[uid] = mask
+    TelemetryQueue.submit(
+        "INSERT INTO income_sources (user_id, mask) VALUES (?, ?) "
+        "ON CONFLICT(user_id) DO UPDATE SET mask = mask | excluded.mask", (uid, bit))
+    return True, mask.bit_count()
+
+
 async def record_income_source(client, user_id, source):
     """Track the distinct income sources a user has earned from; award 'jack_of_all_trades'
     once they hit 5. Sources are short keys like 'chat', 'tree', 'benefits', 'bond', 'casino'."""
     try:
-        store = load_json_file(config.EARNED_SOURCES_FILE) or {}
-        srcs = set(store.get(str(user_id), []))
-        if source not in srcs:
-            srcs.add(source)
-            store[str(user_id)] = sorted(srcs)
-            save_json_file(config.EARNED_SOURCES_FILE, store)
-        if len(srcs) >= 5:
+        from database import BadgeOwnership
+        _new, held = add_income_source(user_id, source)
+        if held >= JACK_OF_ALL_TRADES_SOURCES and not BadgeOwnership.owns(user_id, "jack_of_all_trades"):
             await award_badge_safe(client, user_id, "jack_of_all_trades")
     except Exception:
         log.debug("income source record failed", exc_info=True)
 
 
+def import_earned_sources_file() -> None:
+    """One-shot copy of the old earned_sources.json lists into the bitmask table, recorded
+    so it never runs twice. Source names no longer in INCOME_SOURCES are dropped."""
+    global _source_masks
+    from database import DatabaseManager
+    from lib.core import state_store
+
+    if state_store.was_imported("income_sources"):
+        return
+    rows, dropped = [], set()
+    for uid, sources in (load_json_file(config.EARNED_SOURCES_FILE) or {}).items():
+        mask = 0
+        for source in sources or ():
+            if source in _SOURCE_BITS:
+                mask |= _SOURCE_BITS[source]
+            else:
+                dropped.add(source)
+        if mask:
+            rows.append((str(uid), mask))
+    with DatabaseManager.transaction() as c:
+        c.executemany(
+            "INSERT INTO income_sources (user_id, mask) VALUES (?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET mask = mask | excluded.mask", rows)
+        state_store.mark_imported_in_transaction(c, "income_sources", config.EARNED_SOURCES_FILE, len(rows))
+    with _source_masks_lock:
+        _source_masks = None
+    print(f"[db] Imported income sources for {len(rows)} users"
+          + (f" (dropped unknown: {', '.join(sorted(dropped))})" if dropped else ""))
+
+
 def bump_daily_income(source_key, amount):
     """Add `amount` to today's (UK) running total for an income source in the persistent
-    economy metrics file, so /ukpeconomy's 'Recent Injections' board can report it.
+    economy metrics, so /ukpeconomy's 'Recent Injections' board can report it.
     economy_transactions is a drained queue, so we aggregate here instead. Best-effort."""
     try:
         import pytz
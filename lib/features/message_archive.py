@@ -20,7 +20,7 @@ import discord
 import pytz
 
 from config import CHANNELS
-from database import DatabaseManager
+from database import DatabaseManager, TelemetryQueue
 
 log = logging.getLogger(__name__)
 
@@ -31,10 +31,11 @@ _UK = pytz.timezone("Europe/London")
 
 
 def archive_message(message) -> None:
-    """Store one user message. Cheap single INSERT; called from on_message."""
+    """Store one user message. Queued for the next telemetry group commit; called from
+    on_message."""
     try:
         attachments = json.dumps([a.url for a in message.attachments]) if message.attachments else None
-        DatabaseManager.execute(
+        TelemetryQueue.submit(
             "INSERT OR REPLACE INTO message_archive (message_id, channel_id, user_id, content, attachments, ts) "
             "VALUES (?, ?, ?, ?, ?, ?)",
             (str(message.id), str(message.channel.id), str(message.author.id),
@@ -62,6 +63,7 @@ def fetch_archived(message_ids):
     ids = [str(m) for m in message_ids]
     if not ids:
         return []
+    TelemetryQueue.flush()                  # messages archived in the last moment too
     rows = []
     for i in range(0, len(ids), 500):       # chunk to stay under SQLite's param limit
         chunk = ids[i:i + 500]
@@ -6,8 +6,9 @@ dragon souls and shout words. Discord rendering lives in views.py; this module i
 pure logic so the balance sim (scratch/skyrim_balance.py) can drive it headless.
 
 Persistence:
-  • Profiles: config.SKYRIM_PROFILES_FILE, keyed by str(user_id). Read-modify-write
-    per action on the single event loop (same pattern as HMS Wordle's state file).
+  • Profiles: config.SKYRIM_PROFILES_FILE, keyed by str(user_id) - one state-store row
+    per profile, so saving one character never rewrites the others. Read-modify-write
+    per action on the single event loop.
   • Active delves: the shared persistent-views file, keyed by message id with
     type="skyrim", so buttons resume across restarts like the other games.
 
@@ -25,8 +26,9 @@ import pytz
 
 import config
 from lib.core.file_operations import (
-    load_json_file, save_json_file, load_persistent_views, save_persistent_views,
+    load_json_file, save_json_file, load_json_key, save_json_key,
 )
+from lib.core.persistent_views import PersistentViewRegistry
 from lib.features.skyrim import data as D
 
 logger = logging.getLogger(__name__)
@@ -411,7 +413,7 @@ def _migrate(profile: dict) -> dict:
 
 
 def get_profile(user_id) -> dict | None:
-    p = _profiles().get(str(user_id))
+    p = load_json_key(config.SKYRIM_PROFILES_FILE, str(user_id))
     if p is None:
         return None
     # One-time shape upgrades must PERSIST on first touch. The stamina conversion in
@@ -426,9 +428,7 @@ def get_profile(user_id) -> dict | None:
 
 
 def save_profile(profile: dict):
-    store = _profiles()
-    store[str(profile["user_id"])] = profile
-    save_json_file(config.SKYRIM_PROFILES_FILE, store)
+    save_json_key(config.SKYRIM_PROFILES_FILE, str(profile["user_id"]), profile)
 
 
 def all_profiles() -> dict:
@@ -1229,31 +1229,24 @@ def spend_stamina(profile):
 def save_delve(delve: "Delve"):
     if delve.message_id is None or delve.state != "playing":
         return
-    views = load_persistent_views()
-    views[str(delve.message_id)] = delve.to_dict()
-    save_persistent_views(views)
+    PersistentViewRegistry.put(delve.message_id, delve.to_dict())
 
 
 def save_pit_board(message_id, profile):
     """Register a PUBLIC Pit board for restart reattachment (same registry as the
     delve boards; remove with delete_delve)."""
-    views = load_persistent_views()
-    views[str(message_id)] = {"type": "skyrim", "pit": True,
-                              "user_id": int(profile["user_id"])}
-    save_persistent_views(views)
+    PersistentViewRegistry.put(message_id, {"type": "skyrim", "pit": True,
+                                            "user_id": int(profile["user_id"])})
 
 
 def delete_delve(message_id):
     if message_id is None:
         return
-    views = load_persistent_views()
-    if str(message_id) in views:
-        del views[str(message_id)]
-        save_persistent_views(views)
+    PersistentViewRegistry.delete(message_id)
 
 
 def load_delve(message_id) -> "Delve | None":
-    entry = load_persistent_views().get(str(message_id))
+    entry = PersistentViewRegistry.get(message_id)
     if isinstance(entry, dict) and entry.get("type") == "skyrim":
         try:
             return Delve.from_dict(entry)
@@ -3157,10 +3150,8 @@ def rivalry_lines(profile) -> list:
 
 def save_duel_board(message_id, profile):
     """Register a PUBLIC duel board for restart reattachment."""
-    views = load_persistent_views()
-    views[str(message_id)] = {"type": "skyrim", "duel": True,
-                              "user_id": int(profile["user_id"])}
-    save_persistent_views(views)
+    PersistentViewRegistry.put(message_id, {"type": "skyrim", "duel": True,
+                                            "user_id": int(profile["user_id"])})
 
 
 def start_soulcairn(profile, channel_id) -> Delve:
@@ -1,15 +1,17 @@
 import os
 import re
+import copy
 import json
 import shutil
 import logging
+import threading
 from datetime import datetime, timedelta
 import discord
 import pytz
 from lib.features.summary_html import create_summary_image
 from lib.core.gemini import gemini_generate
 from config import *
-from database import DatabaseManager
+from database import DatabaseManager, SUMMARY_SCALARS, write_summary_day
 from lib.core.file_operations import atomic_write_json
 
 log = logging.getLogger(__name__)
@@ -185,27 +187,69 @@ async def _generate_summary_narrative(
 SUMMARY_DATA_FILE = "daily_summaries/daily_summary_{date}.json"
 SUMMARY_BACKUP_DATA_FILE = "daily_summaries/daily_summary_{date}_{time}.bak.json"
 
+# Keys holding a per-channel / per-member dict of counts rather than a single number.
+_NESTED_KEYS = ("messages", "active_members", "reacting_members")
 
-def get_file_path():
-    uk_timezone = pytz.timezone("Europe/London")
-    date = datetime.now(uk_timezone).strftime("%Y-%m-%d")
-    file_path = SUMMARY_DATA_FILE.format(date=date)
+# Write-behind cache for the daily counters. Every message and reaction used to reload the
+# whole day's blob, bump one number and write it straight back (plus the legacy file), which
+# made this the busiest writer on the DB lock. Increments now land in the in-memory copy of
+# the day and flush_summary_data() persists each changed day once per interval and at
+# shutdown. Every read goes through the cache first, so nothing ever sees a stale count.
+_DAYS = {}               # date -> that day's summary dict (the live copy)
+_DIRTY = set()           # dates changed since the last flush
+_DAYS_LOCK = threading.Lock()
 
-    return file_path
 
+def _today():
+    return datetime.now(pytz.timezone("Europe/London")).strftime("%Y-%m-%d")
 
-def load_summary_data(date=None):
-    uk_timezone = pytz.timezone("Europe/London")
-    if date is None:
-        date = datetime.now(uk_timezone).strftime("%Y-%m-%d")
 
-    # Try database first
-    db_data = DatabaseManager.fetch_one("SELECT data FROM daily_summaries WHERE date = ?", (date,))
-    if db_data:
-        try:
-            return json.loads(db_data[0])
-        except json.JSONDecodeError:
-            print(f"Failed to decode summary data from database for {date}")
+def _empty_summary():
+    return {
+        "total_members": 0,
+        "members_joined": 0,
+        "members_left": 0,
+        "members_banned": 0,
+        "messages": {},
+        "total_messages": 0,
+        "reactions_added": 0,
+        "reactions_removed": 0,
+        "deleted_messages": 0,
+        "boosters_gained": 0,
+        "boosters_lost": 0,
+        "active_members": {},
+        "reacting_members": {},
+    }
+
+
+def get_file_path():
+    return SUMMARY_DATA_FILE.format(date=_today())
+
+
+def _write_stored(date, data):
+    """Persist one whole day: the normalised rows, and the legacy file if its folder exists."""
+    with DatabaseManager.transaction() as c:
+        write_summary_day(c, date, data)
+    # Legacy: Still write to JSON for now if folder exists
+    if os.path.exists("daily_summaries"):
+        atomic_write_json(SUMMARY_DATA_FILE.format(date=date), data)
+
+
+def _read_stored(date):
+    """The day as last persisted, or None. Ignores the write-behind cache."""
+    row = DatabaseManager.fetch_one(
+        f"SELECT {', '.join(SUMMARY_SCALARS)} FROM summary_days WHERE date = ?", (date,))
+    if row:
+        data = dict(zip(SUMMARY_SCALARS, row))
+        data["messages"] = {
+            cid: n for cid, n in DatabaseManager.fetch_all(
+                "SELECT channel_id, messages FROM summary_channel_days WHERE date = ?", (date,))
+        }
+        members = DatabaseManager.fetch_all(
+            "SELECT user_id, messages, reactions FROM summary_member_days WHERE date = ?", (date,))
+        data["active_members"] = {uid: m for uid, m, _ in members if m > 0}
+        data["reacting_members"] = {uid: r for uid, _, r in members if r > 0}
+        return data
 
     # Fallback/Migration: Try JSON file
     file_path = SUMMARY_DATA_FILE.format(date=date)
@@ -214,145 +258,200 @@ def load_summary_data(date=None):
             try:
                 data = json.load(file)
                 # Migrate to database
-                DatabaseManager.execute(
-                    "INSERT OR REPLACE INTO daily_summaries (date, data) VALUES (?, ?)",
-                    (date, json.dumps(data))
-                )
+                with DatabaseManager.transaction() as c:
+                    write_summary_day(c, date, data)
                 return data
             except Exception as e:
                 print(f"Failed to load/migrate summary data from JSON for {date}: {e}")
+    return None
+
+
+def load_summary_data(date=None):
+    if date is None:
+        date = _today()
+
+    with _DAYS_LOCK:
+        cached = _DAYS.get(date)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+    stored = _read_stored(date)
+    if stored is not None:
+        return stored
 
     # If both fail, initialize new data (only for today)
-    current_date = datetime.now(uk_timezone).strftime("%Y-%m-%d")
-    if date == current_date:
+    if date == _today():
         initialize_summary_data(True)
         # Attempt to reload once after initialization
-        db_data = DatabaseManager.fetch_one("SELECT data FROM daily_summaries WHERE date = ?", (date,))
-        if db_data:
-            return json.loads(db_data[0])
+        with _DAYS_LOCK:
+            if date in _DAYS:
+                return copy.deepcopy(_DAYS[date])
 
     return {}
 
 
 def initialize_summary_data(force_init=False):
-    uk_timezone = pytz.timezone("Europe/London")
-    date = datetime.now(uk_timezone).strftime("%Y-%m-%d")
+    """Make sure today's summary exists and is resident in the write-behind cache.
+
+    Called ahead of every counter bump, so once today is cached this is a dict lookup -
+    the database is only consulted the first time each day is touched.
+    """
+    date = _today()
+    with _DAYS_LOCK:
+        if date in _DAYS and not force_init:
+            return
 
     # Check database
-    exists = DatabaseManager.fetch_one("SELECT 1 FROM daily_summaries WHERE date = ?", (date,))
+    exists = DatabaseManager.fetch_one("SELECT 1 FROM summary_days WHERE date = ?", (date,))
 
     if not exists or force_init:
-        initial_data = {
-            "total_members": 0,
-            "members_joined": 0,
-            "members_left": 0,
-            "members_banned": 0,
-            "messages": {},
-            "total_messages": 0,
-            "reactions_added": 0,
-            "reactions_removed": 0,
-            "deleted_messages": 0,
-            "boosters_gained": 0,
-            "boosters_lost": 0,
-            "active_members": {},
-            "reacting_members": {},
-        }
-        DatabaseManager.execute(
-            "INSERT OR REPLACE INTO daily_summaries (date, data) VALUES (?, ?)",
-            (date, json.dumps(initial_data))
-        )
-        # Still write to JSON for legacy/backup purposes if folder exists
-        if os.path.exists("daily_summaries"):
-            file_path = SUMMARY_DATA_FILE.format(date=date)
-            atomic_write_json(file_path, initial_data)
+        data = _empty_summary()
+        _write_stored(date, data)
     else:
-        # Maintenance: ensure total_messages exists (sanity check)
-        data = load_summary_data(date)
-        if "total_messages" not in data:
-            data["total_messages"] = 0
-            DatabaseManager.execute(
-                "UPDATE daily_summaries SET data = ? WHERE date = ?",
-                (json.dumps(data), date)
-            )
+        data = _read_stored(date) or _empty_summary()
 
+    with _DAYS_LOCK:
+        if force_init:
+            _DAYS[date] = data
+            _DIRTY.discard(date)
+        else:
+            _DAYS.setdefault(date, data)
 
-def update_summary_data(key, channel_id=None, user_id=None, remove=False):
-    uk_timezone = pytz.timezone("Europe/London")
-    date = datetime.now(uk_timezone).strftime("%Y-%m-%d")
-    data = load_summary_data(date)
-
-    if key == "messages" and channel_id:
-        if str(channel_id) not in data["messages"]:
-            data["messages"][str(channel_id)] = 0
-        data["messages"][str(channel_id)] += 1
-        data["total_messages"] += 1
-    elif key == "active_members" and user_id:
-        if str(user_id) not in data["active_members"]:
-            data["active_members"][str(user_id)] = 0
-        data["active_members"][str(user_id)] += 1
-    elif key == "reacting_members" and user_id:
-        if str(user_id) not in data["reacting_members"]:
-            data["reacting_members"][str(user_id)] = 0
-        data["reacting_members"][str(user_id)] += 1 if not remove else -1
-        if data["reacting_members"][str(user_id)] <= 0:
-            del data["reacting_members"][str(user_id)]
-    else:
-        data[key] += 1
-
-    # Save to database
-    DatabaseManager.execute(
-        "UPDATE daily_summaries SET data = ? WHERE date = ?",
-        (json.dumps(data), date)
-    )
 
-    # Legacy: Still write to JSON for now if folder exists
-    if os.path.exists("daily_summaries"):
-        file_path = SUMMARY_DATA_FILE.format(date=date)
-        atomic_write_json(file_path, data)
+def update_summary_data(key, channel_id=None, user_id=None, remove=False):
+    date = _today()
+    with _DAYS_LOCK:
+        resident = date in _DAYS
+    if not resident:
+        initialize_summary_data()
+
+    with _DAYS_LOCK:
+        data = _DAYS.setdefault(date, _empty_summary())
+        if key == "messages" and channel_id:
+            if str(channel_id) not in data["messages"]:
+                data["messages"][str(channel_id)] = 0
+            data["messages"][str(channel_id)] += 1
+            data["total_messages"] += 1
+        elif key == "active_members" and user_id:
+            if str(user_id) not in data["active_members"]:
+                data["active_members"][str(user_id)] = 0
+            data["active_members"][str(user_id)] += 1
+        elif key == "reacting_members" and user_id:
+            if str(user_id) not in data["reacting_members"]:
+                data["reacting_members"][str(user_id)] = 0
+            data["reacting_members"][str(user_id)] += 1 if not remove else -1
+            if data["reacting_members"][str(user_id)] <= 0:
+                del data["reacting_members"][str(user_id)]
+        else:
+            data[key] += 1
+        _DIRTY.add(date)
+
+
+def set_summary_value(date, key, value):
+    """Overwrite one scalar on a day's summary, through the cache if the day is resident."""
+    with _DAYS_LOCK:
+        if date in _DAYS:
+            _DAYS[date][key] = value
+            _DIRTY.add(date)
+            return
+    data = _read_stored(date)
+    if data is None:
+        return
+    data[key] = value
+    _write_stored(date, data)
+
+
+def flush_summary_data():
+    """Persist every day changed since the last flush - one row write per day.
+
+    Run on a short interval, before the midnight jobs read yesterday's figures, and at
+    shutdown. Finished days are dropped from the cache once they are clean, so only today
+    stays resident. A day whose write fails stays dirty and is retried on the next flush.
+    Returns how many days were written.
+    """
+    today = _today()
+    with _DAYS_LOCK:
+        pending = {date: copy.deepcopy(_DAYS[date]) for date in _DIRTY if date in _DAYS}
+        _DIRTY.clear()
+        for date in list(_DAYS):
+            if date != today and date not in pending:
+                del _DAYS[date]
+
+    written = 0
+    for date, data in pending.items():
+        try:
+            _write_stored(date, data)
+            written += 1
+        except Exception:
+            log.error("Failed to flush summary counters for %s", date, exc_info=True)
+            with _DAYS_LOCK:
+                _DIRTY.add(date)
+    return written
 
 
 def aggregate_summaries(start_date, end_date):
-    aggregated_data = {
-        "total_members": 0,
-        "members_joined": 0,
-        "members_left": 0,
-        "members_banned": 0,
-        "messages": {},
-        "total_messages": 0,
-        "reactions_added": 0,
-        "reactions_removed": 0,
-        "deleted_messages": 0,
-        "boosters_gained": 0,
-        "boosters_lost": 0,
-        "active_members": {},
-        "reacting_members": {},
-    }
+    """Sum a date range (inclusive) into one summary dict.
+
+    The stored days are aggregated in SQL over the date-leading primary keys; days still
+    resident in the write-behind cache are newer than their stored rows, so they are
+    excluded from the queries and added from memory instead.
+    """
+    aggregated_data = _empty_summary()
     
     start_str = start_date.strftime("%Y-%m-%d")
     end_str = end_date.strftime("%Y-%m-%d")
-    
-    # Efficiently fetch all days in the range in one go
-    rows = DatabaseManager.fetch_all(
-        "SELECT data FROM daily_summaries WHERE date BETWEEN ? AND ? ORDER BY date ASC",
-        (start_str, end_str)
-    )
-    
-    for row in rows:
-        try:
-            daily_data = json.loads(row[0])
-            for key in aggregated_data.keys():
-                if key in ["messages", "active_members", "reacting_members"]:
-                    for sub_key, count in daily_data.get(key, {}).items():
-                        if sub_key not in aggregated_data[key]:
-                            aggregated_data[key][sub_key] = 0
-                        aggregated_data[key][sub_key] += count
-                elif key == "total_members":
-                    # For total members, we take the value from the last day in the range
+
+    with _DAYS_LOCK:
+        cached = {
+            date: copy.deepcopy(data) for date, data in _DAYS.items()
+            if start_str <= date <= end_str
+        }
+    where = "date BETWEEN ? AND ?"
+    params = (start_str, end_str)
+    if cached:
+        where += f" AND date NOT IN ({','.join('?' * len(cached))})"
+        params += tuple(cached)
+
+    summed = [key for key in SUMMARY_SCALARS if key != "total_members"]
+    totals = DatabaseManager.fetch_one(
+        f"SELECT {', '.join(f'COALESCE(SUM({key}), 0)' for key in summed)} "
+        f"FROM summary_days WHERE {where}", params)
+    for key, value in zip(summed, totals or ()):
+        aggregated_data[key] = value
+    # For total members, we take the value from the last day in the range
+    last_day = DatabaseManager.fetch_one(
+        f"SELECT date, total_members FROM summary_days WHERE {where} "
+        f"ORDER BY date DESC LIMIT 1", params)
+    last_date = last_day[0] if last_day else ""
+    if last_day:
+        aggregated_data["total_members"] = last_day[1]
+
+    for cid, n in DatabaseManager.fetch_all(
+            f"SELECT channel_id, SUM(messages) FROM summary_channel_days "
+            f"WHERE {where} GROUP BY channel_id", params):
+        if n:
+            aggregated_data["messages"][cid] = n
+    for uid, m, r in DatabaseManager.fetch_all(
+            f"SELECT user_id, SUM(messages), SUM(reactions) FROM summary_member_days "
+            f"WHERE {where} GROUP BY user_id", params):
+        if m > 0:
+            aggregated_data["active_members"][uid] = m
+        if r > 0:
+            aggregated_data["reacting_members"][uid] = r
+
+    for date in sorted(cached):
+        daily_data = cached[date]
+        for key in aggregated_data.keys():
+            if key in _NESTED_KEYS:
+                for sub_key, count in daily_data.get(key, {}).items():
+                    if sub_key not in aggregated_data[key]:
+                        aggregated_data[key][sub_key] = 0
+                    aggregated_data[key][sub_key] += count
+            elif key == "total_members":
+                if date > last_date:
                     aggregated_data["total_members"] = daily_data.get("total_members", 0)
-                else:
-                    aggregated_data[key] += daily_data.get(key, 0)
-        except json.JSONDecodeError:
-            continue
+            else:
+                aggregated_data[key] += daily_data.get(key, 0)
             
     return aggregated_data
 
@@ -564,13 +663,5 @@ async def post_summary(
             file=discord.File(image_buffer, filename=f"{frequency}_summary.png"),
         )
         if frequency == "daily":
-            data["total_members"] = total_members
-            # Save final total_members update to DB
-            DatabaseManager.execute(
-                "UPDATE daily_summaries SET data = ? WHERE date = ?",
-                (json.dumps(data), date)
-            )
-            # Legacy fallback
-            if os.path.exists("daily_summaries"):
-                file_path = SUMMARY_DATA_FILE.format(date=date)
-                atomic_write_json(file_path, data)
+            # Save final total_members update (through the cache if the day is still live)
+            set_summary_value(date, "total_members", total_members)
@@ -709,13 +709,9 @@ async def _welcome_first_time_dm(client, welcomer_id, amount: int, reason: str)
     greeting on its own paid nothing.
     """
     try:
-        src_store = load_json_file(config.EARNED_SOURCES_FILE) or {}
-        srcs = set(src_store.get(str(welcomer_id), []))
-        if "welcome" in srcs:
+        from lib.features.income_badges import add_income_source
+        if not add_income_source(welcomer_id, "welcome")[0]:
             return
-        srcs.add("welcome")
-        src_store[str(welcomer_id)] = sorted(srcs)
-        save_json_file(config.EARNED_SOURCES_FILE, src_store)
     except Exception:
         log.debug("welcome first-time check failed", exc_info=True)
         return
@@ -1099,8 +1095,8 @@ def _benefits_stats(uid, amount) -> dict:
     s = {}
     try:
         rows = DatabaseManager.fetch_all(
-            "SELECT game, COUNT(*) n, SUM(net) net, SUM(CASE WHEN net > 0 THEN 1 ELSE 0 END) w "
-            "FROM casino_results WHERE user_id = ? GROUP BY game", (str(uid),)) or []
+            "SELECT game, SUM(rounds), SUM(net), SUM(wins) "
+            "FROM casino_user_daily WHERE user_id = ? GROUP BY game", (str(uid),)) or []
         games = sum(r[1] for r in rows)
         net = sum(r[2] or 0 for r in rows)
         wins = sum(r[3] or 0 for r in rows)
@@ -1118,7 +1114,8 @@ def _benefits_stats(uid, amount) -> dict:
             lost = s.get("casino_lost") if key == "casino" else s.get(f"{key}_lost")
             s[f"pct_of_{key}"] = f"{amount / lost * 100:.2f}" if lost else None
         row = DatabaseManager.fetch_one(
-            "SELECT MIN(net), MAX(net) FROM casino_results WHERE user_id = ?", (str(uid),))
+            "SELECT MIN(min_net), MAX(max_net) FROM casino_user_daily WHERE user_id = ?",
+            (str(uid),))
         if row:
             s["worst_loss"] = -row[0] if row[0] and row[0] < 0 else None
             s["best_win"] = row[1] if row[1] and row[1] > 0 else None
@@ -4,12 +4,16 @@ import random
 import io
 import asyncio
 import logging
-from database import DatabaseManager
+import threading
+from bisect import bisect_left, insort
+from database import DatabaseManager, AsyncDatabaseManager, TelemetryQueue
 from config import *
 from lib.core.constants import CHAT_LEVEL_ROLE_THRESHOLDS, CUSTOM_RANK_BACKGROUNDS
 from lib.economy.economy_manager import get_bb, add_bb
 from lib.economy.bank_manager import BankManager
-from lib.core.image_processing import screenshot_html, get_avatar_data_uri, encode_image_to_data_uri
+from lib.core.image_processing import screenshot_html, encode_image_to_data_uri
+from lib.core.avatars import DEFAULT_AVATAR, avatar_uris
+from lib.core.assets import LEADERBOARD_ROW
 import os
 from lib.core.file_operations import read_html_template
 
@@ -18,33 +22,134 @@ logger = logging.getLogger(__name__)
 # Channels where chatting earns no XP/UKP (keeps the rank ladder meaningful).
 XP_EXCLUDED_CHANNELS = {CHANNELS.BOT_SPAM}
 
+
+class RankIndex:
+    """XP ranking of current guild members, kept sorted in memory.
+
+    /rank and the leaderboard used to pull every row of ``xp`` in XP order and scan it
+    against a set of member ids - per card, per page, on a 12k-member guild. This holds
+    ``(-xp, user_id)`` for current members in a sorted list instead, so a rank is a bisect
+    and a page is a slice. It is built from the table on first use, then kept current by
+    update_xp (set_xp) and the member join/leave handlers; if the guild's member cache
+    disagrees with it in size (members still chunking in after boot, say) the membership
+    is re-read from the guild.
+
+    Ties sort by user id, where the old ``ORDER BY xp DESC`` left them in table order.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._xp: dict[str, int] | None = None     # every row of xp, members or not
+        self._members: set[int] = set()
+        self._keys: list[tuple[int, str]] = []     # (-xp, user_id), members only, ascending
+
+    def _ensure(self, guild) -> None:
+        """Load the table once and make sure membership matches ``guild``. Caller holds _lock."""
+        if self._xp is None:
+            TelemetryQueue.flush()                   # queued XP gains land before the read
+            rows = DatabaseManager.fetch_all("SELECT user_id, xp FROM xp") or []
+            self._xp = {str(uid): int(xp or 0) for uid, xp in rows}
+            self._members = set()
+        if guild is not None and len(guild.members) != len(self._members):
+            self._members = {m.id for m in guild.members}
+            self._keys = sorted((-xp, uid) for uid, xp in self._xp.items()
+                                if int(uid) in self._members)
+
+    def _drop_key(self, uid: str) -> None:
+        old = self._xp.get(uid)
+        if old is None:
+            return
+        i = bisect_left(self._keys, (-old, uid))
+        if i < len(self._keys) and self._keys[i] == (-old, uid):
+            del self._keys[i]
+
+    def set_xp(self, user_id, xp: int) -> None:
+        """Record a user's new XP total (write-through from update_xp)."""
+        with self._lock:
+            if self._xp is None:
+                return                               # not built yet; it'll read the table
+            uid = str(user_id)
+            if int(uid) in self._members:
+                self._drop_key(uid)
+                insort(self._keys, (-int(xp), uid))
+            self._xp[uid] = int(xp)
+
+    def member_joined(self, member_id: int) -> None:
+        with self._lock:
+            if self._xp is None or member_id in self._members:
+                return
+            self._members.add(member_id)
+            uid = str(member_id)
+            if uid in self._xp:
+                insort(self._keys, (-self._xp[uid], uid))
+
+    def member_left(self, member_id: int) -> None:
+        with self._lock:
+            if self._xp is None or member_id not in self._members:
+                return
+            self._drop_key(str(member_id))
+            self._members.discard(member_id)
+
+    def rank_of(self, user_id, guild):
+        """(1-based rank among members or None, xp) - None when not a ranked member."""
+        with self._lock:
+            self._ensure(guild)
+            uid = str(user_id)
+            xp = self._xp.get(uid)
+            if xp is None:
+                return None, 0
+            i = bisect_left(self._keys, (-xp, uid))
+            if i < len(self._keys) and self._keys[i] == (-xp, uid):
+                return i + 1, xp
+            return None, xp
+
+    def page(self, guild, offset: int, limit: int) -> list:
+        """``[(user_id, xp)]`` for ranks offset+1 .. offset+limit."""
+        with self._lock:
+            self._ensure(guild)
+            return [(uid, -neg) for neg, uid in self._keys[offset:offset + limit]]
+
+    def count(self, guild) -> int:
+        with self._lock:
+            self._ensure(guild)
+            return len(self._keys)
+
+
+rank_index = RankIndex()
+
+# user_id -> (xp, last_xp_time), the write-through copy of the xp table update_xp works from.
+# Warmed one user at a time on their first message and written before every granted gain, so
+# a message inside its 120s cooldown - most of them, in a busy channel - is turned away without
+# touching the database. update_xp is the table's only writer, so it never goes stale.
+_xp_rows: dict[str, tuple[int, float]] = {}
+
 class LeaderboardView(discord.ui.View):
     PAGE_SIZE = 20
 
-    def __init__(self, xp_system, guild, sorted_data):
+    def __init__(self, xp_system, guild):
         super().__init__(timeout=None)
         self.xp_system = xp_system
         self.guild = guild
-        self.sorted_data = sorted_data
         self.offset = 0
         self.image_cache = {}
         self.previous_button.disabled = True
-        self.next_button.disabled = (len(self.sorted_data) <= self.PAGE_SIZE)
+        self.next_button.disabled = (rank_index.count(guild) <= self.PAGE_SIZE)
 
-    def get_slice(self):
-        return self.sorted_data[self.offset : self.offset + self.PAGE_SIZE]
+    def get_slice(self, offset=None):
+        """One page of the rank index - a slice of PAGE_SIZE rows, never the whole ladder."""
+        return rank_index.page(self.guild, self.offset if offset is None else offset, self.PAGE_SIZE)
 
     async def _get_or_generate_image(self):
         next_off = self.offset + self.PAGE_SIZE
-        if next_off < len(self.sorted_data) and next_off not in self.image_cache:
+        if next_off < rank_index.count(self.guild) and next_off not in self.image_cache:
             self.image_cache[next_off] = asyncio.create_task(
-                self.xp_system.generate_leaderboard_image(self.guild, self.sorted_data[next_off : next_off + self.PAGE_SIZE], next_off)
+                self.xp_system.generate_leaderboard_image(self.guild, self.get_slice(next_off), next_off)
             )
 
         prev_off = self.offset - self.PAGE_SIZE
         if prev_off >= 0 and prev_off not in self.image_cache:
             self.image_cache[prev_off] = asyncio.create_task(
-                self.xp_system.generate_leaderboard_image(self.guild, self.sorted_data[prev_off : prev_off + self.PAGE_SIZE], prev_off)
+                self.xp_system.generate_leaderboard_image(self.guild, self.get_slice(prev_off), prev_off)
             )
 
         if self.offset not in self.image_cache:
@@ -81,9 +186,10 @@ class LeaderboardView(discord.ui.View):
             logger.warning(f"Pagination defer failed: {e}")
             return
 
-        self.offset = max(0, min(new_offset, max(0, len(self.sorted_data) - self.PAGE_SIZE)))
+        total = rank_index.count(self.guild)
+        self.offset = max(0, min(new_offset, max(0, total - self.PAGE_SIZE)))
         self.previous_button.disabled = (self.offset == 0)
-        self.next_button.disabled = (self.offset + self.PAGE_SIZE >= len(self.sorted_data))
+        self.next_button.disabled = (self.offset + self.PAGE_SIZE >= total)
         try:
             file = await self._get_or_generate_image()
             await interaction.edit_original_response(attachments=[file], view=self)
@@ -210,15 +316,27 @@ class XPSystem:
         user_id = str(message.author.id)
         now = time.time()
 
-        result = DatabaseManager.fetch_one("SELECT xp, last_xp_time FROM xp WHERE user_id = ?", (user_id,))
-        
-        current_xp = result[0] if result else 0
-        last_xp_time = result[1] if result else 0
+        row = _xp_rows.get(user_id)
+        if row is None:
+            result = await AsyncDatabaseManager.fetch_one("SELECT xp, last_xp_time FROM xp WHERE user_id = ?", (user_id,))
+            # Another message may have warmed (or claimed) this user while we read.
+            row = _xp_rows.setdefault(user_id, (result[0], result[1]) if result else (0, 0))
+
+        current_xp, last_xp_time = row
 
         if (now - last_xp_time) >= 120:
             gain = random.randint(10, 20)
             new_xp = current_xp + gain
-            DatabaseManager.execute("INSERT OR REPLACE INTO xp (user_id, xp, last_xp_time) VALUES (?, ?, ?)", (user_id, new_xp, now))
+            # Claim the cooldown in memory before anything awaits, so the next message sees it.
+            _xp_rows[user_id] = (new_xp, now)
+            # Queued for the telemetry group commit. The cooldown is also re-checked in SQL,
+            # as a backstop should the table ever be written behind the cache's back.
+            TelemetryQueue.submit(
+                "INSERT INTO xp (user_id, xp, last_xp_time) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET xp = xp.xp + ?, last_xp_time = excluded.last_xp_time "
+                "WHERE excluded.last_xp_time - xp.last_xp_time >= 120",
+                (user_id, new_xp, now, gain))
+            rank_index.set_xp(user_id, new_xp)
             
             # Award UKP on a separate 10-min cooldown with wealth-based scaling.
             # Probability tapers to 0 at 10k UKP balance: rich users earn nothing from chat.
@@ -231,14 +349,14 @@ class XPSystem:
             # stopping it dead.
             last_ukp = self._last_ukp_award.get(user_id, 0)
             if (now - last_ukp) >= self.UKP_COOLDOWN:
-                balance = get_bb(int(user_id))
+                balance = await AsyncDatabaseManager.run_read(get_bb, int(user_id))
                 if balance >= 10000:
                     reward_chance = 0.0
                 else:
                     reward_chance = 1.0 / (1.0 + balance / 500.0)
                 try:
                     from lib.economy.reserve_policy import dividend_rate, spend_dividend
-                    reward_chance *= dividend_rate()
+                    reward_chance *= await AsyncDatabaseManager.run_read(dividend_rate)
                 except Exception:
                     logger.error("dividend rate lookup failed; paying at the base rate",
                                  exc_info=True)
@@ -246,9 +364,10 @@ class XPSystem:
                 if reward_chance > 0 and random.random() < reward_chance:
                     # Claim from the pot BEFORE paying, so a dry pot can't be overdrawn by
                     # two messages landing at once.
-                    if spend_dividend is None or spend_dividend(1):
-                        add_bb(int(user_id), 1, reason="Chatting activity reward",
-                               discretionary=True)
+                    if spend_dividend is None or await AsyncDatabaseManager.run(spend_dividend, 1):
+                        await AsyncDatabaseManager.run(add_bb, int(user_id), 1,
+                                                       reason="Chatting activity reward",
+                                                       discretionary=True)
                         try:
                             from lib.features.income_badges import record_income_source, bump_daily_income
                             bump_daily_income("chat_activity_total", 1)
@@ -286,14 +405,7 @@ class XPSystem:
 
     def get_rank(self, user_id: str, guild: discord.Guild = None):
         if guild:
-            all_xp = self.get_all_sorted_xp(guild)
-            for index, (uid, xp_val) in enumerate(all_xp):
-                if str(uid) == str(user_id):
-                    return index + 1, xp_val
-            result = DatabaseManager.fetch_one("SELECT xp FROM xp WHERE user_id = ?", (user_id,))
-            if result:
-                return None, result[0]
-            return None, 0
+            return rank_index.rank_of(user_id, guild)
         
         # Optimized SQL query to find rank: count users with more XP + 1 (includes departed)
         query = """
@@ -307,13 +419,6 @@ class XPSystem:
             return result[0], result[1]
         return None, 0
 
-    def get_all_sorted_xp(self, guild: discord.Guild = None):
-        sorted_xp = DatabaseManager.fetch_all("SELECT user_id, xp FROM xp ORDER BY xp DESC")
-        if guild:
-            member_ids = {m.id for m in guild.members}
-            sorted_xp = [(uid, xp) for uid, xp in sorted_xp if int(uid) in member_ids]
-        return sorted_xp
-
     async def generate_leaderboard_image(self, guild: discord.Guild, data_slice, offset):
         template = read_html_template("templates/leaderboard.html")
 
@@ -333,7 +438,7 @@ class XPSystem:
         title_banner_path = os.path.join(BASE_DIR, "data", "rank_cards", "title_banner_texture.png")
         title_bg_uri = ""
         if os.path.exists(title_banner_path):
-            title_bg_uri = encode_image_to_data_uri(title_banner_path)
+            title_bg_uri = encode_image_to_data_uri(title_banner_path, LEADERBOARD_ROW, cover=True)
 
         user_ids = [str(uid) for uid, _ in data_slice]
         customizations = {}
@@ -343,9 +448,13 @@ class XPSystem:
             results = DatabaseManager.fetch_all(query, tuple(user_ids))
             customizations = {row[0]: {'title': row[1], 'background': row[2]} for row in results}
 
+        # Every avatar on the page at once: misses are fetched concurrently, not row by row
+        members = [guild.get_member(int(uid)) for uid, _ in data_slice]
+        avatars = await avatar_uris(self.client, [m.display_avatar.url if m else DEFAULT_AVATAR for m in members])
+
         for i, (uid, xp_val) in enumerate(data_slice):
             rank = offset + i + 1
-            member = guild.get_member(int(uid))
+            member = members[i]
             name = member.display_name if member else "Unknown"
             
             uid_str = str(uid)
@@ -359,8 +468,7 @@ class XPSystem:
                 
             has_custom_bg = bg_file is not None and bg_file != "unionjack.png"
             
-            avatar_url = member.display_avatar.url if member else "https://cdn.discordapp.com/embed/avatars/0.png"
-            avatar = await get_avatar_data_uri(self.client, avatar_url)
+            avatar = avatars[i]
 
             # Determine rank class for specific styling (Gold, Silver, Bronze for top 3)
             rank_class = f"rank-{rank}" if rank <= 3 else ""
@@ -369,7 +477,7 @@ class XPSystem:
             if has_custom_bg:
                 bg_path = os.path.join(BASE_DIR, "data", "rank_cards", bg_file)
                 if os.path.exists(bg_path):
-                    bg_uri = encode_image_to_data_uri(bg_path)
+                    bg_uri = encode_image_to_data_uri(bg_path, LEADERBOARD_ROW, cover=True)
                     box_style = f"background: linear-gradient(90deg, rgba(0,0,0,0.95) 0%, rgba(0,0,0,0.4) 50%, rgba(0,0,0,0.8) 100%), url('{bg_uri}') no-repeat center center; background-size: cover; border: 1px solid rgba(255,255,255,0.3);"
             elif title and title_bg_uri:
                 box_style = f"background: url('{title_bg_uri}') no-repeat center center; background-size: cover; border: 1px solid #D4AF37;"
@@ -405,11 +513,11 @@ class XPSystem:
         return image_buffer.getvalue()
 
     async def handle_leaderboard_command(self, interaction: discord.Interaction):
-        data = self.get_all_sorted_xp(interaction.guild)
-        if not data:
+        guild = interaction.guild
+        if guild is None or not rank_index.count(guild):
             return await interaction.followup.send("No XP data found.")
-        view = LeaderboardView(self, interaction.guild, data)
-        first = data[: LeaderboardView.PAGE_SIZE]
+        view = LeaderboardView(self, guild)
+        first = view.get_slice()
         image_bytes = await self.generate_leaderboard_image(interaction.guild, first, 0)
         view.image_cache[0] = image_bytes
 
@@ -443,7 +551,7 @@ class XPSystem:
         title_banner_path = os.path.join(BASE_DIR, "data", "rank_cards", "title_banner_texture.png")
         title_bg_uri = ""
         if os.path.exists(title_banner_path):
-            title_bg_uri = encode_image_to_data_uri(title_banner_path)
+            title_bg_uri = encode_image_to_data_uri(title_banner_path, LEADERBOARD_ROW, cover=True)
 
         user_ids = [str(uid) for uid, _ in data_slice]
         customizations = {}
@@ -453,9 +561,14 @@ class XPSystem:
             results = DatabaseManager.fetch_all(query, tuple(user_ids))
             customizations = {row[0]: {'title': row[1], 'background': row[2]} for row in results}
 
+        # Every avatar on the page at once: misses are fetched concurrently, not row by row
+        from config import BOT_ID
+        members = [guild.get_member(int(uid)) for uid, _ in data_slice] + [guild.get_member(int(BOT_ID))]
+        avatars = await avatar_uris(self.client, [m.display_avatar.url if m else DEFAULT_AVATAR for m in members])
+
         for i, (uid, bal) in enumerate(data_slice):
             rank = offset + i + 1
-            member = guild.get_member(int(uid))
+            member = members[i]
             name = member.display_name if member else "Unknown"
             
             uid_str = str(uid)
@@ -469,8 +582,7 @@ class XPSystem:
                 
             has_custom_bg = bg_file is not None and bg_file != "unionjack.png"
             
-            avatar_url = member.display_avatar.url if member else "https://cdn.discordapp.com/embed/avatars/0.png"
-            avatar = await get_avatar_data_uri(self.client, avatar_url)
+            avatar = avatars[i]
 
             # Determine rank class for specific styling
             rank_class = f"rank-{rank}" if rank <= 3 else ""
@@ -479,7 +591,7 @@ class XPSystem:
             if has_custom_bg:
                 bg_path = os.path.join(BASE_DIR, "data", "rank_cards", bg_file)
                 if os.path.exists(bg_path):
-                    bg_uri = encode_image_to_data_uri(bg_path)
+                    bg_uri = encode_image_to_data_uri(bg_path, LEADERBOARD_ROW, cover=True)
                     box_style = f"background: linear-gradient(90deg, rgba(0,0,0,0.95) 0%, rgba(0,0,0,0.4) 50%, rgba(0,0,0,0.8) 100%), url('{bg_uri}') no-repeat center center; background-size: cover; border: 1px solid rgba(255,255,255,0.3);"
             elif title and title_bg_uri:
                 box_style = f"background: url('{title_bg_uri}') no-repeat center center; background-size: cover; border: 1px solid #D4AF37;"
@@ -513,12 +625,9 @@ class XPSystem:
 
         # House Bank header - the bot/bank isn't ranked among players, but its balance is
         # shown centred at the top of every page.
-        from config import BOT_ID
         bank_row = DatabaseManager.fetch_one("SELECT balance FROM ukpence WHERE user_id = ?", (str(BOT_ID),))
         bank_bal = bank_row[0] if bank_row else 0
-        bank_member = guild.get_member(int(BOT_ID))
-        bank_avatar_url = bank_member.display_avatar.url if bank_member else "https://cdn.discordapp.com/embed/avatars/0.png"
-        bank_avatar = await get_avatar_data_uri(self.client, bank_avatar_url)
+        bank_avatar = avatars[-1]
         bank_html = f"""
         <div class="flex justify-center w-full" style="margin-bottom:18px">
           <div class="leaderboard-item" style="max-width:470px;width:100%;border:1.5px solid #D4AF37;box-shadow:0 0 22px rgba(212,175,55,.4);background:linear-gradient(90deg, rgba(0,0,0,.9), rgba(48,36,6,.7));">
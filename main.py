@@ -649,9 +649,8 @@ async def graceful_shutdown(client, sig_name):
               # a restart, so wait for the WHOLE match to finish rather than interrupt it. vs-AI
               # Connect 4 is single-player (it just refunds on restart), so it's NOT counted -
               # an abandoned AI game can't hold the deploy for its 10-min human clock.
-            from lib.core.file_operations import load_persistent_views
-            _views = load_persistent_views() or {}
-            n += sum(1 for v in _views.values()
+            from lib.core.persistent_views import PersistentViewRegistry
+            n += sum(1 for _, v in PersistentViewRegistry.items()
                      if isinstance(v, dict) and (
                          v.get("type") == "battleship"
                          or (v.get("type") == "connect4" and not v.get("ai"))
@@ -709,7 +708,34 @@ async def graceful_shutdown(client, sig_name):
     except Exception as e:
         logger.error(f"Session close error: {e}")
 
-    # 4. Flush the WAL into database.db so the file is self-contained for backups.
+    # 4. Let writes already queued on the async DB threads land, commit the pending
+    #    telemetry batch and the daily-summary counters still buffered in memory, then
+    #    flush the WAL into database.db so the file is self-contained for backups.
+    try:
+        from database import AsyncDatabaseManager
+        await asyncio.to_thread(AsyncDatabaseManager.shutdown)
+    except Exception as e:
+        logger.error(f"Async DB worker shutdown error: {e}")
+
+    try:
+        from lib.core import activity_counters
+        from database import TelemetryQueue
+        from lib.economy.economy_manager import EconomyMetrics
+        activity_counters.flush()
+        EconomyMetrics.flush()
+        TelemetryQueue.flush()
+        if activity_counters.flush():          # any counters a full backlog turned away
+            TelemetryQueue.flush()
+    except Exception as e:
+        logger.error(f"Telemetry flush error: {e}")
+
+    try:
+        from lib.features.summary import flush_summary_data
+        flush_summary_data()
+    except Exception as e:
+        logger.error(f"Summary counter flush error: {e}")
+
+    # Flush the WAL into database.db so the file is self-contained for backups.
     try:
         from database import DatabaseManager
         DatabaseManager.shutdown_checkpoint()
@@ -762,4 +788,17 @@ async def main():
             # empty snapshot.
             client.reload_recovered_json_state()
         init_db()
+        # One-shot import of the JSON state files now kept in the kv_store table.
+        from lib.core.file_operations import import_kv_backed_files
+        import_kv_backed_files()
+        from lib.core.activity_counters import import_legacy_counters
+        import_legacy_counters()
+        from lib.economy.balance_snapshots import import_snapshot_files
+        import_snapshot_files()
+        from lib.economy.economy_manager import EconomyMetrics
+        EconomyMetrics.import_metrics_file()
+        from lib.features.income_badges import import_earned_sources_file
+        import_earned_sources_file()
+        from lib.economy.casino_stats import import_rollups
+        import_rollups()
         await client.start(os.getenv("DISCORD_TOKEN"))
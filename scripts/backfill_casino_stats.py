@@ -212,6 +212,8 @@ class BackfillCasinoClient(discord.Client):
                             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                         ''', (r["user_id"], r["game"], r["bet"], r["staked"], r["payout"], net, r["outcome"], result, r["timestamp"]))
                         inserted += 1
+                    from lib.economy.casino_stats import rebuild_rollups
+                    rebuild_rollups(c)
                     conn.commit()
                 print(f"Successfully backfilled {inserted} rows into casino_results table!")
             except Exception as e:
@@ -0,0 +1,132 @@
+"""Time the per-wager economy guards against a seeded ledger, with the old single-column
+indexes on pay_transfers/game_transfers and then with the covering (user, timestamp, ...)
+ones init_db now creates.
+
+Runs against a throwaway database in a temp directory - never the live one:
+
+    python scripts/bench_transfer_indexes.py [--users 3000] [--days 540] [--per-day 900]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from database import DatabaseManager
+
+BOT_ID = "1"
+
+OLD_INDEXES = (
+    "CREATE INDEX idx_pay_payer ON pay_transfers(payer_id)",
+    "CREATE INDEX idx_pay_recipient ON pay_transfers(recipient_id)",
+    "CREATE INDEX idx_game_loser ON game_transfers(loser_id)",
+    "CREATE INDEX idx_game_winner ON game_transfers(winner_id)",
+)
+NEW_INDEXES = ("idx_pay_payer_ts", "idx_pay_recipient_ts", "idx_game_loser_ts", "idx_game_winner_ts")
+
+
+def seed(users, days, per_day):
+    """A long-tailed ledger: a few hundred regulars account for most transfers, the way
+    the real one looks, and everyone has history stretching back `days`."""
+    rng = random.Random(1)
+    now = int(time.time())
+    ids = [str(10**17 + i) for i in range(users)]
+    regulars = ids[: max(10, users // 10)]
+
+    def someone():
+        return rng.choice(regulars) if rng.random() < 0.8 else rng.choice(ids)
+
+    pay, game = [], []
+    for _ in range(days * per_day):
+        ts = now - rng.randrange(days * 86400)
+        a, b = someone(), someone()
+        if a == b:
+            continue
+        amount = int(rng.paretovariate(1.3) * 20)
+        (pay if rng.random() < 0.45 else game).append((ts, a, b, amount))
+    with DatabaseManager.transaction() as c:
+        c.executemany("INSERT INTO pay_transfers (timestamp, payer_id, recipient_id, amount) "
+                      "VALUES (?, ?, ?, ?)", pay)
+        c.executemany("INSERT INTO game_transfers (timestamp, loser_id, winner_id, amount) "
+                      "VALUES (?, ?, ?, ?)", game)
+    DatabaseManager.execute("ANALYZE")
+    return regulars, len(pay), len(game)
+
+
+def guards(regulars):
+    from lib.core import detection_rules as R
+    from lib.economy import economy_manager as E
+
+    now = int(time.time())
+    return {
+        "daily_transfer_used": lambda u, v: E.daily_transfer_used(u, BOT_ID),
+        "wager_blocked_reason": lambda u, v: E.wager_blocked_reason(u, 500, BOT_ID),
+        "recent_transfer_io": lambda u, v: E.recent_transfer_io(u),
+        "wager_wash_findings": lambda u, v: R.wager_wash_findings(u, v),
+        "recycle_findings": lambda u, v: R.recycle_findings(u, 1000, now - 3600),
+        "funnel_findings": lambda u, v: R.funnel_findings(u),
+    }
+
+
+def measure(checks, regulars, rounds):
+    rng = random.Random(2)
+    pairs = [(rng.choice(regulars), rng.choice(regulars)) for _ in range(rounds)]
+    results = {}
+    for name, check in checks.items():
+        samples = []
+        for u, v in pairs:
+            start = time.perf_counter()
+            check(u, v)
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        results[name] = (statistics.median(samples), samples[int(len(samples) * 0.95) - 1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=540)
+    parser.add_argument("--per-day", type=int, default=900)
+    parser.add_argument("--rounds", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_FILE = os.path.join(tmp, "bench.db")
+        database.init_db()
+        regulars, n_pay, n_game = seed(args.users, args.days, args.per_day)
+        print(f"Seeded {n_pay:,} pay_transfers and {n_game:,} game_transfers "
+              f"for {args.users:,} users over {args.days} days")
+        checks = guards(regulars)
+
+        with DatabaseManager.transaction() as c:
+            for name in NEW_INDEXES:
+                c.execute(f"DROP INDEX {name}")
+            for sql in OLD_INDEXES:
+                c.execute(sql)
+            c.execute("ANALYZE")
+        before = measure(checks, regulars, args.rounds)
+
+        DatabaseManager.get_connection().close()
+        DatabaseManager._connection = None
+        database.init_db()                        # the migration: covering in, old out
+        DatabaseManager.execute("ANALYZE")
+        after = measure(checks, regulars, args.rounds)
+        DatabaseManager.get_connection().close()
+        DatabaseManager._connection = None
+
+    print(f"\n{'guard':<22}{'before p50':>12}{'p95':>9}{'after p50':>12}{'p95':>9}{'speedup':>9}")
+    for name in checks:
+        (b50, b95), (a50, a95) = before[name], after[name]
+        print(f"{name:<22}{b50:>10.3f}ms{b95:>7.3f}ms{a50:>10.3f}ms{a95:>7.3f}ms"
+              f"{b50 / a50 if a50 else float('inf'):>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Build the fitted, recompressed copies of every image the card renderers embed (rank card
+backgrounds and title banner, coins, badges) into config.ASSET_BUILD_DIR, and report how
+much each shrank. Renders build a missing copy on first use anyway; running this at deploy
+time means none of them has to.
+
+    python scripts/build_assets.py
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.core.assets import build_all
+
+
+def main():
+    report = build_all()
+    total_in = total_out = 0
+    for path, before, after in report:
+        total_in += before
+        total_out += after
+        print(f"{os.path.relpath(path):<70}{before / 1024:>9,.0f} KB -> {after / 1024:>7,.0f} KB")
+    print(f"\n{len(report)} assets: {total_in / 1048576:,.1f} MB -> {total_out / 1048576:,.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
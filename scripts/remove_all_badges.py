@@ -5,7 +5,7 @@ import sys
 # Add the parent directory to the path so we can import database
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database import DatabaseManager
+from database import revoke_badges
 from config import USERS
 
 def main():
@@ -18,11 +18,8 @@ def main():
     print(f"Removing all badges from user ID: {target_user_id}...")
 
     try:
-        with DatabaseManager.locked_connection() as conn:
-            c = conn.cursor()
-            c.execute("DELETE FROM user_badges WHERE user_id = ?", (target_user_id,))
-            removed_count = c.rowcount
-            conn.commit()
+        # A running bot notices the removal within BadgeOwnership.REVALIDATE_SECONDS.
+        removed_count = revoke_badges(target_user_id)
 
         print(f"Successfully removed {removed_count} badges from user {target_user_id}.")
     except Exception as e:
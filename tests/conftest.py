@@ -0,0 +1,24 @@
+"""Shared fixtures."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import database
+from database import DatabaseManager
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """An initialised database in tmp_path, made current for the test. The connection it
+    replaces is put back afterwards, since later tests may still be using it."""
+    previous = DatabaseManager._connection
+    DatabaseManager._connection = None
+    monkeypatch.setattr(database, "DB_FILE", str(tmp_path / "test.db"))
+    database.init_db()
+    yield tmp_path
+    DatabaseManager._connection.close()
+    DatabaseManager._connection = previous
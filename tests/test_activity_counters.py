@@ -0,0 +1,95 @@
+"""Activity counters: increments are in memory and hand back the new count, flushes reach the
+table through the telemetry queue, a restart reads them back, and old periods expire."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from database import DatabaseManager, TelemetryQueue
+from lib.core import activity_counters as AC
+
+
+def _forget_memory():
+    AC._counts.clear()
+    AC._loaded.clear()
+    AC._dirty.clear()
+
+
+@pytest.fixture
+def counters(fresh_db, monkeypatch):
+    monkeypatch.setattr(AC, "FLUSH_INTERVAL", 3600)
+    _forget_memory()
+    yield fresh_db
+    _forget_memory()
+    TelemetryQueue.flush()
+
+
+def _rows():
+    TelemetryQueue.flush()
+    return DatabaseManager.fetch_all(
+        "SELECT kind, period, user_id, count FROM activity_counters ORDER BY kind, period, user_id")
+
+
+def test_increments_stay_in_memory_until_flushed_then_survive_a_restart(counters):
+    for _ in range(3):
+        n = AC.increment("night_owl", "", 7)
+    assert n == 3
+    assert AC.increment("weekend_warrior", "2026-W42", 7) == 1
+    assert _rows() == []                                  # nothing written per message
+
+    assert AC.flush() == 2
+    assert _rows() == [("night_owl", "", "7", 3), ("weekend_warrior", "2026-W42", "7", 1)]
+
+    _forget_memory()                                      # as after a restart
+    assert AC.increment("night_owl", "", 7) == 4
+
+
+def test_counts_a_full_backlog_refuses_stay_dirty(counters, monkeypatch):
+    AC.increment("night_owl", "", 7)
+    AC.increment("night_owl", "", 8)
+    with monkeypatch.context() as m:
+        m.setattr(TelemetryQueue, "submit", lambda sql, params=(): False)
+        assert AC.flush() == 0
+    assert AC.flush() == 2
+    assert _rows() == [("night_owl", "", "7", 1), ("night_owl", "", "8", 1)]
+
+
+def test_expired_periods_are_purged(counters, monkeypatch):
+    AC.increment("weekend_warrior", "2020-W01", 7)
+    AC.increment("night_owl", "", 7)
+    AC.flush()
+    TelemetryQueue.flush()
+    DatabaseManager.execute("UPDATE activity_counters SET expires_at = 1 WHERE kind = 'weekend_warrior'")
+    monkeypatch.setattr(AC, "_last_purge", 0.0)
+    monkeypatch.setattr(AC, "PURGE_INTERVAL", 0)
+    AC.flush()
+    assert _rows() == [("night_owl", "", "7", 1)]
+    assert ("weekend_warrior", "2020-W01") not in AC._loaded
+
+
+def test_legacy_files_are_imported_once(counters, monkeypatch):
+    files = {}
+    for name, data in (("NIGHT_OWL_COUNTS_FILE", {"7": 99}),
+                       ("MORNING_PERSON_COUNTS_FILE", {"8": 4}),
+                       ("PARTY_ANIMAL_TARGETS_FILE", {"7": ["2020-01-01", "2020-01-02"]}),
+                       ("WEEKEND_WARRIOR_COUNTS_FILE", {"2020-W01": {"7": 500}}),
+                       ("TOWN_CRIER_TRACKING_FILE", {"2020-01-01": "7"})):
+        path = counters / f"{name}.json"
+        path.write_text(json.dumps(data))
+        monkeypatch.setattr(config, name, str(path))
+        files[name] = path
+
+    AC.import_legacy_counters()
+    assert AC.increment("night_owl", "", 7) == 100
+    assert AC.get("morning_person", "", 8) == 4
+    assert AC.get("party_animal", "", 7) == 2
+    assert AC.get("weekend_warrior", "2020-W01", 7) == 0  # long over: not carried across
+
+    files["NIGHT_OWL_COUNTS_FILE"].write_text(json.dumps({"7": 0}))
+    AC.import_legacy_counters()
+    assert AC.get("night_owl", "", 7) == 100
@@ -0,0 +1,64 @@
+"""Card assets: images are fitted to their display box and recompressed once, rebuilt only when
+the source changes, and their data URIs are memoised by path and mtime."""
+
+import base64
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PIL import Image
+
+import config
+from lib.core import assets
+from lib.core import image_processing as IP
+
+
+@pytest.fixture
+def build_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "ASSET_BUILD_DIR", str(tmp_path / "built"))
+    monkeypatch.setattr(IP, "_data_uris", IP.OrderedDict())
+    monkeypatch.setattr(IP, "_data_uri_bytes", 0)
+    return tmp_path
+
+
+def _decode(uri):
+    head, data = uri.split(",", 1)
+    return head, Image.open(io.BytesIO(base64.b64decode(data)))
+
+
+def test_coin_uri_is_fitted_and_an_order_of_magnitude_smaller(build_dir):
+    coin = os.path.join(config.DATA_DIR, "ukpence.png")
+    raw = IP.encode_image_to_data_uri(coin)
+    fitted = IP.encode_image_to_data_uri(coin, assets.COIN_ICON)
+    head, im = _decode(fitted)
+    assert head == "data:image/webp;base64" and max(im.size) <= 64
+    assert len(fitted) * 10 < len(raw)
+
+
+def test_cover_fills_the_box_and_rebuilds_only_on_change(build_dir):
+    src = build_dir / "bg.png"
+    Image.new("RGB", (2000, 800), (200, 20, 40)).save(src)
+    built = assets.fitted(str(src), assets.LEADERBOARD_ROW, cover=True)
+    assert Image.open(built).size == (420, 168)             # covers 420x85, keeps aspect
+    first = os.path.getmtime(built)
+
+    assert assets.fitted(str(src), assets.LEADERBOARD_ROW, cover=True) == built
+    assert os.path.getmtime(built) == first                  # reused, not rebuilt
+
+    uri = IP.encode_image_to_data_uri(str(src), assets.LEADERBOARD_ROW, cover=True)
+    assert IP.encode_image_to_data_uri(str(src), assets.LEADERBOARD_ROW, cover=True) is uri
+
+    Image.new("RGB", (1000, 1000), (0, 0, 0)).save(src)
+    os.utime(src, (first + 10, first + 10))
+    changed = IP.encode_image_to_data_uri(str(src), assets.LEADERBOARD_ROW, cover=True)
+    assert changed != uri and _decode(changed)[1].size == (420, 420)
+
+
+def test_uncompressible_or_vector_sources_are_served_as_they_are(build_dir):
+    svg = build_dir / "icon.svg"
+    svg.write_text("<svg xmlns='http://www.w3.org/2000/svg'/>")
+    assert assets.fitted(str(svg), assets.BADGE_ICON) == str(svg)
+    assert IP.encode_image_to_data_uri(str(svg), assets.BADGE_ICON).startswith("data:image/svg+xml")
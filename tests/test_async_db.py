@@ -0,0 +1,83 @@
+"""AsyncDatabaseManager: awaitable queries run off the event loop, batched transactions are
+all-or-nothing."""
+
+import asyncio
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import database
+from database import AsyncDatabaseManager, DatabaseManager
+
+
+@pytest.fixture
+def db(fresh_db):
+    DatabaseManager.execute("CREATE TABLE t (k TEXT PRIMARY KEY, v INTEGER)")
+    yield AsyncDatabaseManager
+    AsyncDatabaseManager.shutdown()
+
+
+def test_awaitable_reads_and_writes(db):
+    async def go():
+        await db.execute("INSERT INTO t VALUES ('a', 1)")
+        rowid = await db.execute_insert("INSERT INTO t VALUES ('b', 2)")
+        return rowid, await db.fetch_one("SELECT v FROM t WHERE k = 'a'"), \
+            await db.fetch_all("SELECT k FROM t ORDER BY k")
+
+    rowid, one, rows = asyncio.run(go())
+    assert rowid == 2
+    assert one == (1,)
+    assert rows == [("a",), ("b",)]
+
+
+def test_transaction_commits_together_or_not_at_all(db):
+    async def go():
+        async with db.transaction() as tx:
+            tx.execute("INSERT INTO t VALUES ('a', 1)")
+            tx.executemany("INSERT INTO t VALUES (?, ?)", [("b", 2), ("c", 3)])
+        with pytest.raises(RuntimeError):
+            async with db.transaction() as tx:
+                tx.execute("INSERT INTO t VALUES ('d', 4)")
+                raise RuntimeError("abandon")
+        with pytest.raises(database.sqlite3.IntegrityError):
+            async with db.transaction() as tx:
+                tx.execute("INSERT INTO t VALUES ('e', 5)")
+                tx.execute("INSERT INTO t VALUES ('a', 6)")      # duplicate key
+        return await db.fetch_all("SELECT k FROM t ORDER BY k")
+
+    assert asyncio.run(go()) == [("a",), ("b",), ("c",)]
+
+
+def test_a_held_write_lock_does_not_stall_the_loop(db):
+    holding, release = threading.Event(), threading.Event()
+
+    def hog():
+        with DatabaseManager.transaction() as c:
+            c.execute("INSERT INTO t VALUES ('x', 0)")
+            holding.set()
+            release.wait(5)
+
+    async def go():
+        write = asyncio.ensure_future(db.execute("INSERT INTO t VALUES ('y', 1)"))
+        ticks = 0
+        for _ in range(5):                   # the loop keeps turning while the write waits
+            await asyncio.sleep(0.01)
+            ticks += 1
+        assert not write.done()
+        release.set()
+        await write
+        return ticks
+
+    t = threading.Thread(target=hog)
+    t.start()
+    assert holding.wait(5)
+    try:
+        assert asyncio.run(go()) == 5
+    finally:
+        release.set()
+        t.join(5)
+    assert DatabaseManager.fetch_one("SELECT COUNT(*) FROM t") == (2,)
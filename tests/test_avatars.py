@@ -0,0 +1,111 @@
+"""Avatar cache: a page's misses are fetched concurrently at the displayed size, shared when
+requested twice at once, and kept in memory and on disk; failures aren't cached."""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from lib.core import avatars
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+class _Response:
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return PNG
+
+
+class _Session:
+    """Answers every URL after ``delay``, recording what was asked and the peak concurrency."""
+
+    def __init__(self, delay=0.05, status=200):
+        self.delay, self.status = delay, status
+        self.urls, self.active, self.peak = [], 0, 0
+
+    def get(self, url):
+        session = self
+
+        class _Request:
+            async def __aenter__(self):
+                session.urls.append(url)
+                session.active += 1
+                session.peak = max(session.peak, session.active)
+                await asyncio.sleep(session.delay)
+                session.active -= 1
+                return _Response(session.status)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Request()
+
+
+class _Client:
+    def __init__(self, session):
+        self.session = session
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "AVATAR_CACHE_DIR", str(tmp_path / "avatars"))
+    monkeypatch.setattr(config, "AVATAR_FETCH_CONCURRENCY", 8)
+    monkeypatch.setattr(avatars, "_memory", avatars.OrderedDict())
+    monkeypatch.setattr(avatars, "_memory_bytes", 0)
+    monkeypatch.setattr(avatars, "_disk", None)
+    monkeypatch.setattr(avatars, "_disk_bytes", 0)
+    monkeypatch.setattr(avatars, "_semaphore", None)
+    return tmp_path
+
+
+def _urls(n):
+    return [f"https://cdn.discordapp.com/avatars/{i}/hash{i}.png?size=1024" for i in range(n)]
+
+
+def test_cold_page_is_fetched_concurrently_at_display_size(cache):
+    session = _Session()
+    start = time.perf_counter()
+    uris = asyncio.run(avatars.avatar_uris(_Client(session), _urls(20)))
+    elapsed = time.perf_counter() - start
+
+    assert len(session.urls) == 20 and session.peak == 8
+    assert elapsed < 0.05 * 20 / 2                             # three waves, not twenty
+    assert all(u.endswith("size=64") for u in session.urls)
+    assert all(u.startswith("data:image/png;base64,") for u in uris)
+
+    asyncio.run(avatars.avatar_uris(_Client(session), _urls(20)))
+    avatars.clear()                                              # as after a restart
+    assert asyncio.run(avatars.avatar_uris(_Client(session), _urls(20))) == uris
+    assert len(session.urls) == 20                               # memory, then disk
+
+
+def test_duplicate_requests_share_one_fetch_and_failures_are_not_cached(cache):
+    session = _Session()
+    url = _urls(1)[0]
+
+    async def both():
+        return await asyncio.gather(avatars.avatar_uri(_Client(session), url),
+                                    avatars.avatar_uris(_Client(session), [url, url]))
+
+    single, pair = asyncio.run(both())
+    assert len(session.urls) == 1 and pair == [single, single]
+
+    broken = _Session(status=404)
+    other = "https://cdn.discordapp.com/avatars/9/new.png"
+    assert asyncio.run(avatars.avatar_uri(_Client(broken), other)) == avatars.DEFAULT_AVATAR
+    asyncio.run(avatars.avatar_uri(_Client(broken), other))
+    assert len(broken.urls) == 2
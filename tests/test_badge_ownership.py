@@ -0,0 +1,49 @@
+"""BadgeOwnership: an already-held badge is refused from memory, revoke_badges keeps the set in
+step, and a removal committed by another process is picked up on revalidation."""
+
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import database
+from database import BadgeOwnership, award_badge, revoke_badges
+
+
+@pytest.fixture
+def db(fresh_db):
+    yield database.DB_FILE
+    BadgeOwnership.reset()
+
+
+def test_owned_badge_is_refused_without_a_write(db, monkeypatch):
+    assert award_badge(7, "april_fools") is True
+
+    def no_writes():
+        raise AssertionError("an owned badge reached the database")
+
+    monkeypatch.setattr(database.DatabaseManager, "_writing", no_writes)
+    assert award_badge("7", "april_fools") is False
+
+
+def test_revoke_keeps_the_set_in_step(db):
+    award_badge(7, "april_fools")
+    award_badge(7, "guy_fawkes")
+    assert revoke_badges(7, "guy_fawkes") == 1
+    assert award_badge(7, "guy_fawkes") is True
+    assert revoke_badges(7) == 2
+    assert not BadgeOwnership.owns(7, "april_fools")
+    assert award_badge(7, "april_fools") is True
+
+
+def test_removal_by_another_process_is_noticed(db, monkeypatch):
+    award_badge(7, "april_fools")
+    other = sqlite3.connect(db)                       # e.g. scripts/remove_all_badges.py
+    other.execute("DELETE FROM user_badges WHERE user_id = '7'")
+    other.commit()
+    other.close()
+    monkeypatch.setattr(BadgeOwnership, "REVALIDATE_SECONDS", 0)
+    assert award_badge(7, "april_fools") is True
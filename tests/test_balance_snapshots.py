@@ -0,0 +1,44 @@
+"""Balance snapshots: the historical daily JSON files are imported into the indexed table once,
+the nightly record lands there too, and the balance graph reads a user's history from it."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from lib.economy import balance_graph as bg
+from lib.economy import balance_snapshots as BS
+
+
+@pytest.fixture
+def snapshots(fresh_db, monkeypatch):
+    folder = fresh_db / "balance_snapshots"
+    folder.mkdir()
+    monkeypatch.setattr(config, "BALANCE_SNAPSHOT_DIR", str(folder))
+    return folder
+
+
+def test_files_are_imported_once_and_read_back_in_date_order(snapshots):
+    for day, data in (("2026-01-02", {"7": 200, "8": 5}), ("2026-01-01", {"7": 100}),
+                      ("not-a-date", {"7": 1})):
+        (snapshots / f"ukpence_balances_{day}.json").write_text(json.dumps(data))
+    (snapshots / "ukpence_balances_2026-01-03.json").write_text("{truncated")
+
+    BS.import_snapshot_files()
+    assert BS.history(7) == [("2026-01-01", 100), ("2026-01-02", 200)]
+    assert BS.history("8") == [("2026-01-02", 5)]
+
+    (snapshots / "ukpence_balances_2026-01-01.json").write_text(json.dumps({"7": 0}))
+    BS.import_snapshot_files()
+    assert BS.history(7)[0] == ("2026-01-01", 100)
+
+
+def test_nightly_record_feeds_the_graph(snapshots):
+    assert BS.record("2026-01-01", {"7": 100, "8": "bad"}) == 1
+    BS.record("2026-01-01", {"7": 150})                   # a rerun replaces the day
+    assert bg._snapshot_points("7") == [(bg._midnight_epoch("2026-01-01") + 86400, 150)]
+    assert bg._snapshot_points("9") == []
@@ -0,0 +1,65 @@
+"""Casino rollups: record_result folds each round into the hourly and per-player daily
+tables in its own transaction, every stats read agrees with a scan of casino_results, and
+the house edge is windowed by hour."""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import DatabaseManager
+from lib.economy import casino_stats as CS
+
+ALICE, BOB = "8001", "8002"
+
+
+@pytest.fixture
+def casino(fresh_db, monkeypatch):
+    monkeypatch.setattr(CS, "_check_casino_badges", lambda *a: None)
+
+
+def _play():
+    CS.record_result(ALICE, "blackjack", 100, 200, 400)       # doubled and won
+    CS.record_result(ALICE, "blackjack", 100, 100, 0)
+    CS.record_result(ALICE, "slots", 50, 50, 50)              # push
+    CS.record_result(BOB, "slots", 50, 50, 0)
+    CS.record_result(BOB, "roulette", 500, 500, 1_750)
+
+
+def _rollups():
+    return (DatabaseManager.fetch_all("SELECT * FROM casino_hourly ORDER BY game, hour"),
+            DatabaseManager.fetch_all("SELECT * FROM casino_user_daily ORDER BY user_id, game"))
+
+
+def test_reads_come_from_rollups_that_match_the_rounds(casino):
+    _play()
+    stats = CS.get_user_casino_stats(ALICE)
+    assert stats["total"] == {"games": 3, "wins": 1, "losses": 1, "pushes": 1, "staked": 350,
+                              "payout": 450, "net": 100, "biggest_win": 200, "biggest_loss": -100}
+    assert list(stats["per_game"]) == ["blackjack", "slots"]
+    assert CS.get_casino_leaderboard("biggest_win", limit=1) == [
+        {"user_id": BOB, "value": 1_250, "games": 2}]
+    assert CS.get_net_standings(game="slots") == ([(ALICE, 0, 1), (BOB, -50, 1)], [])
+
+    held = _rollups()
+    with DatabaseManager.transaction() as c:
+        assert CS.rebuild_rollups(c) == 5
+    assert _rollups() == held
+
+
+def test_house_edge_is_windowed_by_hour(casino):
+    _play()
+    now = int(time.time())
+    DatabaseManager.execute(
+        "INSERT INTO casino_hourly (game, hour, rounds, staked, payout, net) "
+        "VALUES ('slots', ?, 10, 1000, 0, -1000)", (now - now % 3600 - 48 * 3600,))
+
+    day = CS.house_edge(24)
+    assert day["all"]["rounds"] == 5 and day["all"]["house_net"] == 900 - 2_200
+    assert day["slots"] == {"rounds": 2, "staked": 100, "payout": 50, "house_net": 50,
+                            "edge": 0.5}
+    week = CS.house_edge(7 * 24)
+    assert week["slots"]["house_net"] == 1_050 and week["all"]["rounds"] == 15
@@ -15,26 +15,32 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 from database import DatabaseManager
 from lib.economy import economy_manager as E
+from lib.economy import guard_state
 
 ALICE, BOB, BANK = "9000001", "9000002", "9000003"
 
 
+# These write the ledgers directly rather than through the managers, so the in-memory guard
+# state the wager check reads is brought up to date the way the scheduled reconcile would.
 def _clear():
     for uid in (ALICE, BOB):
         DatabaseManager.execute("DELETE FROM pay_transfers WHERE payer_id = ?", (uid,))
         DatabaseManager.execute("DELETE FROM game_transfers WHERE loser_id = ?", (uid,))
+    guard_state.reconcile()
 
 
 def _paid(payer, recipient, amount, when=None):
     DatabaseManager.execute(
         "INSERT INTO pay_transfers (timestamp, payer_id, recipient_id, amount) VALUES (?, ?, ?, ?)",
         (int(when or time.time()), payer, recipient, int(amount)))
+    guard_state.reconcile()
 
 
 def _lost(loser, winner, amount, when=None):
     DatabaseManager.execute(
         "INSERT INTO game_transfers (timestamp, loser_id, winner_id, amount) VALUES (?, ?, ?, ?)",
         (int(when or time.time()), loser, winner, int(amount)))
+    guard_state.reconcile()
 
 
 def test_a_payment_and_a_lost_wager_draw_on_the_same_allowance():
@@ -0,0 +1,63 @@
+"""Per-thread read connections: reads run beside a held write lock, writers read their own."""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import database
+from database import DatabaseManager
+
+
+@pytest.fixture
+def db(fresh_db):
+    DatabaseManager.execute("CREATE TABLE t (k TEXT PRIMARY KEY, v INTEGER)")
+    DatabaseManager.execute("INSERT INTO t VALUES ('a', 1)")
+    return DatabaseManager
+
+
+def test_reads_do_not_wait_for_an_open_write_transaction(db):
+    entered, release = threading.Event(), threading.Event()
+
+    def writer():
+        with db.transaction() as c:
+            c.execute("UPDATE t SET v = 2 WHERE k = 'a'")
+            entered.set()
+            release.wait(5)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        assert entered.wait(5)
+        result = {}
+        reader = threading.Thread(target=lambda: result.update(v=db.fetch_one("SELECT v FROM t")[0]))
+        reader.start()
+        reader.join(2)
+        assert not reader.is_alive(), "read blocked behind the write lock"
+        assert result["v"] == 1                     # the uncommitted update is invisible
+    finally:
+        release.set()
+        t.join(5)
+    assert db.fetch_one("SELECT v FROM t")[0] == 2  # and visible once committed
+
+
+def test_a_transaction_reads_its_own_uncommitted_writes(db):
+    with db.transaction() as c:
+        c.execute("INSERT INTO t VALUES ('b', 5)")
+        assert db.fetch_one("SELECT v FROM t WHERE k = 'b'") == (5,)
+        assert len(db.fetch_all("SELECT k FROM t")) == 2
+
+
+def test_readers_are_read_only_and_follow_a_database_swap(db, tmp_path, monkeypatch):
+    reader = db._reader()
+    with pytest.raises(database.sqlite3.OperationalError):
+        reader.execute("INSERT INTO t VALUES ('x', 0)")
+
+    db._connection.close()
+    db._connection = None
+    monkeypatch.setattr(database, "DB_FILE", str(tmp_path / "other.db"))
+    db.execute("CREATE TABLE t (k TEXT PRIMARY KEY, v INTEGER)")
+    assert db.fetch_all("SELECT * FROM t") == []
@@ -405,6 +405,46 @@ def test_transfer_awards_high_roller():
         assert "high_roller" in badge_ids
 
 
+def test_supply_counter_follows_every_balance_write():
+    """The economy_supply counter is what mint_headroom and reserve_state read, so it has to
+    agree with the real sum after every kind of balance write - and the audit has to catch
+    one made around it."""
+    import sqlite3
+    with tempfile.TemporaryDirectory() as d:
+        em, bm, database = _fresh_economy(d)
+        from lib.economy import reserve_policy as R
+
+        def counter():
+            return database.DatabaseManager.fetch_one("SELECT total FROM economy_supply")[0]
+
+        assert counter() == TOTAL_SUPPLY
+        em.add_bb(801, 9_000, from_bank=True, taxable=False)
+        em.remove_bb(801, 1_000, to_bank=True)
+        database.DatabaseManager.transfer(801, 802, 500, reason="test")
+        em.set_bb(802, 2_000, reason="admin")                       # INSERT OR REPLACE
+        em.add_bb(803, 750, from_bank=False)                        # minted
+        em.ensure_bb(804)
+        bm.BankManager.collect_tax_batch([(801, 300)])
+        bm.BankManager.set_balance(10_000)
+        database.DatabaseManager.execute("DELETE FROM ukpence WHERE user_id = ?", ("803",))
+        assert counter() == _total_supply(database) == R.total_supply()
+        assert R.audit_total_supply() == (counter(), counter())
+
+        raw = sqlite3.connect(database.DB_FILE)                     # no recursive_triggers
+        raw.execute("INSERT OR REPLACE INTO ukpence (user_id, balance) VALUES ('801', 0)")
+        raw.commit()
+        raw.close()
+        stale = counter()
+        assert stale != _total_supply(database)
+        assert R.audit_total_supply() == (stale, _total_supply(database))
+        assert counter() == _total_supply(database)
+
+        database.DatabaseManager.execute("DELETE FROM economy_supply")  # unseeded: scan
+        assert R.total_supply() == _total_supply(database)
+        database.DatabaseManager.execute("DROP TABLE economy_supply")   # pre-counter database
+        assert R.total_supply() == _total_supply(database)
+
+
 if __name__ == "__main__":
     import traceback
 
@@ -0,0 +1,81 @@
+"""Economy log drain: rows are packed to Discord's embed limits, each message's rows are deleted
+once it lands (and only then), and a remaining backlog shortens the interval."""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import DatabaseManager
+from lib.bot import scheduled_tasks as S
+
+
+class _Thread:
+    def __init__(self, fail_after=None):
+        self.sent, self.fail_after = [], fail_after
+
+    async def send(self, embeds):
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            raise RuntimeError("429")
+        self.sent.append(embeds)
+
+
+@pytest.fixture
+def queue(fresh_db, monkeypatch):
+    monkeypatch.setattr(S, "_economy_log_state", dict(S._economy_log_state, next_run=0.0))
+
+
+def _enqueue(n, reason="Blackjack"):
+    now = int(time.time())
+    with DatabaseManager.transaction() as c:
+        c.executemany("INSERT INTO economy_transactions (timestamp, log_text) VALUES (?, ?)",
+                      [(now, f"🎲 <@{i}> paid `{i:,}` UKP|{reason}") for i in range(n)])
+
+
+def _client(thread):
+    return SimpleNamespace(get_channel=lambda _id: thread)
+
+
+def _depth():
+    return DatabaseManager.fetch_one("SELECT COUNT(*) FROM economy_transactions")[0]
+
+
+def test_packing_respects_discords_limits():
+    entries = [(i, f"<t:0:T> - reason {i}", "x" * (i % 300 + 1)) for i in range(400)]
+    messages = S._pack_economy_log(entries, "💰 Economy Activity", 0)
+    assert [i for ids, _ in messages for i in ids] == list(range(400))
+    for ids, embeds in messages:
+        assert len(embeds) <= 10 and all(len(e.fields) <= 25 for e in embeds)
+        assert sum(len(e) for e in embeds) <= 6000
+
+
+def test_backlog_drains_in_bursts_and_speeds_up(queue):
+    _enqueue(1000)
+    thread = _Thread()
+    asyncio.run(S.process_economy_logs(_client(thread)))
+    assert len(thread.sent) == S.ECONOMY_LOG_BURST
+    sent = sum(len(e.fields) for embeds in thread.sent for e in embeds)
+    assert sent > 100 and _depth() == 1000 - sent
+    metrics = S.economy_log_metrics()
+    assert metrics["depth"] == 1000 - sent and metrics["interval"] == S.ECONOMY_LOG_BUSY_SECONDS
+
+    asyncio.run(S.process_economy_logs(_client(thread)))      # not due yet
+    assert len(thread.sent) == S.ECONOMY_LOG_BURST
+
+
+def test_a_failed_send_keeps_only_the_unsent_rows(queue):
+    _enqueue(200)
+    thread = _Thread(fail_after=1)
+    asyncio.run(S.process_economy_logs(_client(thread)))
+    first = sum(len(e.fields) for e in thread.sent[0])
+    assert _depth() == 200 - first
+    assert DatabaseManager.fetch_one("SELECT MIN(id) FROM economy_transactions")[0] == first + 1
+
+    S._economy_log_state["next_run"] = 0.0
+    asyncio.run(S.process_economy_logs(_client(_Thread())))
+    assert _depth() == 0 and S.economy_log_metrics()["interval"] == S.ECONOMY_LOG_IDLE_SECONDS
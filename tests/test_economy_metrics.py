@@ -0,0 +1,57 @@
+"""EconomyMetrics: updates accumulate in memory and reads see them before any write, a flush
+upserts increments and totals into the (date, key, value) table, and the old JSON file is
+imported once."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import DatabaseManager
+from lib.economy import economy_manager as E
+from lib.economy.economy_manager import EconomyMetrics
+
+
+@pytest.fixture
+def metrics(fresh_db, monkeypatch):
+    monkeypatch.setattr(EconomyMetrics, "_pending", {})
+    monkeypatch.setattr(EconomyMetrics, "FLUSH_INTERVAL", 3600)
+    return fresh_db
+
+
+def _table():
+    return DatabaseManager.fetch_all("SELECT date, key, value FROM economy_metrics ORDER BY date, key")
+
+
+def test_updates_are_read_back_before_and_after_a_flush(metrics):
+    for _ in range(3):
+        EconomyMetrics.update_daily_metric("2026-10-18", "chat_activity_total", 5)
+    EconomyMetrics.update_daily_metric("2026-10-18", "booster_rewards_total", 100, is_total_value=True)
+    assert _table() == []                                   # nothing written per reward
+    assert EconomyMetrics.get_daily_metrics("2026-10-18") == {
+        "chat_activity_total": 15, "booster_rewards_total": 100}
+
+    assert EconomyMetrics.flush() == 2
+    EconomyMetrics.update_daily_metric("2026-10-18", "chat_activity_total", 1)
+    EconomyMetrics.update_daily_metric("2026-10-18", "booster_rewards_total", 40, is_total_value=True)
+    EconomyMetrics.update_daily_metric("2026-10-18", "booster_rewards_total", 2)
+    assert EconomyMetrics.get_daily_metrics("2026-10-18")["chat_activity_total"] == 16
+
+    EconomyMetrics.flush()
+    assert _table() == [("2026-10-18", "booster_rewards_total", 42),
+                        ("2026-10-18", "chat_activity_total", 16)]
+    assert EconomyMetrics.get_all_metrics() == {
+        "2026-10-18": {"booster_rewards_total": 42, "chat_activity_total": 16}}
+
+
+def test_legacy_file_is_imported_once(metrics, monkeypatch):
+    path = metrics / "economy_metrics.json"
+    path.write_text(json.dumps({"2025-01-01": {"chat_rewards_total": 70, "note": "x"}}))
+    monkeypatch.setattr(E, "ECONOMY_METRICS_FILE", str(path))
+    EconomyMetrics.import_metrics_file()
+    path.write_text(json.dumps({"2025-01-01": {"chat_rewards_total": 1}}))
+    EconomyMetrics.import_metrics_file()
+    assert EconomyMetrics.get_daily_metrics("2025-01-01") == {"chat_rewards_total": 70}
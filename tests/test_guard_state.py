@@ -0,0 +1,83 @@
+"""Economy guard state: supply, bank reserves and today's per-member outflow follow every
+committed money move in memory, so a stake check reads no SQL; reconcile() catches and
+corrects anything that went round the managers."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from database import DatabaseManager
+from lib.economy import economy_manager as E
+from lib.economy import guard_state, reserve_policy
+
+BANK, ALICE, BOB = "777000777", "7001", "7002"
+
+
+@pytest.fixture
+def bank(monkeypatch):
+    monkeypatch.setattr(config, "BOT_ID", int(BANK))     # before init_db seeds the bank's row
+
+
+@pytest.fixture
+def economy(bank, fresh_db, monkeypatch):
+    monkeypatch.setattr(config, "DAILY_PAY_CAP", 10_000)
+    monkeypatch.setattr(guard_state, "_state", None)
+    DatabaseManager.execute("INSERT OR REPLACE INTO ukpence (user_id, balance) VALUES (?, ?)",
+                            (BANK, 100_000))
+    DatabaseManager.execute("UPDATE bank SET balance = 100000 WHERE id = 1")
+
+
+def _sql():
+    return {k: v for k, v in guard_state._read_sql(guard_state._uk_day_start()).items()
+            if k in ("supply", "reserves", "outflow")}
+
+
+def _held():
+    state = guard_state._current()
+    return {"supply": state["supply"], "reserves": state["reserves"], "outflow": state["outflow"]}
+
+
+def test_committed_moves_keep_the_guard_in_step_with_sql(economy):
+    assert guard_state.reserves() == 100_000
+    E.add_bb(ALICE, 20_000, reason="Casino payout", taxable=False)
+    E.add_bb(BOB, 15_000, reason="Tree watering reward")           # taxed back into the bank
+    assert E.remove_bb(ALICE, 1_000, reason="Blackjack stake")
+    assert DatabaseManager.transfer(ALICE, BOB, 2_500, "/pay", record_pay_transfer=True)
+    E.record_game_transfer(ALICE, BOB, 500)
+    E.UKPenceManager.add_amount(BOB, 300, reason="minted")          # supply grows
+    from lib.economy.bank_manager import BankManager
+    assert BankManager.collect_tax_batch([(BOB, 200)]) is not None
+
+    assert _held() == _sql()
+    assert guard_state.outflow_today(ALICE) == 3_000 == E.daily_transfer_used(ALICE, BANK)
+    assert guard_state.reconcile() == {}
+
+
+def test_a_stake_check_reads_no_sql(economy, monkeypatch):
+    E.add_bb(ALICE, 12_000, reason="Casino payout", taxable=False)
+    assert DatabaseManager.transfer(ALICE, BOB, 9_000, "/pay", record_pay_transfer=True)
+    guard_state.reserves()                                          # loaded
+
+    def no_sql(*_a, **_k):
+        raise AssertionError("stake check queried the database")
+
+    monkeypatch.setattr(DatabaseManager, "fetch_one", no_sql)
+    monkeypatch.setattr(DatabaseManager, "fetch_all", no_sql)
+    assert E.wager_blocked_reason(ALICE, 1_000, BANK) is None
+    assert "only stake **1,000" in E.wager_blocked_reason(ALICE, 1_001, BANK)
+    assert reserve_policy.max_casino_net_payout() == int(88_000 * 0.8)
+    assert reserve_policy.max_casino_bet(2.0) == int(88_000 * 0.8 / 2)
+
+
+def test_reconcile_corrects_writes_made_behind_the_managers(economy):
+    guard_state.supply()
+    DatabaseManager.execute("INSERT INTO ukpence (user_id, balance) VALUES (?, ?)", (ALICE, 50))
+    DatabaseManager.execute(
+        "INSERT INTO game_transfers (timestamp, loser_id, winner_id, amount) "
+        "VALUES (strftime('%s','now'), ?, ?, 40)", (BOB, ALICE))
+    assert guard_state.reconcile() == {"supply": (100_000, 100_050), f"outflow:{BOB}": (0, 40)}
+    assert guard_state.supply() == 100_050 and guard_state.outflow_today(BOB) == 40
@@ -0,0 +1,63 @@
+"""Income sources: one bit per source per user, held in memory and OR-ed into the table only
+when a bit is new; jack_of_all_trades goes out at five set bits; the old JSON is imported once."""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from database import DatabaseManager, TelemetryQueue
+from lib.features import income_badges as IB
+
+
+@pytest.fixture
+def sources(fresh_db, monkeypatch):
+    monkeypatch.setattr(IB, "_source_masks", None)
+    awarded = []
+
+    async def award(client, user_id, badge_id):
+        awarded.append((user_id, badge_id))
+
+    monkeypatch.setattr(IB, "award_badge_safe", award)
+    yield fresh_db, awarded
+    TelemetryQueue.flush()
+
+
+def _stored(uid):
+    TelemetryQueue.flush()
+    row = DatabaseManager.fetch_one("SELECT mask FROM income_sources WHERE user_id = ?", (str(uid),))
+    return row[0] if row else None
+
+
+def test_fifth_source_awards_the_badge_and_only_new_bits_are_written(sources, monkeypatch):
+    _tmp, awarded = sources
+    for source in ("chat", "tree", "bond", "casino"):
+        asyncio.run(IB.record_income_source(None, 7, source))
+    assert awarded == [] and _stored(7) == 0b11011
+
+    writes = []
+    monkeypatch.setattr(TelemetryQueue, "submit", lambda sql, params=(): writes.append(params))
+    asyncio.run(IB.record_income_source(None, 7, "chat"))     # already held
+    assert writes == [] and awarded == []
+    asyncio.run(IB.record_income_source(None, 7, "wordle"))
+    assert writes == [("7", 1 << IB.INCOME_SOURCES.index("wordle"))]
+    assert awarded == [(7, "jack_of_all_trades")]
+
+
+def test_legacy_file_is_imported_once(sources, monkeypatch):
+    tmp, _awarded = sources
+    path = tmp / "earned.json"
+    path.write_text(json.dumps({"7": ["chat", "hof", "retired-source"], "8": []}))
+    monkeypatch.setattr(config, "EARNED_SOURCES_FILE", str(path))
+    IB.import_earned_sources_file()
+    assert IB.add_income_source(7, "hof") == (False, 2)
+    assert IB.add_income_source(8, "chat") == (True, 1)
+
+    path.write_text(json.dumps({"9": ["chat"]}))
+    IB.import_earned_sources_file()
+    assert _stored(9) is None
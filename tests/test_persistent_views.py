@@ -0,0 +1,60 @@
+"""PersistentViewRegistry: one row per message, imported once from the old JSON file."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from lib.core import persistent_views as PV
+from lib.core.file_operations import load_persistent_views, save_persistent_views
+
+R = PV.PersistentViewRegistry
+
+
+@pytest.fixture
+def registry(fresh_db, monkeypatch):
+    home = fresh_db / "persistent_views.json"
+    monkeypatch.setattr(PV, "_HOME_FILE", str(home))
+    monkeypatch.setattr(R, "_imported", False)
+    return home
+
+
+def test_put_get_delete_touch_one_row(registry):
+    R.put(111, {"type": "blackjack", "bet": 10})
+    R.put("archive_5", {"msg_id": 9, "move_timestamp": 1.5})
+    R.put(222, [1, 2])                                        # role-button entries are lists
+    assert R.get("111") == {"type": "blackjack", "bet": 10}
+    R.put(111, {"type": "blackjack", "bet": 20})
+    assert R.get(111)["bet"] == 20
+    assert R.items("blackjack") == [("111", {"type": "blackjack", "bet": 20})]
+    assert R.delete(111) is True and R.delete(111) is False
+    assert R.all() == {"archive_5": {"msg_id": 9, "move_timestamp": 1.5}, "222": [1, 2]}
+    assert not registry.exists()                              # nothing rewrote a file
+
+
+def test_legacy_file_is_imported_once(registry):
+    registry.write_text(json.dumps({"1": {"type": "roulette"}, "2": {"type": "county"}}))
+    assert dict(R.items()) == {"1": {"type": "roulette"}, "2": {"type": "county"}}
+    R.delete(1)
+    assert R.get(1) is None                                   # not resurrected from the file
+    assert [k for k, _ in R.items("county")] == ["2"]
+
+
+def test_whole_dict_shim_still_works(registry):
+    R.put(1, {"type": "a"})
+    views = load_persistent_views()
+    views["2"] = {"type": "b"}
+    del views["1"]
+    save_persistent_views(views)
+    assert R.all() == {"2": {"type": "b"}}
+
+
+def test_import_check_is_not_repeated_per_call(registry, monkeypatch):
+    from lib.core import state_store
+    R.get(1)
+    monkeypatch.setattr(state_store, "was_imported", lambda name: pytest.fail("checked again"))
+    R.put(1, {"type": "a"})
+    assert R.delete(1) is True
@@ -0,0 +1,72 @@
+"""RankIndex: member ranks come from the in-memory sorted index, built once from the xp table
+and kept current by XP gains and joins/leaves - matching what the full-table scan gave."""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import DatabaseManager
+from lib.features.xp_system import RankIndex
+
+
+def _guild(*ids):
+    return SimpleNamespace(members=[SimpleNamespace(id=i) for i in ids])
+
+
+@pytest.fixture
+def index(fresh_db):
+    for uid, xp in ((1, 500), (2, 900), (3, 100), (4, 700)):
+        DatabaseManager.execute("INSERT INTO xp VALUES (?, ?, 0)", (str(uid), xp))
+    return RankIndex()
+
+
+def test_ranks_only_count_current_members(index):
+    guild = _guild(1, 2, 3)                      # 4 has left
+    assert index.page(guild, 0, 10) == [("2", 900), ("1", 500), ("3", 100)]
+    assert index.rank_of("1", guild) == (2, 500)
+    assert index.rank_of("4", guild) == (None, 700)
+    assert index.rank_of("99", guild) == (None, 0)
+    assert index.page(guild, 1, 5) == [("1", 500), ("3", 100)]
+
+
+def test_gains_and_membership_changes_are_applied_incrementally(index):
+    guild = _guild(1, 2, 3)
+    index.count(guild)
+    DatabaseManager.execute("DELETE FROM xp")    # from here on the table is never re-read
+
+    index.set_xp("3", 1000)
+    guild.members.append(SimpleNamespace(id=4))
+    index.member_joined(4)
+    assert index.page(guild, 0, 10) == [("3", 1000), ("2", 900), ("4", 700), ("1", 500)]
+
+    guild.members = [m for m in guild.members if m.id != 2]
+    index.member_left(2)
+    assert index.rank_of("4", guild) == (2, 700)
+    assert index.rank_of("2", guild) == (None, 900)
+
+
+def test_membership_is_resynced_when_the_guild_cache_fills_in(index):
+    guild = _guild(1)                            # members still chunking in
+    assert index.count(guild) == 1
+    guild.members += [SimpleNamespace(id=2), SimpleNamespace(id=4)]
+    assert index.rank_of("1", guild) == (3, 500)
+
+
+def test_leaderboard_view_pages_from_the_index(index, monkeypatch):
+    from lib.features import xp_system as X
+    monkeypatch.setattr(X, "rank_index", index)
+    monkeypatch.setattr(X.LeaderboardView, "PAGE_SIZE", 2)
+    guild = _guild(1, 2, 3, 4)
+
+    async def run():
+        view = X.LeaderboardView(None, guild)
+        assert not view.next_button.disabled
+        assert view.get_slice() == [("2", 900), ("4", 700)]
+        assert view.get_slice(2) == [("1", 500), ("3", 100)]
+
+    asyncio.run(run())
@@ -0,0 +1,84 @@
+"""Render cache: repeated renders come back from memory or disk without a browser, both tiers
+are trimmed by bytes, and ``cache=False`` always renders."""
+
+import asyncio
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import config
+from lib.core import image_processing as IP
+from lib.core import render_cache as RC
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "RENDER_CACHE_DIR", str(tmp_path / "renders"))
+    monkeypatch.setattr(config, "RENDER_CACHE_MEMORY_BYTES", 4000)
+    monkeypatch.setattr(config, "RENDER_CACHE_DISK_BYTES", 3000)
+    monkeypatch.setattr(config, "RENDER_CACHE_ENABLED", True)
+    RC.clear(disk=True)
+    for k in RC._counters:
+        RC._counters[k] = 0
+    renders = []
+
+    def fake_render(html_str, size=(1600, 1000), apply_trim=True, element_selector=None, worker=None):
+        renders.append(html_str)
+        return io.BytesIO(f"png:{html_str}:{size}".encode())
+
+    monkeypatch.setattr(IP, "_screenshot_html_sync", fake_render)
+    yield renders
+    RC.clear(disk=True)
+
+
+def test_repeat_render_is_served_from_memory_then_disk(cache):
+    async def go():
+        a = await IP.screenshot_html("<p>hi</p>", size=(100, 100))
+        b = await IP.screenshot_html("<p>hi</p>", size=(100, 100))
+        c = await IP.screenshot_html("<p>hi</p>", size=(100, 200))     # size is part of the key
+        await asyncio.sleep(0.05)                                       # let the disk writes land
+        return a.getvalue(), b.getvalue(), c.getvalue()
+
+    a, b, c = asyncio.run(go())
+    assert a == b and a != c
+    assert cache == ["<p>hi</p>", "<p>hi</p>"]
+    assert RC.stats()["hits_memory"] == 1
+
+    RC.clear()                                                          # as after a restart
+    again = asyncio.run(IP.screenshot_html("<p>hi</p>", size=(100, 100)))
+    assert again.getvalue() == a and len(cache) == 2
+    assert RC.stats()["hits_disk"] == 1
+
+
+def test_opt_out_always_renders(cache):
+    async def go():
+        for _ in range(3):
+            await IP.screenshot_html("<p>live</p>", cache=False)
+
+    asyncio.run(go())
+    assert len(cache) == 3
+    assert RC.stats()["stores"] == 0
+
+
+def test_memory_tier_evicts_least_recently_used_by_bytes(cache):
+    blob = b"x" * 900
+    for key in ("a", "b", "c", "d"):
+        RC.put(key, blob)
+    RC.get_memory("a")                              # touch a, so b is now the oldest
+    RC.put("e", blob)
+    assert RC.get_memory("b") is None and RC.get_memory("a") == blob
+    assert RC.stats()["memory_bytes"] <= 4000
+    RC.put("huge", b"y" * 2000)                     # over a quarter of the budget: disk only
+    assert RC.get_memory("huge") is None
+
+
+def test_disk_tier_stays_under_budget(cache):
+    for key in ("k1", "k2", "k3", "k4"):
+        RC.put_disk(key, b"z" * 1000)
+    stats = RC.stats()
+    assert stats["disk_bytes"] <= 3000 and stats["disk_entries"] == 3
+    assert RC.get_disk("k1") is None and RC.get_disk("k4") == b"z" * 1000
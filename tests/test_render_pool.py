@@ -0,0 +1,99 @@
+"""RenderPool: renders spread over N workers, the least-loaded worker is handed out, and the
+queue depth is visible. No Chrome is launched - workers are only claimed, never driven."""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.core.image_processing import RenderPool
+
+
+def test_concurrent_renders_get_distinct_workers_and_extra_ones_queue():
+    pool = RenderPool(2)
+    seen = []
+
+    async def go():
+        gate = asyncio.Event()
+
+        async def render():
+            async with pool.acquire() as worker:
+                seen.append(worker.index)
+                await gate.wait()
+
+        tasks = [asyncio.create_task(render()) for _ in range(3)]
+        await asyncio.sleep(0)
+        snapshot = pool.metrics()
+        gate.set()
+        await asyncio.gather(*tasks)
+        return snapshot
+
+    snapshot = asyncio.run(go())
+    assert sorted(seen[:2]) == [0, 1]
+    assert snapshot["busy"] == 2 and snapshot["queued"] == 1 and snapshot["peak_queued"] == 1
+    assert pool.metrics()["busy"] == 0 and pool.metrics()["queued"] == 0
+
+
+def test_least_loaded_warm_worker_is_preferred():
+    pool = RenderPool(3)
+    cold, worn, fresh = pool.workers
+    worn.browser, worn.render_count = object(), 12
+    fresh.browser, fresh.render_count = object(), 2
+
+    async def pick():
+        async with pool.acquire() as worker:
+            return worker
+
+    assert asyncio.run(pick()) is fresh
+
+
+def test_single_worker_serialises_like_the_old_lock():
+    pool = RenderPool(1)
+    order = []
+
+    async def render(tag):
+        async with pool.acquire() as worker:
+            order.append((tag, "in", worker.index))
+            await asyncio.sleep(0.01)
+            order.append((tag, "out", worker.index))
+
+    async def go():
+        await asyncio.gather(render("a"), render("b"))
+
+    asyncio.run(go())
+    assert order == [("a", "in", 0), ("a", "out", 0), ("b", "in", 0), ("b", "out", 0)]
+
+
+class _FakeBrowser:
+    def __init__(self, fail_write=False):
+        self.fail_write = fail_write
+        self.written, self.visited = [], []
+
+    def execute_script(self, script, *args):
+        if "readyState" in script:
+            return "complete"
+        if self.fail_write:
+            raise RuntimeError("tab crashed")
+        self.written.append(args[0])
+
+    def get(self, url):
+        self.visited.append(url)
+
+
+def test_staged_worker_loads_pages_in_memory_and_falls_back_to_a_temp_file():
+    from lib.core import image_processing as IP
+
+    worker = RenderPool(1).workers[0]
+    browser = _FakeBrowser()
+    worker.browser = browser
+    worker.restage()
+    assert worker.staged and "cdn.tailwindcss.com" in browser.written[0]
+    IP._load_document(worker, browser, "<p>card</p>")
+    assert browser.written[-1] == "<p>card</p>" and browser.visited == ["about:blank"]
+
+    broken = _FakeBrowser(fail_write=True)
+    IP._load_document(worker, broken, "<p>card</p>")
+    assert not worker.staged
+    assert len(broken.visited) == 1 and broken.visited[0].startswith("file://")
+    assert not os.path.exists(broken.visited[0][len("file://"):])
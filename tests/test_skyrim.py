@@ -18,12 +18,28 @@ import config
 
 _TMP = tempfile.mkdtemp(prefix="skyrim_test_")
 config.SKYRIM_PROFILES_FILE = os.path.join(_TMP, "profiles.json")
-config.PERSISTENT_VIEWS_FILE = os.path.join(_TMP, "views.json")
 config.SKYRIM_WORLDBOSS_FILE = os.path.join(_TMP, "worldboss.json")
 
+import database
 from lib.features.skyrim import data as D
 from lib.features.skyrim import engine as E
 
+_saved_db = None
+
+
+def setup_module(module=None):
+    """Delve boards register in the persistent-views table: give them a scratch database."""
+    global _saved_db
+    _saved_db = (database.DB_FILE, database.DatabaseManager._connection)
+    database.DatabaseManager._connection = None
+    database.DB_FILE = os.path.join(_TMP, "skyrim.db")
+    database.init_db()
+
+
+def teardown_module(module=None):
+    database.DatabaseManager._connection.close()
+    database.DB_FILE, database.DatabaseManager._connection = _saved_db
+
 
 def _fixed_rolls(*vals):
     """Replace engine.random with a namespace whose random() pops from `vals`
@@ -2200,6 +2216,7 @@ def test_skyrim_badges_earned_and_cached():
 
 if __name__ == "__main__":
     failed = 0
+    setup_module()
     for name, fn in sorted(globals().items()):
         if name.startswith("test_") and callable(fn):
             try:
@@ -2210,6 +2227,7 @@ if __name__ == "__main__":
                 import traceback
                 print(f"FAIL  {name}")
                 traceback.print_exc()
+    teardown_module()
     print("ALL PASS" if not failed else f"{failed} FAILURES")
     sys.exit(1 if failed else 0)
 
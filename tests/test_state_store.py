@@ -0,0 +1,89 @@
+"""State store: per-key rows in kv_store, one-shot import of the legacy JSON files, and the
+load_json_file/save_json_file shim that routes KV-backed files to it."""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import database
+from lib.core import file_operations as F
+from lib.core import state_store as S
+
+
+@pytest.fixture
+def store(fresh_db, monkeypatch):
+    S._MIRROR.clear()
+    monkeypatch.setattr(F, "_kv_imported", set())
+    legacy = fresh_db / "counts.json"
+    monkeypatch.setitem(F.KV_BACKED_FILES, os.path.abspath(str(legacy)), "counts")
+    yield legacy
+    S._MIRROR.clear()
+
+
+def test_get_put_delete_and_multi_key_update(store):
+    assert S.get("ns", "a") is None
+    S.put("ns", "a", {"n": 1})
+    S.put("ns", 7, [1, 2])
+    assert S.get("ns", "a") == {"n": 1}
+    assert S.items("ns") == {"a": {"n": 1}, "7": [1, 2]}
+
+    S.update("ns", puts={"b": 2, "c": 3}, deletes=["a"])
+    assert S.items("ns") == {"7": [1, 2], "b": 2, "c": 3}
+    assert S.delete("ns", "b") is True
+    assert S.delete("ns", "b") is False
+    assert S.items("other") == {}
+
+
+def test_multi_key_update_is_all_or_nothing(store):
+    S.put("ns", "a", 1)
+    with pytest.raises(TypeError):
+        S.update("ns", puts={"a": 2, "bad": object()})
+    assert S.items("ns") == {"a": 1}
+
+
+def test_replace_writes_only_what_changed(store):
+    S.replace("ns", {"a": 1, "b": 2})
+    before = dict(database.DatabaseManager.fetch_all(
+        "SELECT key, updated_at FROM kv_store WHERE namespace = 'ns'"))
+    database.DatabaseManager.execute("UPDATE kv_store SET updated_at = 0 WHERE namespace = 'ns'")
+    assert S.replace("ns", {"a": 1, "c": 3}) == 2          # c added, b removed, a untouched
+    rows = dict(database.DatabaseManager.fetch_all(
+        "SELECT key, updated_at FROM kv_store WHERE namespace = 'ns'"))
+    assert rows["a"] == 0 and rows["c"] > 0 and "b" not in rows and before
+
+
+def test_legacy_file_imports_once_through_the_shim(store):
+    store.write_text(json.dumps({"1": 5, "2": 9}))
+    assert F.load_json_file(str(store)) == {"1": 5, "2": 9}
+
+    data = F.load_json_file(str(store))
+    data["1"] += 1
+    F.save_json_file(str(store), data)
+    assert json.loads(store.read_text()) == {"1": 5, "2": 9}   # the file is left alone
+
+    store.write_text(json.dumps({"1": 0, "3": 1}))              # e.g. a stale restore
+    assert F.load_json_file(str(store)) == {"1": 6, "2": 9}
+    assert S.import_json_file("counts", str(store)) is None
+
+
+def test_import_is_checked_once_per_namespace(store, monkeypatch):
+    F.load_json_file(str(store))
+    monkeypatch.setattr(S, "was_imported", lambda name: pytest.fail("checked again"))
+    F.save_json_key(str(store), "1", 2)
+    assert F.load_json_file(str(store)) == {"1": 2}
+
+
+def test_per_key_helpers_work_for_both_backings(store, tmp_path):
+    F.save_json_key(str(store), "9", {"hp": 3})
+    assert F.load_json_key(str(store), "9") == {"hp": 3}
+    assert S.get("counts", "9") == {"hp": 3}
+
+    plain = str(tmp_path / "plain.json")                       # not KV-backed
+    F.save_json_key(plain, "9", {"hp": 4})
+    assert json.loads(open(plain).read()) == {"9": {"hp": 4}}
+    assert F.load_json_key(plain, "9") == {"hp": 4}
+    assert F.load_json_key(plain, "missing", 0) == 0
@@ -0,0 +1,135 @@
+"""Daily summaries: the write-behind cache keeps counts exact while batching writes, and
+ranges aggregate in SQL over the normalised per-day tables."""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import database
+from lib.features import summary as S
+
+
+@pytest.fixture
+def fresh(fresh_db, monkeypatch):
+    monkeypatch.chdir(fresh_db)          # no legacy daily_summaries/ folder here
+    S._DAYS.clear()
+    S._DIRTY.clear()
+    yield
+    S._DAYS.clear()
+    S._DIRTY.clear()
+
+
+def _stored(date):
+    return S._read_stored(date)
+
+
+def test_increments_are_buffered_until_flush(fresh):
+    today = S._today()
+    for _ in range(3):
+        S.update_summary_data("messages", channel_id=10)
+        S.update_summary_data("active_members", user_id=7)
+    S.update_summary_data("members_joined")
+
+    assert _stored(today)["total_messages"] == 0
+    assert S.load_summary_data(today)["messages"] == {"10": 3}
+
+    assert S.flush_summary_data() == 1
+    stored = _stored(today)
+    assert stored["messages"] == {"10": 3}
+    assert stored["total_messages"] == 3
+    assert stored["active_members"] == {"7": 3}
+    assert stored["members_joined"] == 1
+    assert S.flush_summary_data() == 0           # nothing changed since
+
+
+def test_reaction_removal_keeps_the_original_semantics(fresh):
+    today = S._today()
+    S.update_summary_data("reacting_members", user_id=5, remove=True)   # nothing to remove
+    S.update_summary_data("reacting_members", user_id=5)
+    S.update_summary_data("reacting_members", user_id=6)
+    S.update_summary_data("reacting_members", user_id=6, remove=True)
+
+    assert S.load_summary_data(today)["reacting_members"] == {"5": 1}
+
+
+def test_reads_are_copies_of_the_live_day(fresh):
+    today = S._today()
+    S.update_summary_data("messages", channel_id=1)
+    snapshot = S.load_summary_data(today)
+    snapshot["messages"]["1"] = 999
+    assert S.load_summary_data(today)["messages"] == {"1": 1}
+
+
+def test_aggregate_reads_through_unflushed_counts(fresh):
+    today = datetime.strptime(S._today(), "%Y-%m-%d")
+    yesterday = (today - timedelta(days=1)).strftime("%Y-%m-%d")
+    past = S._empty_summary()
+    past.update(total_messages=4, messages={"10": 4}, total_members=50)
+    S._write_stored(yesterday, past)
+
+    S.update_summary_data("messages", channel_id=10)
+    S.update_summary_data("messages", channel_id=11)
+
+    agg = S.aggregate_summaries(today - timedelta(days=1), today)
+    assert agg["total_messages"] == 6
+    assert agg["messages"] == {"10": 5, "11": 1}
+
+
+def test_finished_days_leave_the_cache_once_clean(fresh):
+    S._DAYS["2000-01-01"] = S._empty_summary()
+    S._DIRTY.add("2000-01-01")
+    S.flush_summary_data()
+    assert _stored("2000-01-01") is not None
+    S.flush_summary_data()
+    assert "2000-01-01" not in S._DAYS
+
+
+def test_set_summary_value_goes_through_the_cache(fresh):
+    today = S._today()
+    S.update_summary_data("messages", channel_id=1)
+    S.set_summary_value(today, "total_members", 123)
+    S.update_summary_data("messages", channel_id=1)
+    S.flush_summary_data()
+    stored = _stored(today)
+    assert stored["total_members"] == 123
+    assert stored["messages"] == {"1": 2}
+
+
+def test_legacy_json_rows_migrate_once(fresh):
+    blob = S._empty_summary()
+    blob.update(total_messages=3, messages={"1": 2, "2": 1},
+                active_members={"9": 3}, reacting_members={"9": 1, "8": 4})
+    database.DatabaseManager.execute(
+        "INSERT INTO daily_summaries (date, data) VALUES (?, ?)",
+        ("2001-02-03", json.dumps(blob)))
+
+    database.init_db()
+    database.init_db()
+
+    assert _stored("2001-02-03") == blob
+    assert database.DatabaseManager.fetch_one(
+        "SELECT COUNT(*) FROM summary_member_days WHERE date = '2001-02-03'")[0] == 2
+
+
+def test_range_aggregation_happens_in_sql(fresh):
+    for day, members, msgs in (("2002-01-01", 40, {"1": 5}), ("2002-01-02", 42, {"1": 1, "2": 7}),
+                               ("2002-01-09", 99, {"1": 100})):
+        data = S._empty_summary()
+        data.update(total_members=members, messages=msgs, total_messages=sum(msgs.values()),
+                    active_members={"7": sum(msgs.values())}, reacting_members={"8": 1},
+                    members_joined=2)
+        S._write_stored(day, data)
+
+    agg = S.aggregate_summaries(datetime(2002, 1, 1), datetime(2002, 1, 7))
+
+    assert agg["total_members"] == 42                  # the last day in the range
+    assert agg["total_messages"] == 13
+    assert agg["members_joined"] == 4
+    assert agg["messages"] == {"1": 6, "2": 7}
+    assert agg["active_members"] == {"7": 13}
+    assert agg["reacting_members"] == {"8": 2}
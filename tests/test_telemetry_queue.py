@@ -0,0 +1,75 @@
+"""TelemetryQueue: fire-and-forget writes land together in one commit, a bad statement
+doesn't sink its batch, and the backlog is bounded."""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import DatabaseManager, TelemetryQueue
+
+
+@pytest.fixture
+def q(fresh_db, monkeypatch):
+    # Park any flusher thread left from an earlier test so only explicit flushes commit.
+    monkeypatch.setattr(TelemetryQueue, "FLUSH_INTERVAL", 60)
+    with TelemetryQueue._cond:
+        TelemetryQueue._cond.notify_all()
+    TelemetryQueue.flush()
+    yield TelemetryQueue
+    TelemetryQueue.flush()
+
+
+def test_queued_statements_commit_as_one_batch(q, monkeypatch):
+    before = q.commits
+    for i in range(50):
+        q.submit("INSERT INTO message_archive (message_id, channel_id, user_id, content, ts) "
+                 "VALUES (?, '1', '2', 'hi', 0)", (str(i),))
+    assert DatabaseManager.fetch_one("SELECT COUNT(*) FROM message_archive") == (0,)
+    assert q.flush() == 50
+    assert q.commits == before + 1
+    assert DatabaseManager.fetch_one("SELECT COUNT(*) FROM message_archive") == (50,)
+
+
+def test_background_thread_flushes_on_its_interval(q, monkeypatch):
+    monkeypatch.setattr(q, "FLUSH_INTERVAL", 0.05)
+    q.submit("INSERT INTO xp (user_id, xp, last_xp_time) VALUES ('9', 5, 0)")
+    with q._cond:                 # wake the thread parked by the fixture
+        q._cond.notify_all()
+    deadline = time.time() + 5
+    while q.backlog() and time.time() < deadline:
+        time.sleep(0.02)
+    time.sleep(0.1)
+    assert DatabaseManager.fetch_one("SELECT xp FROM xp WHERE user_id = '9'") == (5,)
+
+
+def test_a_bad_statement_does_not_sink_the_batch(q, monkeypatch):
+    q.submit("INSERT INTO xp (user_id, xp, last_xp_time) VALUES ('1', 1, 0)")
+    q.submit("INSERT INTO no_such_table VALUES (1)")
+    q.submit("INSERT INTO xp (user_id, xp, last_xp_time) VALUES ('2', 2, 0)")
+    q.flush()
+    assert DatabaseManager.fetch_all("SELECT user_id FROM xp ORDER BY user_id") == [("1",), ("2",)]
+
+
+def test_backlog_is_bounded(q, monkeypatch):
+    monkeypatch.setattr(q, "FLUSH_SIZE", 10_000)
+    monkeypatch.setattr(q, "MAX_BACKLOG", 3)
+    dropped = q.dropped
+    results = [q.submit("INSERT INTO xp (user_id) VALUES (?)", (str(i),)) for i in range(5)]
+    assert results == [True, True, True, False, False]
+    assert q.dropped == dropped + 2
+    assert q.flush() == 3
+
+
+def test_xp_gain_is_not_applied_twice_inside_the_cooldown(q, monkeypatch):
+    sql = ("INSERT INTO xp (user_id, xp, last_xp_time) VALUES (?, ?, ?) "
+           "ON CONFLICT(user_id) DO UPDATE SET xp = xp.xp + ?, last_xp_time = excluded.last_xp_time "
+           "WHERE excluded.last_xp_time - xp.last_xp_time >= 120")
+    q.submit(sql, ("5", 10, 1000, 10))
+    q.submit(sql, ("5", 15, 1001, 15))        # read the same stale row, inside the cooldown
+    q.submit(sql, ("5", 22, 1200, 12))        # after it
+    q.flush()
+    assert DatabaseManager.fetch_one("SELECT xp, last_xp_time FROM xp WHERE user_id = '5'") == (22, 1200)
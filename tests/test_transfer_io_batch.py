@@ -0,0 +1,55 @@
+"""recent_transfer_io_batch answers for a whole candidate list with a few grouped reads and
+agrees with the per-user recent_transfer_io the taxes used to call for each one; the per-user
+windowed sums themselves are answered from the covering (user, timestamp) indexes."""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from database import DatabaseManager
+from lib.economy import economy_manager as E
+
+
+@pytest.fixture
+def ledger(fresh_db):
+    now = int(time.time())
+    for when, payer, recipient, amount in ((now, "1", "2", 300), (now, "2", "3", 50),
+                                           (now - 30 * 86400, "1", "3", 999)):
+        DatabaseManager.execute(
+            "INSERT INTO pay_transfers (timestamp, payer_id, recipient_id, amount) VALUES (?, ?, ?, ?)",
+            (when, payer, recipient, amount))
+    DatabaseManager.execute(
+        "INSERT INTO game_transfers (timestamp, loser_id, winner_id, amount) VALUES (?, '3', '1', 40)",
+        (now,))
+
+
+def test_batch_matches_the_per_user_sums(ledger):
+    batch = E.recent_transfer_io_batch([1, "2", "3", "4"], days=7)
+    assert batch == {uid: E.recent_transfer_io(uid, 7) for uid in ("1", "2", "3", "4")}
+    assert batch["1"] == (40, 300) and batch["4"] == (0, 0)
+
+
+def test_effective_wealth_batch_and_query_count(ledger, monkeypatch):
+    calls = []
+    real = DatabaseManager.fetch_all
+    monkeypatch.setattr(DatabaseManager, "fetch_all",
+                        staticmethod(lambda *a: calls.append(a) or real(*a)))
+    wealth = E.effective_wealth_batch({str(uid): 100 for uid in range(1, 500)}, days=7)
+    assert len(calls) == 4
+    assert wealth["1"] == 100 + 300 - 40
+    assert wealth["2"] == 0                               # received more than it holds
+    assert wealth["499"] == 100
+
+
+def test_windowed_user_sums_are_answered_from_the_covering_indexes(ledger):
+    conn = DatabaseManager.get_connection()
+    for sql in ("SELECT COALESCE(SUM(amount), 0) FROM pay_transfers WHERE payer_id = ? AND timestamp > ?",
+                "SELECT COALESCE(SUM(amount), 0) FROM game_transfers WHERE winner_id = ? AND timestamp > ?"):
+        plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, ("1", 0)))
+        assert "COVERING INDEX" in plan and "timestamp>?" in plan
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_pay_payer" not in names and "idx_game_loser" not in names
@@ -0,0 +1,69 @@
+"""update_xp's write-through cache: the first message reads the row, every message inside
+the 120s cooldown is turned away in memory, and only granted XP is written."""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+import pytest
+
+from lib.features import xp_system as X
+
+
+def _message(uid=42):
+    return SimpleNamespace(
+        type=discord.MessageType.default, channel=SimpleNamespace(id=1), content="hello there",
+        attachments=[], stickers=[], author=SimpleNamespace(id=uid, roles=[]),
+        guild=SimpleNamespace(get_role=lambda rid: None))
+
+
+@pytest.fixture
+def xp(monkeypatch):
+    reads, writes = [], []
+
+    async def fetch_one(sql, params=()):
+        reads.append(params)
+        return (1000, 0)
+
+    monkeypatch.setattr(X.AsyncDatabaseManager, "fetch_one", fetch_one)
+    monkeypatch.setattr(X.TelemetryQueue, "submit", lambda sql, params=(): writes.append(params))
+    monkeypatch.setattr(X.rank_index, "set_xp", lambda uid, total: None)
+    monkeypatch.setattr(X, "_xp_rows", {})
+    system = X.XPSystem()
+    system._last_ukp_award["42"] = time.time()        # keep the UKP roll out of it
+    return system, reads, writes
+
+
+def test_cooldown_is_enforced_in_memory(xp, monkeypatch):
+    system, reads, writes = xp
+
+    async def chat(n):
+        for _ in range(n):
+            await system.update_xp(_message())
+
+    asyncio.run(chat(5))
+    assert len(reads) == 1                              # warmed once
+    assert len(writes) == 1                             # one grant, four rejections
+    granted = writes[0][1]
+    assert X._xp_rows["42"][0] == granted and 1010 <= granted <= 1020
+
+    later = time.time() + 121
+    monkeypatch.setattr(X.time, "time", lambda: later)
+    asyncio.run(chat(2))
+    assert len(reads) == 1 and len(writes) == 2
+    assert writes[1][1] > granted                       # built on the cached total
+
+
+def test_concurrent_first_messages_grant_once(xp):
+    system, reads, writes = xp
+
+    async def burst():
+        await asyncio.gather(*(system.update_xp(_message()) for _ in range(4)))
+
+    asyncio.run(burst())
+    assert len(writes) == 1